@@ -0,0 +1,126 @@
+"""
+Collision benchmark for collision.CollisionSystem and ColliderSet.
+Compares the spatial hash check_all() and the NumPy ColliderSet.all_pairs()
+with the old all-pairs loop at increasing collider counts. Colliders are
+8-40px boxes at constant density (the world grows with the count), and a
+tenth of them move every frame. Then times a frame's worth of fireballs
+tested against enemies.
+
+Run from the repo root:
+    python benchmarks/bench_collision.py [max_colliders]
+"""
+import math
+import os
+import random
+import sys
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from collision import Collider, CollisionSystem, ColliderSet, aabb_collision, np
+
+
+# Above this the all-pairs loop takes too long to be worth timing
+BRUTE_FORCE_LIMIT = 2000
+
+
+def check_all_pairs(colliders):
+    """The old O(n^2) check_all"""
+    collisions = []
+    for i in range(len(colliders)):
+        for j in range(i + 1, len(colliders)):
+            if aabb_collision(colliders[i], colliders[j]):
+                collisions.append((colliders[i], colliders[j]))
+    return collisions
+
+
+def make_colliders(count, rng):
+    side = math.sqrt(count) * 96
+    return side, [
+        Collider(rng.uniform(0, side), rng.uniform(0, side), rng.uniform(8, 40), rng.uniform(8, 40))
+        for _ in range(count)
+    ]
+
+
+def best_ms(fn, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    max_count = int(sys.argv[1]) if len(sys.argv) > 1 else 10000
+    rng = random.Random(1)
+    print(f"{'colliders':>10}{'pairs':>8}{'all-pairs ms':>15}{'hash ms':>10}{'move ms':>10}{'soa ms':>10}")
+
+    for count in (10, 100, 1000, 10000, 100000):
+        if count > max_count:
+            break
+        side, colliders = make_colliders(count, rng)
+        system = CollisionSystem(cell_size=32)
+        for collider in colliders:
+            system.add(collider)
+
+        pairs = system.check_all()
+        if count <= BRUTE_FORCE_LIMIT:
+            expected = check_all_pairs(colliders)
+            assert set(pairs) == set(expected), "spatial hash disagrees with all-pairs"
+            brute = f"{best_ms(lambda: check_all_pairs(colliders), 3):15.2f}"
+        else:
+            brute = f"{'-':>15}"
+        hashed = best_ms(system.check_all, 5)
+
+        movers = colliders[::10]
+
+        def move_some():
+            for collider in movers:
+                system.move(collider, (collider.x + 3) % side, collider.y)
+        moved = best_ms(move_some, 5)
+
+        soa = f"{'-':>10}"
+        if np is not None:
+            batch = ColliderSet()
+            for collider in colliders:
+                batch.add(*collider.rect)
+            assert len(batch.all_pairs()[0]) == len(system.check_all()), "ColliderSet disagrees with the hash"
+            soa = f"{best_ms(batch.all_pairs, 5):10.2f}"
+
+        print(f"{count:>10}{len(pairs):>8}{brute}{hashed:10.2f}{moved:10.3f}{soa}")
+
+    bench_fireballs(rng)
+
+
+def bench_fireballs(rng, fireballs=500, enemies=500, side=4000):
+    """One frame of fireball-vs-enemy hit tests, three ways"""
+    shots = [Collider(rng.uniform(0, side), rng.uniform(0, side), 12, 12) for _ in range(fireballs)]
+    targets = [Collider(rng.uniform(0, side), rng.uniform(0, side), 28, 28) for _ in range(enemies)]
+    print(f"\n{fireballs} fireballs x {enemies} enemies")
+
+    def loop():
+        return [(s, t) for s in shots for t in targets if aabb_collision(s, t)]
+    hits = len(loop())
+    print(f"{'aabb_collision loop':<24}{best_ms(loop, 3):8.2f} ms   {hits} hits")
+
+    system = CollisionSystem(cell_size=32)
+    for target in targets:
+        system.add(target)
+
+    def hashed():
+        return [(s, t) for s in shots for t in system.query(s.x, s.y, s.width, s.height)]
+    assert len(hashed()) == hits
+    print(f"{'CollisionSystem.query':<24}{best_ms(hashed, 5):8.2f} ms")
+
+    if np is not None:
+        batch = ColliderSet()
+        for target in targets:
+            batch.add(*target.rect, owner=target)
+        rects = np.array([s.rect for s in shots])
+        assert len(batch.query_many(rects)[0]) == hits
+        print(f"{'ColliderSet.query_many':<24}{best_ms(lambda: batch.query_many(rects), 5):8.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Memory and serialization benchmark for the dungeon grid.
+Compares the old list of lists of TileType members against TileGrid.
+
+Run from the repo root:
+    python benchmarks/bench_grid.py [width] [height] [rooms]
+"""
+import json
+import os
+import random
+import sys
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from dungeon_procgen import DungeonGenerator, TileGrid, TileType
+
+
+def timed(fn, repeat=5):
+    """Best of `repeat` runs in milliseconds, and the last result"""
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = (time.perf_counter() - start) * 1000
+        best = elapsed if best is None else min(best, elapsed)
+    return best, result
+
+
+def list_grid_size(grid):
+    """Bytes held by the outer list and row lists (enum members are shared)"""
+    return sys.getsizeof(grid) + sum(sys.getsizeof(row) for row in grid)
+
+
+def main():
+    width = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    height = int(sys.argv[2]) if len(sys.argv) > 2 else 500
+    rooms = int(sys.argv[3]) if len(sys.argv) > 3 else 400
+
+    random.seed(1)
+    dungeon = DungeonGenerator(width, height, rooms)
+    gen_ms, _ = timed(dungeon.generate, 1)
+    grid = dungeon.grid
+    legacy = [[TileType(val) for val in row] for row in grid]
+
+    print(f"{width}x{height} tiles, {len(dungeon.rooms)} rooms, generated in {gen_ms:.1f} ms")
+    print(f"{'':<22}{'list of enums':>16}{'TileGrid':>16}")
+
+    print(f"{'memory (KB)':<22}{list_grid_size(legacy) / 1024:>16.1f}{len(grid.data) / 1024:>16.1f}")
+
+    old_ms, old_text = timed(lambda: json.dumps([[tile.value for tile in row] for row in legacy]))
+    new_ms, new_text = timed(lambda: json.dumps(dungeon.to_dict()))
+    print(f"{'serialize (ms)':<22}{old_ms:>16.2f}{new_ms:>16.2f}")
+    print(f"{'serialized (KB)':<22}{len(old_text) / 1024:>16.1f}{len(new_text) / 1024:>16.1f}")
+
+    old_ms, _ = timed(lambda: [[TileType(val) for val in row] for row in json.loads(old_text)])
+    new_ms, _ = timed(lambda: DungeonGenerator.from_dict(json.loads(new_text)))
+    print(f"{'deserialize (ms)':<22}{old_ms:>16.2f}{new_ms:>16.2f}")
+
+    def legacy_count():
+        return sum(1 for row in legacy for tile in row if tile == TileType.FLOOR)
+    old_ms, _ = timed(legacy_count)
+    new_ms, _ = timed(lambda: grid.count(TileType.FLOOR))
+    print(f"{'count floors (ms)':<22}{old_ms:>16.2f}{new_ms:>16.2f}")
+
+    def legacy_carve():
+        for y in range(10, 110):
+            for x in range(10, 110):
+                legacy[y][x] = TileType.FLOOR
+    scratch = TileGrid(width, height)
+    old_ms, _ = timed(legacy_carve)
+    new_ms, _ = timed(lambda: scratch.fill_rect(10, 10, 100, 100, TileType.FLOOR))
+    print(f"{'carve 100x100 (ms)':<22}{old_ms:>16.3f}{new_ms:>16.3f}")
+    print(f"numpy: {'yes' if grid.array is not None else 'no (bytearray fallback)'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,103 @@
+"""
+Startup benchmark: time to first frame of a cold `python main.py`.
+Each run is a fresh interpreter with -X importtime, which builds Game,
+updates and draws the first scene and flips the display. Reports the
+median time of each startup stage and the slowest imports.
+
+Run from the repo root:
+    python benchmarks/bench_startup.py [runs] [top imports]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+
+STAGES = ('import pygame', 'import game', 'Game()', 'first frame')
+
+
+def child():
+    """One cold start, printing the wall clock time each stage ended"""
+    sys.path.insert(0, ROOT)
+    marks = []
+    import pygame
+    marks.append(time.time())
+    from game import Game
+    marks.append(time.time())
+    game = Game()
+    marks.append(time.time())
+    # The first iteration of Game.run
+    game.scenes.update(1 / game.fps)
+    dirty = game.scenes.draw()
+    if dirty is None:
+        pygame.display.flip()
+    else:
+        pygame.display.update(dirty)
+    marks.append(time.time())
+    pygame.quit()
+    print(" ".join(repr(mark) for mark in marks))
+
+
+def parse_importtime(stderr):
+    """{module: (self us, cumulative us)} from -X importtime output"""
+    imports = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        own, cumulative, name = line[len("import time:"):].split("|")
+        imports[name.strip()] = (int(own), int(cumulative))
+    return imports
+
+
+def cold_start():
+    env = dict(os.environ)
+    env.setdefault("SDL_VIDEODRIVER", "dummy")
+    env.setdefault("SDL_AUDIODRIVER", "dummy")
+    env["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    start = time.time()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", os.path.abspath(__file__), "--child"],
+        cwd=ROOT, env=env, capture_output=True, text=True, check=True
+    )
+    marks = [float(mark) for mark in proc.stdout.split()[-len(STAGES):]]
+    stages = [end - begin for begin, end in zip([start] + marks, marks)]
+    return stages, marks[-1] - start, parse_importtime(proc.stderr)
+
+
+def run(runs=5, top=15):
+    results = [cold_start() for _ in range(runs)]
+    print(f"Cold start over {runs} runs (median ms, includes interpreter startup)")
+    for i, stage in enumerate(STAGES):
+        print(f"  {stage:<16}{1000 * statistics.median(r[0][i] for r in results):9.1f}")
+    print(f"  {'first frame at':<16}{1000 * statistics.median(r[1] for r in results):9.1f}")
+
+    # Cumulative import time per module, median over runs
+    names = set.intersection(*(set(r[2]) for r in results))
+    cumulative = {
+        name: statistics.median(r[2][name][1] for r in results) for name in names
+    }
+    print("\nSlowest imports (median cumulative ms)")
+    for name, us in sorted(cumulative.items(), key=lambda item: -item[1])[:top]:
+        print(f"  {name:<40}{us / 1000:9.1f}")
+
+    # The repo's own modules, to catch one that starts pulling in a heavy dependency
+    local = sorted(
+        (name for name in names
+         if os.path.exists(os.path.join(ROOT, name.split('.')[0] + '.py'))
+         or os.path.isdir(os.path.join(ROOT, name.split('.')[0]))),
+        key=lambda name: -cumulative[name]
+    )
+    print("\nRepo modules imported before the first frame")
+    for name in local:
+        print(f"  {name:<40}{cumulative[name] / 1000:9.1f}")
+
+
+if __name__ == "__main__":
+    if "--child" in sys.argv:
+        child()
+    else:
+        runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+        top = int(sys.argv[2]) if len(sys.argv) > 2 else 15
+        run(runs, top)
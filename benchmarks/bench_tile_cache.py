@@ -0,0 +1,77 @@
+"""
+Frame-time benchmark for dungeon tile rendering.
+Compares the old per-tile draw loop against the chunk cache blits.
+
+Run from the repo root:
+    python benchmarks/bench_tile_cache.py [frames] [width] [height]
+"""
+import os
+import sys
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+
+import pygame
+from dungeon_procgen import DungeonGenerator
+from dungeon_render import TileChunkCache, draw_tile, BACKGROUND_COLOR
+
+
+TILE_SIZE = 32
+
+
+def camera_path(frames, grid, screen_w, screen_h):
+    """Camera positions panning diagonally across the dungeon"""
+    max_x = max(0, len(grid[0]) * TILE_SIZE - screen_w)
+    max_y = max(0, len(grid) * TILE_SIZE - screen_h)
+    for i in range(frames):
+        t = i / max(1, frames - 1)
+        yield int(max_x * t), int(max_y * t)
+
+
+def draw_per_tile(screen, grid, camera_x, camera_y):
+    """The old _draw_dungeon loop: one or two draw calls per visible tile"""
+    screen_w, screen_h = screen.get_size()
+    start_x = max(0, camera_x // TILE_SIZE)
+    end_x = min(len(grid[0]), (camera_x + screen_w) // TILE_SIZE + 1)
+    start_y = max(0, camera_y // TILE_SIZE)
+    end_y = min(len(grid), (camera_y + screen_h) // TILE_SIZE + 1)
+    for y in range(start_y, end_y):
+        for x in range(start_x, end_x):
+            draw_tile(screen, grid[y][x], x * TILE_SIZE - camera_x, y * TILE_SIZE - camera_y, TILE_SIZE)
+
+
+def run(label, draw, screen, grid, frames):
+    """Time `frames` draws and print mean / p95 frame time"""
+    times = []
+    for camera_x, camera_y in camera_path(frames, grid, *screen.get_size()):
+        start = time.perf_counter()
+        screen.fill(BACKGROUND_COLOR)
+        draw(camera_x, camera_y)
+        times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+    mean = sum(times) / len(times)
+    p95 = times[int(len(times) * 0.95) - 1]
+    print(f"{label:<12} mean {mean:7.3f} ms   p95 {p95:7.3f} ms")
+    return mean
+
+
+def main():
+    frames = int(sys.argv[1]) if len(sys.argv) > 1 else 300
+    width = int(sys.argv[2]) if len(sys.argv) > 2 else 1920
+    height = int(sys.argv[3]) if len(sys.argv) > 3 else 1080
+
+    pygame.init()
+    screen = pygame.display.set_mode((width, height))
+    dungeon = DungeonGenerator(width=80, height=60, num_rooms=8)
+    grid, _ = dungeon.generate()
+    cache = TileChunkCache(grid, TILE_SIZE)
+
+    print(f"{frames} frames at {width}x{height}, {TILE_SIZE}px tiles")
+    before = run("per-tile", lambda cx, cy: draw_per_tile(screen, grid, cx, cy), screen, grid, frames)
+    after = run("chunk cache", lambda cx, cy: cache.draw(screen, cx, cy), screen, grid, frames)
+    print(f"speedup      {before / after:.1f}x")
+    pygame.quit()
+
+
+if __name__ == "__main__":
+    main()
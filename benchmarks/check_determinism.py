@@ -0,0 +1,105 @@
+"""
+Cross-run determinism check for DungeonGenerator.
+Regenerates a set of descriptors in this process and in fresh interpreters
+(different hash seeds, with and without NumPy) and compares the tile CRCs
+with each other and with the values recorded for the current
+GENERATOR_VERSION. A mismatch against the recorded values means generation
+changed: bump GENERATOR_VERSION and record the new CRCs.
+
+Run from the repo root:
+    python benchmarks/check_determinism.py
+"""
+import json
+import os
+import random
+import subprocess
+import sys
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.insert(0, ROOT)
+
+
+# (seed, width, height, num_rooms) -> TileGrid.crc(), per generator version
+EXPECTED = {
+    1: {
+        (0, 80, 60, 8): 1499176439,
+        (1, 80, 60, 8): 3874583403,
+        (42, 60, 40, 8): 3597528011,
+        (2 ** 31 - 1, 200, 150, 40): 379504429,
+        (123456789, 500, 500, 400): 4162103069,
+    },
+}
+
+
+def generate_crcs():
+    """[[seed, width, height, num_rooms, crc]] for every case of the current version"""
+    from dungeon_procgen import DungeonGenerator, GENERATOR_VERSION
+    results = []
+    for seed, width, height, num_rooms in EXPECTED[GENERATOR_VERSION]:
+        dungeon = DungeonGenerator.from_descriptor({
+            'seed': seed, 'width': width, 'height': height,
+            'num_rooms': num_rooms, 'version': GENERATOR_VERSION
+        })
+        results.append([seed, width, height, num_rooms, dungeon.grid.crc()])
+    return results
+
+
+def child_main(no_numpy):
+    if no_numpy:
+        # Make 'import numpy' fail so TileGrid uses its bytearray fallback
+        sys.modules['numpy'] = None
+    print(json.dumps(generate_crcs()))
+
+
+def run_child(hash_seed, no_numpy):
+    env = dict(os.environ, PYTHONHASHSEED=str(hash_seed))
+    args = [sys.executable, os.path.abspath(__file__), '--child']
+    if no_numpy:
+        args.append('--no-numpy')
+    output = subprocess.run(args, env=env, cwd=ROOT, capture_output=True, text=True, check=True)
+    return json.loads(output.stdout)
+
+
+def main():
+    from dungeon_procgen import DungeonGenerator, GENERATOR_VERSION
+    failures = []
+
+    # Generation must not touch (or depend on) the global random state
+    random.seed(1234)
+    state = random.getstate()
+    local = generate_crcs()
+    if random.getstate() != state:
+        failures.append("generation consumed the global random state")
+
+    # generate() twice on one instance gives the same map
+    dungeon = DungeonGenerator(80, 60, 8, seed=7)
+    dungeon.generate()
+    first = dungeon.grid.crc()
+    dungeon.generate()
+    if dungeon.grid.crc() != first:
+        failures.append("generate() is not repeatable on the same instance")
+
+    runs = {'this process': local}
+    for hash_seed, no_numpy in ((1, False), (2, False), (3, True)):
+        label = f"child hash seed {hash_seed}" + (" without numpy" if no_numpy else "")
+        runs[label] = run_child(hash_seed, no_numpy)
+
+    expected = EXPECTED[GENERATOR_VERSION]
+    for label, results in runs.items():
+        for seed, width, height, num_rooms, crc in results:
+            want = expected[(seed, width, height, num_rooms)]
+            if crc != want:
+                failures.append(f"{label}: seed {seed} {width}x{height} gave crc {crc}, expected {want}")
+
+    print(f"generator version {GENERATOR_VERSION}: {len(expected)} descriptors x {len(runs)} runs")
+    if failures:
+        for failure in failures:
+            print("FAIL", failure)
+        sys.exit(1)
+    print("all runs match the recorded maps")
+
+
+if __name__ == "__main__":
+    if '--child' in sys.argv:
+        child_main('--no-numpy' in sys.argv)
+    else:
+        main()
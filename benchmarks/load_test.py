@@ -0,0 +1,118 @@
+"""
+Local load test for the asyncio NetworkServer.
+Runs S dungeon sessions on one event loop (one NetworkServer per port)
+and connects P fake NetworkClients to each, all sending player updates.
+
+Run from the repo root:
+    python benchmarks/load_test.py [--sessions 50] [--players 4] [--seconds 10] [--rate 60]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import threading
+import time
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from dungeon_networking import NetworkServer, NetworkClient, create_player_update
+
+
+class FakeClient:
+    """NetworkClient that walks in a circle and counts what it receives"""
+
+    def __init__(self, port, index):
+        self.client = NetworkClient('127.0.0.1', port)
+        self.index = index
+        self.received = 0
+        self.client.register_handler('player_update', self._on_update)
+
+    def _on_update(self, data):
+        self.received += 1
+
+    def connect(self):
+        return self.client.connect('scout')
+
+    def send_update(self, frame):
+        self.client.send_message(create_player_update({
+            'player_id': self.client.player_id,
+            'role': 'scout',
+            'x': 100 + (frame + self.index) % 200,
+            'y': 100 + (frame * 2 + self.index) % 200,
+            'health': 80,
+            'velocity': (1.0, 2.0),
+            'shield_active': False
+        }))
+
+
+async def measure_loop_lag(samples, stop):
+    """Record how late a 10 ms sleep wakes up: a proxy for loop saturation"""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        start = loop.time()
+        await asyncio.sleep(0.01)
+        samples.append(loop.time() - start - 0.01)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--sessions', type=int, default=50)
+    parser.add_argument('--players', type=int, default=4)
+    parser.add_argument('--seconds', type=float, default=10.0)
+    parser.add_argument('--rate', type=float, default=60.0, help="client send rate (Hz)")
+    parser.add_argument('--base-port', type=int, default=0, help="0 picks free ports")
+    args = parser.parse_args()
+
+    # All sessions share one event loop on one thread
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+
+    servers = []
+    for i in range(args.sessions):
+        port = args.base_port + i if args.base_port else 0
+        server = NetworkServer('127.0.0.1', port, max_players=args.players)
+        asyncio.run_coroutine_threadsafe(server.start_async(), loop).result()
+        servers.append(server)
+
+    clients = []
+    for server in servers:
+        for i in range(args.players):
+            client = FakeClient(server.port, i)
+            if client.connect():
+                clients.append(client)
+    print(f"{len(servers)} sessions, {len(clients)} clients connected")
+
+    lag_samples = []
+    stop = threading.Event()
+    asyncio.run_coroutine_threadsafe(measure_loop_lag(lag_samples, stop), loop)
+
+    cpu_start = time.process_time()
+    start = time.monotonic()
+    frame = 0
+    interval = 1.0 / args.rate
+    while time.monotonic() - start < args.seconds:
+        for client in clients:
+            client.client.process_messages()
+            client.send_update(frame)
+        frame += 1
+        time.sleep(max(0.0, start + frame * interval - time.monotonic()))
+    elapsed = time.monotonic() - start
+    cpu = time.process_time() - cpu_start
+
+    stop.set()
+    received = sum(c.received for c in clients)
+    lag_samples.sort()
+    p50 = lag_samples[len(lag_samples) // 2] * 1000 if lag_samples else 0
+    p99 = lag_samples[int(len(lag_samples) * 0.99)] * 1000 if lag_samples else 0
+    print(f"sent      {frame * len(clients) / elapsed:10.0f} updates/s")
+    print(f"received  {received / elapsed:10.0f} updates/s")
+    print(f"loop lag  p50 {p50:.2f} ms   p99 {p99:.2f} ms")
+    print(f"cpu       {cpu / elapsed * 100:.0f}% of one core (clients included)")
+
+    for client in clients:
+        client.client.disconnect()
+    for server in servers:
+        asyncio.run_coroutine_threadsafe(server.stop_async(), loop).result()
+
+
+if __name__ == "__main__":
+    main()
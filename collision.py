@@ -1,3 +1,9 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
 class Collider:
     def __init__(self, x: float, y: float, width: float, height: float):
         self.x = x
@@ -19,34 +25,306 @@ class Collider:
 
 
 def aabb_collision(a: Collider, b: Collider) -> bool:
-    ax, ay, aw, ah = a.rect
-    bx, by, bw, bh = b.rect
-
+    # Plain attribute reads, building the rect tuple costs more than the test
     return (
-        ax < bx + bw and
-        ax + aw > bx and
-        ay < by + bh and
-        ay + ah > by
+        a.x < b.x + b.width and
+        a.x + a.width > b.x and
+        a.y < b.y + b.height and
+        a.y + a.height > b.y
     )
 
 
 class CollisionSystem:
-    def __init__(self):
-        self.colliders = []
+    """
+    Uniform spatial hash broadphase. Each collider is bucketed into every
+    cell its rect touches and check_all() only tests pairs that share a
+    cell. Colliders are re-bucketed incrementally: by move(), or by
+    check_all() noticing a collider whose position was changed directly.
+    """
+
+    def __init__(self, cell_size: int = 32):
+        self.cell_size = cell_size
+        self.cells = {}  # {(cell_x, cell_y): [Collider]}
+        self._spans = {}  # {Collider: (min_cx, min_cy, max_cx, max_cy)}, insertion ordered
+        self._order = {}  # {Collider: insertion number}, keeps pair order stable
+        self._next_order = 0
+
+    @property
+    def colliders(self):
+        return list(self._spans)
+
+    def _span(self, collider: Collider):
+        size = self.cell_size
+        x, y, w, h = collider.x, collider.y, collider.width, collider.height
+        # A rect touching a cell edge doesn't overlap the next cell
+        return (int(x // size), int(y // size),
+                int((x + w - 1e-9) // size), int((y + h - 1e-9) // size))
+
+    def _insert(self, collider: Collider, span):
+        min_cx, min_cy, max_cx, max_cy = span
+        cells = self.cells
+        for cy in range(min_cy, max_cy + 1):
+            for cx in range(min_cx, max_cx + 1):
+                bucket = cells.get((cx, cy))
+                if bucket is None:
+                    cells[(cx, cy)] = [collider]
+                else:
+                    bucket.append(collider)
+        self._spans[collider] = span
+
+    def _erase(self, collider: Collider, span):
+        min_cx, min_cy, max_cx, max_cy = span
+        cells = self.cells
+        for cy in range(min_cy, max_cy + 1):
+            for cx in range(min_cx, max_cx + 1):
+                bucket = cells[(cx, cy)]
+                bucket.remove(collider)
+                if not bucket:
+                    del cells[(cx, cy)]
 
     def add(self, collider: Collider):
-        self.colliders.append(collider)
+        if collider in self._spans:
+            return
+        self._order[collider] = self._next_order
+        self._next_order += 1
+        self._insert(collider, self._span(collider))
 
     def remove(self, collider: Collider):
-        if collider in self.colliders:
-            self.colliders.remove(collider)
+        span = self._spans.pop(collider, None)
+        if span is not None:
+            self._erase(collider, span)
+            del self._order[collider]
+
+    def move(self, collider: Collider, x: float, y: float):
+        """Move a collider, re-bucketing it only if it changed cells"""
+        collider.update_position(x, y)
+        self.update(collider)
+
+    def update(self, collider: Collider):
+        """Re-bucket a collider after its position or size changed"""
+        old = self._spans.get(collider)
+        if old is None:
+            return
+        new = self._span(collider)
+        if new != old:
+            self._erase(collider, old)
+            self._insert(collider, new)
+
+    def query(self, x: float, y: float, width: float, height: float):
+        """Colliders overlapping a rect"""
+        probe = Collider(x, y, width, height)
+        min_cx, min_cy, max_cx, max_cy = self._span(probe)
+        found = []
+        seen = set()
+        for cy in range(min_cy, max_cy + 1):
+            for cx in range(min_cx, max_cx + 1):
+                for collider in self.cells.get((cx, cy), ()):
+                    if collider not in seen:
+                        seen.add(collider)
+                        if aabb_collision(probe, collider):
+                            found.append(collider)
+        return found
 
     def check_all(self):
+        """Overlapping pairs, each as (earlier added, later added)"""
+        for collider in self._spans:
+            self.update(collider)
+
+        spans = self._spans
+        order = self._order
         collisions = []
-        for i in range(len(self.colliders)):
-            for j in range(i + 1, len(self.colliders)):
-                a = self.colliders[i]
-                b = self.colliders[j]
-                if aabb_collision(a, b):
-                    collisions.append((a, b))
+        for (cx, cy), bucket in self.cells.items():
+            count = len(bucket)
+            if count < 2:
+                continue
+            for i in range(count - 1):
+                a = bucket[i]
+                a_span = spans[a]
+                ax, ay, aw, ah = a.x, a.y, a.width, a.height
+                for j in range(i + 1, count):
+                    b = bucket[j]
+                    b_span = spans[b]
+                    # Pairs sharing several cells are tested in just one of them:
+                    # the top-left cell both spans cover
+                    if (max(a_span[0], b_span[0]) != cx or
+                            max(a_span[1], b_span[1]) != cy):
+                        continue
+                    if (ax < b.x + b.width and ax + aw > b.x and
+                            ay < b.y + b.height and ay + ah > b.y):
+                        collisions.append((a, b) if order[a] < order[b] else (b, a))
         return collisions
+
+
+class ColliderSet:
+    """
+    Colliders stored as parallel NumPy arrays (struct of arrays) for batched
+    narrowphase queries, e.g. hundreds of fireballs against enemies per frame.
+    Colliders are identified by the int id add() returns; removed ids are
+    reused. Requires NumPy.
+    """
+
+    def __init__(self, capacity: int = 64):
+        if np is None:
+            raise ImportError("ColliderSet requires NumPy")
+        self.x = np.zeros(capacity)
+        self.y = np.zeros(capacity)
+        self.width = np.zeros(capacity)
+        self.height = np.zeros(capacity)
+        self.active = np.zeros(capacity, dtype=bool)
+        self.owners = [None] * capacity  # Optional object per id
+        self.size = 0  # Ids below this have been handed out
+        self._free = []
+
+    def __len__(self):
+        return self.size - len(self._free)
+
+    def _grow(self):
+        capacity = len(self.x) * 2
+        for name in ('x', 'y', 'width', 'height', 'active'):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+        self.owners.extend([None] * (capacity - len(self.owners)))
+
+    def add(self, x: float, y: float, width: float, height: float, owner=None) -> int:
+        if self._free:
+            cid = self._free.pop()
+        else:
+            if self.size == len(self.x):
+                self._grow()
+            cid = self.size
+            self.size += 1
+        self.x[cid] = x
+        self.y[cid] = y
+        self.width[cid] = width
+        self.height[cid] = height
+        self.active[cid] = True
+        self.owners[cid] = owner
+        return cid
+
+    def remove(self, cid: int):
+        if cid < self.size and self.active[cid]:
+            self.active[cid] = False
+            self.owners[cid] = None
+            self._free.append(cid)
+
+    def move(self, cid: int, x: float, y: float):
+        self.x[cid] = x
+        self.y[cid] = y
+
+    def move_many(self, ids, xs, ys):
+        """Set the positions of several colliders at once"""
+        self.x[ids] = xs
+        self.y[ids] = ys
+
+    def query_rect(self, x: float, y: float, width: float, height: float):
+        """Ids of colliders overlapping a rect"""
+        n = self.size
+        hit = (self.active[:n] &
+               (self.x[:n] < x + width) & (self.x[:n] + self.width[:n] > x) &
+               (self.y[:n] < y + height) & (self.y[:n] + self.height[:n] > y))
+        return np.flatnonzero(hit)
+
+    def query_many(self, rects, max_cells: int = 1 << 22):
+        """
+        Test many rects (an (k, 4) array-like of x, y, width, height) at once.
+        Returns (rect_indices, ids), one entry per overlapping pair. The k x n
+        test matrix is processed in slices of at most max_cells entries.
+        """
+        rects = np.asarray(rects, dtype=float).reshape(-1, 4)
+        ids = np.flatnonzero(self.active[:self.size])
+        x, y = self.x[ids], self.y[ids]
+        right, bottom = x + self.width[ids], y + self.height[ids]
+
+        step = max(1, max_cells // max(1, len(ids)))
+        rect_parts, id_parts = [], []
+        for start in range(0, len(rects), step):
+            block = rects[start:start + step]
+            qx, qy = block[:, 0:1], block[:, 1:2]
+            hit = ((x < qx + block[:, 2:3]) & (right > qx) &
+                   (y < qy + block[:, 3:4]) & (bottom > qy))
+            rows, cols = np.nonzero(hit)
+            rect_parts.append(rows + start)
+            id_parts.append(ids[cols])
+        if not rect_parts:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        return np.concatenate(rect_parts), np.concatenate(id_parts)
+
+    def all_pairs(self):
+        """
+        Every overlapping pair as (ids_a, ids_b) arrays with ids_a < ids_b.
+        Sort and sweep on x: only colliders starting inside another's x
+        extent become candidates, then y is tested for all of them at once.
+        """
+        ids = np.flatnonzero(self.active[:self.size])
+        order = ids[np.argsort(self.x[ids], kind='stable')]
+        xs = self.x[order]
+        ends = np.searchsorted(xs, xs + self.width[order], side='left')
+        counts = np.maximum(ends - np.arange(len(order)) - 1, 0)
+
+        first = np.repeat(np.arange(len(order)), counts)
+        starts = np.cumsum(counts) - counts
+        second = first + 1 + np.arange(counts.sum()) - np.repeat(starts, counts)
+
+        a, b = order[first], order[second]
+        overlap = (self.y[a] < self.y[b] + self.height[b]) & (self.y[a] + self.height[a] > self.y[b])
+        a, b = a[overlap], b[overlap]
+        return np.minimum(a, b), np.maximum(a, b)
+
+
+# Keeps a box whose edge lies exactly on a tile boundary out of the next tile
+_EDGE_EPSILON = 1e-9
+
+
+def sweep_tiles(x: float, y: float, width: float, height: float,
+                dx: float, dy: float, tile_size: int, is_solid):
+    """
+    Move a box by (dx, dy) through a tile map, x axis first, then y.
+    On each axis every tile row/column the leading edge crosses is checked
+    in order, so fast movers can't tunnel through thin walls, and the box
+    stops flush against the first solid tile. Tiles the box already
+    overlaps are ignored, so it can always move out of them.
+    is_solid(tile_x, tile_y) is the solidity lookup.
+    Returns (x, y, hit_x, hit_y).
+    """
+    hit_x = hit_y = False
+    if dx:
+        top = int(y // tile_size)
+        bottom = int((y + height - _EDGE_EPSILON) // tile_size)
+        if dx > 0:
+            edge = x + width
+            first = int((edge - _EDGE_EPSILON) // tile_size) + 1
+            last = int((edge + dx - _EDGE_EPSILON) // tile_size)
+            columns = range(first, last + 1)
+        else:
+            first = int(x // tile_size) - 1
+            last = int((x + dx) // tile_size)
+            columns = range(first, last - 1, -1)
+        x += dx
+        for column in columns:
+            if any(is_solid(column, row) for row in range(top, bottom + 1)):
+                x = column * tile_size - width if dx > 0 else (column + 1) * tile_size
+                hit_x = True
+                break
+
+    if dy:
+        left = int(x // tile_size)
+        right = int((x + width - _EDGE_EPSILON) // tile_size)
+        if dy > 0:
+            edge = y + height
+            first = int((edge - _EDGE_EPSILON) // tile_size) + 1
+            last = int((edge + dy - _EDGE_EPSILON) // tile_size)
+            rows = range(first, last + 1)
+        else:
+            first = int(y // tile_size) - 1
+            last = int((y + dy) // tile_size)
+            rows = range(first, last - 1, -1)
+        y += dy
+        for row in rows:
+            if any(is_solid(column, row) for column in range(left, right + 1)):
+                y = row * tile_size - height if dy > 0 else (row + 1) * tile_size
+                hit_y = True
+                break
+
+    return x, y, hit_x, hit_y
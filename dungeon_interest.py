@@ -0,0 +1,87 @@
+TILE_SIZE = 32
+DEFAULT_VIEW = (1920, 1080)
+
+
+class InterestGrid:
+    """
+    Coarse spatial grid of player positions for area-of-interest filtering.
+    Each player sees a rectangle of its view size (plus margin) centered on
+    its position; viewers_of() answers "who can see this point" by only
+    looking at grid cells that could hold such a viewer.
+    """
+
+    def __init__(self, cell_size=512, margin=256):
+        self.cell_size = cell_size
+        self.margin = margin
+        self.positions = {}  # {player_id: (x, y)}
+        self.cells = {}  # {(cell_x, cell_y): set(player_id)}
+        self.views = {}  # {player_id: (half_w, half_h)}
+        self.max_half_view = (DEFAULT_VIEW[0] // 2, DEFAULT_VIEW[1] // 2)
+
+    def _cell(self, x, y):
+        return (int(x) // self.cell_size, int(y) // self.cell_size)
+
+    def set_view(self, player_id, width, height):
+        """Record a client's screen size in pixels"""
+        self.views[player_id] = (width // 2, height // 2)
+        self.max_half_view = (
+            max(self.max_half_view[0], width // 2),
+            max(self.max_half_view[1], height // 2)
+        )
+
+    def update(self, player_id, x, y):
+        """Move a player, re-bucketing it only when it changes cell"""
+        old = self.positions.get(player_id)
+        self.positions[player_id] = (x, y)
+        new_cell = self._cell(x, y)
+        if old is not None:
+            old_cell = self._cell(*old)
+            if old_cell == new_cell:
+                return
+            bucket = self.cells.get(old_cell)
+            if bucket:
+                bucket.discard(player_id)
+                if not bucket:
+                    del self.cells[old_cell]
+        self.cells.setdefault(new_cell, set()).add(player_id)
+
+    def remove(self, player_id):
+        pos = self.positions.pop(player_id, None)
+        self.views.pop(player_id, None)
+        if pos is not None:
+            cell = self._cell(*pos)
+            bucket = self.cells.get(cell)
+            if bucket:
+                bucket.discard(player_id)
+                if not bucket:
+                    del self.cells[cell]
+
+    def has_position(self, player_id):
+        return player_id in self.positions
+
+    def can_see(self, viewer_id, x, y):
+        """True if (x, y) is inside the viewer's view region plus margin"""
+        pos = self.positions.get(viewer_id)
+        if pos is None:
+            # Nothing known about this viewer yet: send it everything
+            return True
+        half_w, half_h = self.views.get(viewer_id, self.max_half_view)
+        return (abs(x - pos[0]) <= half_w + self.margin and
+                abs(y - pos[1]) <= half_h + self.margin)
+
+    def viewers_of(self, x, y):
+        """Set of positioned players whose view region contains (x, y)"""
+        reach_x = self.max_half_view[0] + self.margin
+        reach_y = self.max_half_view[1] + self.margin
+        min_cx, min_cy = self._cell(x - reach_x, y - reach_y)
+        max_cx, max_cy = self._cell(x + reach_x, y + reach_y)
+
+        viewers = set()
+        for cy in range(min_cy, max_cy + 1):
+            for cx in range(min_cx, max_cx + 1):
+                bucket = self.cells.get((cx, cy))
+                if bucket:
+                    for player_id in bucket:
+                        if self.can_see(player_id, x, y):
+                            viewers.add(player_id)
+        return viewers
@@ -1,8 +1,16 @@
+import asyncio
+import queue
 import socket
 import threading
-import json
+import time
 import pickle
+from collections import Counter, deque
 from enum import Enum
+from dungeon_protocol import MessageCodec, BINARY_PROTOCOL, SNAPSHOT_PROTOCOL, DUNGEON_STREAM_PROTOCOL
+from dungeon_interest import InterestGrid, TILE_SIZE
+from dungeon_prediction import ServerClock
+from dungeon_procgen import GENERATOR_VERSION
+from dungeon_udp import UdpEndpoint, UdpServerProtocol, LossyLink, MAX_DATAGRAM
 
 
 class MessageType(Enum):
@@ -15,15 +23,22 @@ class MessageType(Enum):
     GAME_STATE = "game_state"
     DAMAGE = "damage"
     CHAT = "chat"
+    SNAPSHOT = "snapshot"
+    PLAYER_CORRECTION = "player_correction"
+    DUNGEON_REQUEST = "dungeon_request"
 
 
-class NetworkServer:
-    def __init__(self, host='0.0.0.0', port=5555, max_players=4):
-        self.host = host
-        self.port = port
+class DungeonRoom:
+    """
+    One isolated dungeon session: its players, blocks and tick loop.
+    Connections are attached with add_client() and fed whole frames with
+    handle_frame(). Everything runs on a single asyncio event loop.
+    """
+    def __init__(self, room_id=None, max_players=4, tick_rate=30):
+        self.room_id = room_id
         self.max_players = max_players
-        self.server_socket = None
-        self.clients = {}  # {addr: {'socket': socket, 'player_id': id, 'role': role}}
+        self.tick_rate = tick_rate
+        self.clients = {}  # {addr: {'writer': StreamWriter, 'player_id': id, 'role': role, 'codec': MessageCodec, ...}}
         self.running = False
         self.game_state = {
             'players': {},
@@ -32,86 +47,149 @@ class NetworkServer:
             'enemies': []
         }
         
-    def start(self):
-        """Start the server"""
-        self.server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-        self.server_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
-        self.server_socket.bind((self.host, self.port))
-        self.server_socket.listen(self.max_players)
-        self.running = True
+        self.tick_count = 0
+        self.pending_updates = {}  # {player_id: latest player data since last tick}
+        self.tick_handlers = []  # Called as handler(dt) once per tick, before sending
+        self.message_handlers = []  # Called as handler(player_id, msg) for every client message
+        self.write_buffer_limit = 256 * 1024  # Drop clients that stop reading
+        self.next_player_num = 0
+        self.last_active = time.monotonic()
+        self._tick_task = None
         
-        print(f"Server started on {self.host}:{self.port}")
+        # Area of interest: full rate inside a client's view, reduced rate outside
+        self.interest = InterestGrid()
+        self.far_update_interval = 6  # Ticks between updates about far-away players
         
-        # Start accepting connections
-        accept_thread = threading.Thread(target=self._accept_connections)
-        accept_thread.daemon = True
-        accept_thread.start()
+        # Authoritative dungeon, streamed to joiners as compressed chunks
+        self.dungeon_chunk_tiles = 32
+        self.dungeon_chunks = {}  # {(chunk_x, chunk_y): zlib tile bytes}
+        self.dungeon_order = []  # Chunk keys, spawn area first
+        self.dungeon_bytes_per_tick = 16 * 1024
         
-    def stop(self):
-        """Stop the server"""
+    def set_dungeon(self, dungeon):
+        """
+        Make a DungeonGenerator this room's map. GAME_STATE carries only its
+        layout header. Clients that can regenerate it from the header's
+        descriptor do; the rest get the tiles as DUNGEON_DATA chunks spread
+        over the next ticks, nearest the spawn point first.
+        """
+        grid = dungeon.grid
+        size = self.dungeon_chunk_tiles
+        header = dungeon.to_dict(include_tiles=False)
+        if not dungeon.is_pristine():
+            # Edited since generation, the seed alone would give the wrong map
+            del header['descriptor']
+        header['chunk_tiles'] = size
+        header['crc'] = grid.crc()
+        self.game_state['dungeon'] = header
+        
+        spawn_x, spawn_y = dungeon.spawn_point or (0, 0)
+        self.dungeon_order = grid.chunks_by_distance(spawn_x, spawn_y, size)
+        self.dungeon_chunks = {key: grid.pack_chunk(key[0], key[1], size) for key in self.dungeon_order}
+        
+    def start_ticking(self):
+        """Start this room's tick loop on the running event loop"""
+        self.running = True
+        self._tick_task = asyncio.ensure_future(self._tick_loop())
+        
+    def close(self):
+        """Stop ticking and drop every client"""
         self.running = False
-        for client_data in self.clients.values():
-            client_data['socket'].close()
-        if self.server_socket:
-            self.server_socket.close()
-        print("Server stopped")
+        if self._tick_task:
+            self._tick_task.cancel()
+            self._tick_task = None
+        for client_data in list(self.clients.values()):
+            client_data['writer'].close()
+            
+    def is_full(self):
+        return len(self.clients) >= self.max_players
         
-    def _accept_connections(self):
-        """Accept incoming client connections"""
-        while self.running:
-            try:
-                client_socket, addr = self.server_socket.accept()
-                if len(self.clients) < self.max_players:
-                    print(f"New connection from {addr}")
-                    self.clients[addr] = {
-                        'socket': client_socket,
-                        'player_id': f"player_{len(self.clients)}",
-                        'role': None
-                    }
-                    
-                    # Start thread to handle this client
-                    client_thread = threading.Thread(
-                        target=self._handle_client,
-                        args=(client_socket, addr)
-                    )
-                    client_thread.daemon = True
-                    client_thread.start()
-                else:
-                    client_socket.close()
-            except:
-                break
-                
-    def _handle_client(self, client_socket, addr):
-        """Handle messages from a client"""
+    def idle_time(self):
+        """Seconds since the last message from any client"""
+        return time.monotonic() - self.last_active
+        
+    def add_tick_handler(self, handler):
+        """Register a simulation step called as handler(dt) every tick"""
+        self.tick_handlers.append(handler)
+        
+    def add_message_handler(self, handler):
+        """Register handler(player_id, msg), called after the room has applied each client message"""
+        self.message_handlers.append(handler)
+        
+    def add_client(self, addr, writer, delta=True):
+        """
+        Attach a connection, False if the room is full.
+        delta=False turns off delta encoding for transports that can lose updates.
+        """
+        if self.is_full():
+            return False
+        self.clients[addr] = {
+            'writer': writer,
+            'player_id': f"player_{self.next_player_num}",
+            'role': None,
+            'codec': MessageCodec(delta=delta),
+            'snapshots': False,
+            'dungeon_stream': False,  # Client can load DUNGEON_DATA chunks
+            'outbox': [],  # Encoded frames waiting for the next tick
+            'last_seq': None,  # Latest input sequence received from this client
+            'dungeon_queue': deque(),  # Dungeon chunks this client still has to receive
+            'far_updates': {},  # {player_id: latest data} for players outside the view
+            'deferred_events': {}  # {(tile_x, tile_y): [(msg, world_x, world_y)]} not yet in view
+        }
+        self.next_player_num += 1
+        self.last_active = time.monotonic()
+        return True
+        
+    def handle_frame(self, addr, data):
+        """Decode and process one frame received from a client"""
+        self.last_active = time.monotonic()
+        client_data = self.clients[addr]
+        msg = client_data['codec'].decode(data)
+        self._process_message(msg, addr)
+        for handler in self.message_handlers:
+            handler(client_data['player_id'], msg)
+        
+    async def serve_client(self, addr, reader, writer, first_frame=None, delta=True):
+        """Attach a connection and process its frames until it closes"""
+        if not self.add_client(addr, writer, delta):
+            writer.close()
+            return
+        print(f"New connection from {addr}")
         try:
-            while self.running:
-                data = self._recv_data(client_socket)
-                if not data:
-                    break
-                    
-                msg = json.loads(data)
-                self._process_message(msg, addr)
-                
+            if first_frame:
+                self.handle_frame(addr, first_frame)
+            while self.running and addr in self.clients:
+                data = await read_frame(reader)
+                self.handle_frame(addr, data)
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
         except Exception as e:
             print(f"Error handling client {addr}: {e}")
         finally:
             self._remove_client(addr)
             
     def _process_message(self, msg, addr):
-        """Process received message and broadcast if needed"""
+        """Process received message and queue anything that needs relaying"""
         msg_type = msg.get('type')
         
         if msg_type == MessageType.PLAYER_UPDATE.value:
-            # Update player position and broadcast
-            player_id = self.clients[addr]['player_id']
+            # Keep only the latest update per player, sent with the next tick
+            client_data = self.clients[addr]
+            player_id = client_data['player_id']
+            # Input sequence is only meaningful to the sender
+            seq = msg['data'].pop('seq', None)
+            if seq is not None:
+                client_data['last_seq'] = seq
+            msg['data']['player_id'] = player_id
             self.game_state['players'][player_id] = msg['data']
-            self.broadcast(msg, exclude_addr=addr)
+            self.pending_updates[player_id] = msg['data']
+            self.interest.update(player_id, msg['data']['x'], msg['data']['y'])
             
         elif msg_type == MessageType.BLOCK_PLACE.value:
-            # Builder placed a block - sync to all clients
+            # Builder placed a block - sync to clients as it comes into view
             block = msg['data']
             self.game_state['blocks'].append(block)
-            self.broadcast(msg)
+            self.broadcast_at(msg, block['x'], block['y'])
             
         elif msg_type == MessageType.BLOCK_REMOVE.value:
             # Remove block and sync
@@ -120,22 +198,44 @@ class NetworkServer:
                 b for b in self.game_state['blocks'] 
                 if (b['x'], b['y']) != block_pos
             ]
-            self.broadcast(msg)
+            self.broadcast_at(msg, block_pos[0], block_pos[1])
             
         elif msg_type == MessageType.PLAYER_JOIN.value:
             # New player joined - send them the current game state
-            player_id = self.clients[addr]['player_id']
-            self.clients[addr]['role'] = msg['data']['role']
+            client_data = self.clients[addr]
+            player_id = client_data['player_id']
+            client_data['role'] = msg['data']['role']
             
             # Send full game state to new player
             state_msg = {
                 'type': MessageType.GAME_STATE.value,
                 'data': {
                     'player_id': player_id,
+                    'tick_rate': self.tick_rate,
                     'game_state': self.game_state
                 }
             }
-            self._send_data(self.clients[addr]['socket'], json.dumps(state_msg))
+            # Old clients don't list protocols and keep talking JSON
+            protocols = msg['data'].get('protocols', ())
+            use_binary = BINARY_PROTOCOL in protocols
+            if use_binary:
+                state_msg['data']['protocol'] = BINARY_PROTOCOL
+            client_data['outbox'].append(client_data['codec'].encode(state_msg))
+            client_data['codec'].binary = use_binary
+            client_data['snapshots'] = SNAPSHOT_PROTOCOL in protocols
+            client_data['dungeon_stream'] = DUNGEON_STREAM_PROTOCOL in protocols
+            if 'view' in msg['data']:
+                self.interest.set_view(player_id, *msg['data']['view'])
+            # Clients that already hold this exact map (e.g. the host) or
+            # can regenerate it from the descriptor skip the download, and
+            # clients that can't load DUNGEON_DATA never get it
+            header = self.game_state['dungeon']
+            if (header and client_data['dungeon_stream']
+                    and msg['data'].get('dungeon_crc') != header['crc']):
+                descriptor = header.get('descriptor')
+                generators = msg['data'].get('generators', ())
+                if not descriptor or descriptor['version'] not in generators:
+                    client_data['dungeon_queue'] = deque(self.dungeon_order)
             
             # Notify others
             join_msg = {
@@ -147,25 +247,190 @@ class NetworkServer:
             }
             self.broadcast(join_msg, exclude_addr=addr)
             
+        elif msg_type == MessageType.DUNGEON_REQUEST.value:
+            # Client couldn't reproduce the map from its descriptor
+            if self.game_state['dungeon'] and self.clients[addr]['dungeon_stream']:
+                self.clients[addr]['dungeon_queue'] = deque(self.dungeon_order)
+            
     def broadcast(self, msg, exclude_addr=None):
-        """Send message to all connected clients"""
-        data = json.dumps(msg)
-        for addr, client_data in list(self.clients.items()):
+        """Queue message for all connected clients, sent with the next tick"""
+        json_data = None
+        for addr, client_data in self.clients.items():
             if addr != exclude_addr:
-                try:
-                    self._send_data(client_data['socket'], data)
-                except:
-                    self._remove_client(addr)
+                codec = client_data['codec']
+                if codec.binary:
+                    # Per-client delta against what this client last received
+                    data = codec.encode(msg)
+                    if data is None:
+                        continue
+                else:
+                    if json_data is None:
+                        json_data = codec.encode(msg)
+                    data = json_data
+                client_data['outbox'].append(data)
+                
+    def correct_player(self, player_id, x, y):
+        """
+        Override a player's position with the server's (e.g. from a tick handler).
+        The owner gets a PLAYER_CORRECTION for its last input so it can reconcile
+        its prediction; everyone else sees the corrected position next tick.
+        """
+        state = self.game_state['players'].get(player_id)
+        if state is None:
+            return
+        state['x'] = x
+        state['y'] = y
+        self.pending_updates[player_id] = state
+        self.interest.update(player_id, x, y)
+        for client_data in self.clients.values():
+            if client_data['player_id'] == player_id and client_data['last_seq'] is not None:
+                correction = {
+                    'type': MessageType.PLAYER_CORRECTION.value,
+                    'data': {'seq': client_data['last_seq'], 'x': x, 'y': y}
+                }
+                client_data['outbox'].append(client_data['codec'].encode(correction))
+                
+    def broadcast_at(self, msg, tile_x, tile_y):
+        """Queue a tile event for clients that can see the tile, defer it for the rest"""
+        world_x = tile_x * TILE_SIZE + TILE_SIZE // 2
+        world_y = tile_y * TILE_SIZE + TILE_SIZE // 2
+        for client_data in self.clients.values():
+            deferred = client_data['deferred_events']
+            tile = (tile_x, tile_y)
+            # Once a tile has deferred events, later ones wait too to keep their order
+            if tile in deferred or not self.interest.can_see(client_data['player_id'], world_x, world_y):
+                deferred.setdefault(tile, []).append((msg, world_x, world_y))
+            else:
+                data = client_data['codec'].encode(msg)
+                if data is not None:
+                    client_data['outbox'].append(data)
+                    
+    def _flush_deferred_events(self, client_data):
+        """Queue deferred tile events whose tile is now in the client's view"""
+        deferred = client_data['deferred_events']
+        for tile in list(deferred):
+            events = deferred[tile]
+            _, world_x, world_y = events[0]
+            if self.interest.can_see(client_data['player_id'], world_x, world_y):
+                for msg, _, _ in events:
+                    data = client_data['codec'].encode(msg)
+                    if data is not None:
+                        client_data['outbox'].append(data)
+                del deferred[tile]
+                
+    async def _tick_loop(self):
+        """Run _tick at a fixed rate until the server stops"""
+        loop = asyncio.get_running_loop()
+        interval = 1.0 / self.tick_rate
+        next_tick = loop.time()
+        while self.running:
+            next_tick += interval
+            self._tick(interval)
+            delay = next_tick - loop.time()
+            if delay < 0:
+                # Fell behind, don't try to catch up with a burst of ticks
+                next_tick = loop.time()
+                delay = 0
+            await asyncio.sleep(delay)
+            
+    def _tick(self, dt):
+        """Step simulation and send each client one coalesced write"""
+        self.tick_count += 1
+        for handler in self.tick_handlers:
+            handler(dt)
+            
+        updates = self.pending_updates
+        self.pending_updates = {}
+        
+        # Who can see each player that moved this tick
+        viewers = {
+            player_id: self.interest.viewers_of(data['x'], data['y'])
+            for player_id, data in updates.items()
+        }
+        far_tick = self.tick_count % self.far_update_interval == 0
+        
+        slow = []
+        for addr, client_data in self.clients.items():
+            if client_data['deferred_events']:
+                self._flush_deferred_events(client_data)
+            frames = client_data['outbox']
+            client_data['outbox'] = []
+            if client_data['dungeon_queue']:
+                self._queue_dungeon_chunks(client_data, frames)
+            
+            own_id = client_data['player_id']
+            positioned = self.interest.has_position(own_id)
+            far_updates = client_data['far_updates']
+            players = []
+            for player_id, data in updates.items():
+                if player_id == own_id:
+                    continue
+                if not positioned or own_id in viewers[player_id]:
+                    players.append(data)
+                    far_updates.pop(player_id, None)
+                else:
+                    far_updates[player_id] = data
+            if far_tick and far_updates:
+                players.extend(far_updates.values())
+                client_data['far_updates'] = {}
+            if players:
+                frames.extend(self._encode_updates(client_data, players))
+            if frames:
+                writer = client_data['writer']
+                self._send_frames(writer, frames)
+                if writer.transport.get_write_buffer_size() > self.write_buffer_limit:
+                    slow.append(addr)
+        for addr in slow:
+            print(f"Client {addr} is not reading, dropping")
+            self._remove_client(addr)
+            
+    def _queue_dungeon_chunks(self, client_data, frames):
+        """Add this tick's share of a joiner's dungeon download"""
+        pending = client_data['dungeon_queue']
+        codec = client_data['codec']
+        budget = self.dungeon_bytes_per_tick
+        while pending and budget > 0:
+            chunk_x, chunk_y = pending.popleft()
+            frame = codec.encode({
+                'type': MessageType.DUNGEON_DATA.value,
+                'data': {'x': chunk_x, 'y': chunk_y, 'tiles': self.dungeon_chunks[(chunk_x, chunk_y)]}
+            })
+            frames.append(frame)
+            budget -= len(frame)
+            
+    def _encode_updates(self, client_data, players):
+        """Encode this tick's player updates for one client"""
+        codec = client_data['codec']
+        if client_data['snapshots']:
+            snapshot_msg = {
+                'type': MessageType.SNAPSHOT.value,
+                'data': {'tick': self.tick_count, 'players': players}
+            }
+            # Nothing changed for this client, don't send an empty tick
+            frame = codec.encode(snapshot_msg)
+            return [frame] if frame is not None else []
+        # Older clients get individual updates, still in one write
+        frames = []
+        for data in players:
+            frame = codec.encode({'type': MessageType.PLAYER_UPDATE.value, 'data': data})
+            if frame is not None:
+                frames.append(frame)
+        return frames
                     
     def _remove_client(self, addr):
         """Remove disconnected client"""
         if addr in self.clients:
             player_id = self.clients[addr]['player_id']
+            self.clients[addr]['writer'].close()
             del self.clients[addr]
             
             # Remove from game state
             if player_id in self.game_state['players']:
                 del self.game_state['players'][player_id]
+            self.pending_updates.pop(player_id, None)
+            self.interest.remove(player_id)
+            for other in self.clients.values():
+                other['far_updates'].pop(player_id, None)
             
             # Notify others
             leave_msg = {
@@ -175,52 +440,204 @@ class NetworkServer:
             self.broadcast(leave_msg)
             print(f"Client {addr} disconnected")
             
-    def _send_data(self, sock, data):
-        """Send length-prefixed data"""
-        data_bytes = data.encode('utf-8')
-        length = len(data_bytes).to_bytes(4, 'big')
-        sock.sendall(length + data_bytes)
+    def _send_frames(self, writer, frames):
+        """Write several length-prefixed frames in a single call"""
+        buf = bytearray()
+        for data in frames:
+            buf += len(data).to_bytes(4, 'big')
+            buf += data
+        writer.write(buf)
         
-    def _recv_data(self, sock):
-        """Receive length-prefixed data"""
-        length_bytes = self._recv_all(sock, 4)
-        if not length_bytes:
-            return None
-        length = int.from_bytes(length_bytes, 'big')
-        return self._recv_all(sock, length).decode('utf-8')
+
+
+async def read_frame(reader):
+    """Receive one length-prefixed frame from a StreamReader"""
+    length_bytes = await reader.readexactly(4)
+    length = int.from_bytes(length_bytes, 'big')
+    return await reader.readexactly(length)
+
+
+class NetworkServer(DungeonRoom):
+    """
+    Single-room dungeon server on asyncio streams.
+    All client connections, the tick loop and game_state live on one event
+    loop, so there is no per-client thread and no locking. start() runs the
+    loop in a background thread for the game; start_async()/stop_async()
+    let many servers share an existing loop.
+    transport='udp' serves clients over UDP instead (see dungeon_udp), and
+    lossy={'drop': ..., 'latency': ..., 'jitter': ...} simulates a bad link
+    on everything the server sends.
+    """
+    def __init__(self, host='0.0.0.0', port=5555, max_players=4, tick_rate=30,
+                 transport='tcp', lossy=None):
+        super().__init__(None, max_players, tick_rate)
+        self.host = host
+        self.port = port
+        self.transport = transport
+        self.lossy = lossy
         
-    def _recv_all(self, sock, n):
-        """Receive exactly n bytes"""
-        data = bytearray()
-        while len(data) < n:
-            packet = sock.recv(n - len(data))
-            if not packet:
-                return None
-            data.extend(packet)
-        return bytes(data)
+        self.loop = None
+        self._server = None
+        self._udp = None
+        self._thread = None
+        
+    def start(self):
+        """Start the server on its own event loop thread"""
+        self.loop = asyncio.new_event_loop()
+        started = threading.Event()
+        errors = []
+        
+        def run():
+            asyncio.set_event_loop(self.loop)
+            try:
+                self.loop.run_until_complete(self.start_async())
+            except Exception as e:
+                errors.append(e)
+                started.set()
+                return
+            started.set()
+            self.loop.run_forever()
+            
+        self._thread = threading.Thread(target=run)
+        self._thread.daemon = True
+        self._thread.start()
+        started.wait()
+        if errors:
+            raise errors[0]
+        
+    def stop(self):
+        """Stop the server"""
+        if self._thread is None:
+            # Running on someone else's loop, they await stop_async()
+            self.running = False
+            return
+        future = asyncio.run_coroutine_threadsafe(self.stop_async(), self.loop)
+        future.result(timeout=5)
+        self.loop.call_soon_threadsafe(self.loop.stop)
+        self._thread.join(timeout=5)
+        self._thread = None
+        
+    async def start_async(self):
+        """Start listening and ticking on the running event loop"""
+        if self.transport == 'udp':
+            loop = asyncio.get_running_loop()
+            udp_transport, self._udp = await loop.create_datagram_endpoint(
+                lambda: UdpServerProtocol(self._handle_udp_client, self.lossy),
+                local_addr=(self.host, self.port)
+            )
+            sockname = udp_transport.get_extra_info('sockname')
+        else:
+            self._server = await asyncio.start_server(
+                self._handle_client, self.host, self.port,
+                backlog=self.max_players, reuse_address=True
+            )
+            sockname = self._server.sockets[0].getsockname()
+        if self.port == 0:
+            # Pick up the OS-assigned port
+            self.port = sockname[1]
+        self.start_ticking()
+        print(f"Server started on {self.host}:{self.port} ({self.transport})")
+        
+    async def stop_async(self):
+        """Close the listener and every client connection"""
+        self.close()
+        if self._udp:
+            self._udp.close()
+        if self._server:
+            self._server.close()
+            await self._server.wait_closed()
+        print("Server stopped")
+        
+    async def _handle_client(self, reader, writer):
+        """Handle one client connection until it closes"""
+        addr = writer.get_extra_info('peername')
+        await self.serve_client(addr, reader, writer)
+        
+    def _handle_udp_client(self, addr, reader, peer):
+        """A new address sent its first reliable packet"""
+        # Unreliable updates can be lost, so each one carries the full state
+        asyncio.ensure_future(self.serve_client(addr, reader, peer, delta=False))
 
 
 class NetworkClient:
-    def __init__(self, host='localhost', port=5555):
+    """
+    Connection to a NetworkServer or SessionHost. With transport='udp' the
+    server must be a UDP NetworkServer; lossy simulates a bad link on
+    everything this client sends (see NetworkServer).
+    """
+    def __init__(self, host='localhost', port=5555, transport='tcp', lossy=None):
         self.host = host
         self.port = port
+        self.transport = transport
+        self.lossy = lossy
         self.socket = None
         self.connected = False
         self.player_id = None
         self.message_handlers = {}
+        self.codec = MessageCodec(delta=transport != 'udp')
+        
+        # UDP connection state, shared by the send, receive and service threads
+        self.udp = None
+        self._udp_lock = threading.Lock()
         
-    def connect(self, role):
-        """Connect to server"""
+        # Decoded messages wait here until the game loop calls process_messages()
+        self.inbox = queue.SimpleQueue()
+        self.message_counts = Counter()  # {msg_type: messages received}
+        self.message_time = None  # Receive time of the message being handled
+        self.message_tick = None  # Server tick of the snapshot being handled
+        self.tick_rate = None  # Server ticks per second, from GAME_STATE
+        self.server_clock = ServerClock()
+        
+        # Outbound messages are written by a sender thread so the game loop
+        # never blocks on the socket. Player updates are latest-wins.
+        self.max_outbox = 256
+        self.outbox = deque()
+        self.latest_update = None
+        self._ordered_outbox = False  # An update was moved ahead of a reliable message
+        self._send_ready = threading.Condition()
+        
+    def connect(self, role, room=None, view=None, dungeon_crc=None):
+        """
+        Connect to server, optionally joining a room on a SessionHost.
+        view is the (width, height) of the screen, used for interest filtering.
+        dungeon_crc is the TileGrid.crc() of a map the client already has.
+        """
         try:
-            self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-            self.socket.connect((self.host, self.port))
+            if self.transport == 'udp':
+                self.socket = socket.socket(socket.AF_INET, socket.SOCK_DGRAM)
+                self.socket.connect((self.host, self.port))
+                send = self.socket.send
+                if self.lossy:
+                    send = LossyLink(send, **self.lossy)
+                self.udp = UdpEndpoint(send)
+                service_thread = threading.Thread(target=self._udp_service_loop)
+                service_thread.daemon = True
+                service_thread.start()
+            else:
+                self.socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+                self.socket.connect((self.host, self.port))
             self.connected = True
             
+            # Start send thread
+            send_thread = threading.Thread(target=self._send_loop)
+            send_thread.daemon = True
+            send_thread.start()
+            
             # Send join message
             join_msg = {
                 'type': MessageType.PLAYER_JOIN.value,
-                'data': {'role': role}
+                'data': {
+                    'role': role,
+                    'protocols': [BINARY_PROTOCOL, SNAPSHOT_PROTOCOL, DUNGEON_STREAM_PROTOCOL],
+                    'generators': [GENERATOR_VERSION]
+                }
             }
+            if room is not None:
+                join_msg['data']['room'] = room
+            if view is not None:
+                join_msg['data']['view'] = list(view)
+            if dungeon_crc is not None:
+                join_msg['data']['dungeon_crc'] = dungeon_crc
             self.send_message(join_msg)
             
             # Start receive thread
@@ -237,59 +654,200 @@ class NetworkClient:
     def disconnect(self):
         """Disconnect from server"""
         self.connected = False
+        with self._send_ready:
+            self._send_ready.notify()
+        if self.udp:
+            with self._udp_lock:
+                try:
+                    self.udp.close()
+                except OSError:
+                    pass
         if self.socket:
             self.socket.close()
             
     def send_message(self, msg):
-        """Send message to server"""
+        """Queue message for the sender thread, never blocks"""
         if not self.connected:
             return
-        try:
-            data = json.dumps(msg)
-            self._send_data(data)
-        except Exception as e:
-            print(f"Send error: {e}")
-            self.connected = False
+        with self._send_ready:
+            if msg.get('type') == MessageType.PLAYER_UPDATE.value:
+                # A newer position makes any unsent one worthless
+                self.latest_update = msg
+            elif len(self.outbox) >= self.max_outbox:
+                # Server isn't keeping up with reliable traffic, give up on the link
+                print("Send error: outbound queue full")
+                self.connected = False
+            else:
+                if self.latest_update is not None:
+                    # The move queued before this message is sent ahead of
+                    # it, so the server applies the action after the move.
+                    # Over UDP that batch then goes on the reliable channel,
+                    # otherwise the move could arrive late or not at all
+                    self.outbox.append(self.latest_update)
+                    self.latest_update = None
+                    self._ordered_outbox = True
+                self.outbox.append(msg)
+            self._send_ready.notify()
+            
+    def _send_loop(self):
+        """Write everything queued since the last write as one framed batch"""
+        while self.connected:
+            with self._send_ready:
+                while self.connected and not self.outbox and self.latest_update is None:
+                    self._send_ready.wait()
+                messages = list(self.outbox)
+                self.outbox.clear()
+                ordered = self._ordered_outbox
+                self._ordered_outbox = False
+                if self.latest_update is not None:
+                    messages.append(self.latest_update)
+                    self.latest_update = None
+            if not self.connected:
+                break
+            
+            frames = []
+            for msg in messages:
+                data = self.codec.encode(msg)
+                # None means delta encoding found nothing new to send
+                if data is not None:
+                    frames.append(data)
+            try:
+                if frames:
+                    # The whole batch, so the newest update can't overtake
+                    # the older one sent ahead of a reliable message either
+                    self._send_frames(frames, len(frames) if ordered else 0)
+            except Exception as e:
+                print(f"Send error: {e}")
+                self.connected = False
             
     def register_handler(self, msg_type, handler):
         """Register a handler for a message type"""
         self.message_handlers[msg_type] = handler
         
+    def state_time(self):
+        """
+        Local time the message being handled describes. Snapshot states use
+        their server tick, so network jitter doesn't reach interpolation.
+        Plain updates carry no tick and fall back to the receive time
+        """
+        if self.message_tick is None:
+            return self.message_time
+        return self.server_clock.to_local(self.message_tick / self.tick_rate)
+        
+    def process_messages(self, time_budget=None):
+        """
+        Call handlers for queued messages on the calling (game loop) thread.
+        Stops early once time_budget seconds are used up; whatever is left
+        stays queued for the next call. Returns the number handled.
+        """
+        deadline = None if time_budget is None else time.perf_counter() + time_budget
+        handled = 0
+        while deadline is None or time.perf_counter() < deadline:
+            try:
+                msg_type, data, self.message_time = self.inbox.get_nowait()
+            except queue.Empty:
+                break
+            handled += 1
+            
+            # Call registered handler if exists
+            if msg_type in self.message_handlers:
+                self.message_handlers[msg_type](data)
+            elif msg_type == MessageType.SNAPSHOT.value:
+                # Unpack coalesced tick into per-player updates
+                handler = self.message_handlers.get(MessageType.PLAYER_UPDATE.value)
+                if self.tick_rate:
+                    self.message_tick = data['tick']
+                    self.server_clock.observe(data['tick'] / self.tick_rate, self.message_time)
+                if handler:
+                    for player_data in data['players']:
+                        handler(player_data)
+                self.message_tick = None
+        return handled
+        
     def _receive_loop(self):
         """Continuously receive messages from server"""
         while self.connected:
             try:
-                data = self._recv_data()
-                if not data:
+                frames = self._recv_frames()
+                if frames is None:
                     break
                     
-                msg = json.loads(data)
-                msg_type = msg.get('type')
-                
-                # Call registered handler if exists
-                if msg_type in self.message_handlers:
-                    self.message_handlers[msg_type](msg['data'])
+                for data in frames:
+                    msg = self.codec.decode(data)
+                    msg_type = msg.get('type')
+                    
+                    # Server accepted the binary protocol, switch after GAME_STATE
+                    if msg_type == MessageType.GAME_STATE.value:
+                        self.player_id = msg['data']['player_id']
+                        self.tick_rate = msg['data'].get('tick_rate')
+                        self.codec.binary = msg['data'].get('protocol') == BINARY_PROTOCOL
+                    
+                    # Handlers touch scene state, so they run on the game loop
+                    self.message_counts[msg_type] += 1
+                    self.inbox.put((msg_type, msg['data'], time.monotonic()))
                     
             except Exception as e:
                 print(f"Receive error: {e}")
                 break
                 
         self.connected = False
+        with self._send_ready:
+            self._send_ready.notify()
         print("Disconnected from server")
         
-    def _send_data(self, data):
-        """Send length-prefixed data"""
-        data_bytes = data.encode('utf-8')
-        length = len(data_bytes).to_bytes(4, 'big')
-        self.socket.sendall(length + data_bytes)
+    def _udp_service_loop(self):
+        """Acks, retransmits and keepalives for the UDP connection"""
+        while True:
+            time.sleep(0.02)
+            with self._udp_lock:
+                if self.udp.closed:
+                    break
+                try:
+                    alive = self.udp.service()
+                except OSError:
+                    alive = False
+            if not alive:
+                print("Server connection timed out")
+                self.disconnect()
+                break
+                
+    def _send_frames(self, frames, ordered=0):
+        """
+        Send several length-prefixed frames in a single write. Over UDP the
+        first `ordered` frames go reliable, TCP keeps every frame in order
+        """
+        if self.udp:
+            with self._udp_lock:
+                self.udp.send_frames(frames, ordered)
+            return
+        buf = bytearray()
+        for data in frames:
+            buf += len(data).to_bytes(4, 'big')
+            buf += data
+        self.socket.sendall(buf)
         
+    def _recv_frames(self):
+        """Block until one or more frames arrive, None once the connection is gone"""
+        if not self.udp:
+            data = self._recv_data()
+            return [data] if data else None
+        while True:
+            datagram = self.socket.recv(MAX_DATAGRAM + 64)
+            with self._udp_lock:
+                frames = self.udp.datagram_received(datagram)
+                closed = self.udp.closed
+            if frames:
+                return frames
+            if closed:
+                return None
+                
     def _recv_data(self):
         """Receive length-prefixed data"""
         length_bytes = self._recv_all(4)
         if not length_bytes:
             return None
         length = int.from_bytes(length_bytes, 'big')
-        return self._recv_all(length).decode('utf-8')
+        return self._recv_all(length)
         
     def _recv_all(self, n):
         """Receive exactly n bytes"""
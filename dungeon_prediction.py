@@ -0,0 +1,112 @@
+from collections import deque
+
+
+# MultiplayerPlayer.velocity is in pixels per 60 Hz frame
+VELOCITY_SCALE = 60
+
+
+class SnapshotBuffer:
+    """
+    Timestamped states of one remote player.
+    sample() interpolates between the two states around the render time and
+    extrapolates with the last known velocity, for at most max_extrapolation
+    seconds, when the next state is late.
+    """
+
+    def __init__(self, capacity=32, max_extrapolation=0.25):
+        self.states = deque(maxlen=capacity)  # [(time, x, y, vx, vy)]
+        self.max_extrapolation = max_extrapolation
+
+    def push(self, timestamp, x, y, velocity=(0, 0)):
+        """
+        Add a state timestamped with the time it describes (the server tick
+        mapped through a ServerClock, or the receive time for updates that
+        carry no tick). A state not newer than the last one is dropped
+        """
+        if self.states and timestamp <= self.states[-1][0]:
+            return
+        self.states.append((timestamp, x, y, velocity[0], velocity[1]))
+
+    def sample(self, render_time):
+        """Position at render_time, or None if nothing has arrived yet"""
+        states = self.states
+        if not states:
+            return None
+
+        first = states[0]
+        if render_time <= first[0]:
+            return first[1], first[2]
+
+        last = states[-1]
+        if render_time >= last[0]:
+            dt = min(render_time - last[0], self.max_extrapolation) * VELOCITY_SCALE
+            return last[1] + last[3] * dt, last[2] + last[4] * dt
+
+        # Drop states that are entirely in the past, keeping one before render_time
+        while len(states) > 2 and states[1][0] <= render_time:
+            states.popleft()
+        for i in range(len(states) - 1):
+            a, b = states[i], states[i + 1]
+            if a[0] <= render_time <= b[0]:
+                t = (render_time - a[0]) / (b[0] - a[0])
+                return a[1] + (b[1] - a[1]) * t, a[2] + (b[2] - a[2]) * t
+        return last[1], last[2]
+
+
+class ServerClock:
+    """
+    Maps server time onto the local monotonic clock from (server time,
+    receive time) pairs. The offset follows the least delayed packets: it
+    drops straight to any smaller offset seen and only creeps up towards
+    larger ones, so a late packet doesn't move the timeline while clock
+    drift or a slower route are still followed.
+    """
+
+    def __init__(self, rise=0.002):
+        self.offset = None
+        self.rise = rise  # Share of a larger offset taken per observation
+
+    def observe(self, server_time, local_time):
+        offset = local_time - server_time
+        if self.offset is None or offset < self.offset:
+            self.offset = offset
+        else:
+            self.offset += (offset - self.offset) * self.rise
+
+    def to_local(self, server_time):
+        return server_time + self.offset
+
+
+class PredictionBuffer:
+    """
+    Locally predicted positions keyed by input sequence number.
+    When the server corrects the state it had at some sequence, the error at
+    that point is carried over to the current position and to every later
+    prediction, which is equivalent to replaying the unacknowledged moves
+    from the server's position.
+    """
+
+    def __init__(self, capacity=128):
+        self.history = deque(maxlen=capacity)  # [(seq, x, y)]
+
+    def record(self, seq, x, y):
+        self.history.append((seq, x, y))
+
+    def reconcile(self, seq, server_x, server_y, x, y):
+        """Corrected current position given the server's state at seq"""
+        history = self.history
+        while history and history[0][0] < seq:
+            history.popleft()
+        if not history or history[0][0] != seq:
+            # Prediction for that input is gone, trust the server outright
+            history.clear()
+            return server_x, server_y
+
+        _, predicted_x, predicted_y = history.popleft()
+        error_x = server_x - predicted_x
+        error_y = server_y - predicted_y
+        if not error_x and not error_y:
+            return x, y
+        for i, (s, px, py) in enumerate(history):
+            history[i] = (s, px + error_x, py + error_y)
+        return x + error_x, y + error_y
@@ -1,9 +1,21 @@
 import random
 import json
-from enum import Enum
+import base64
+import zlib
+from enum import IntEnum
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
 
-class TileType(Enum):
+
+# Bump whenever a change to generation would turn the same seed into a
+# different map; (seed, width, height, num_rooms, version) names a map exactly
+GENERATOR_VERSION = 1
+
+
+class TileType(IntEnum):
     EMPTY = 0
     WALL = 1
     FLOOR = 2
@@ -15,6 +27,175 @@ class TileType(Enum):
     BUILDER_BLOCK = 8
 
 
+class TileGrid:
+    """
+    Dungeon tiles in one contiguous bytearray, one uint8 per tile.
+    grid[y][x] reads and writes like the old list of lists: rows are
+    memoryview slices and tiles are plain ints, which compare equal to
+    TileType members. With NumPy installed, .array is a (height, width)
+    uint8 view of the same memory for vectorized work.
+    """
+    def __init__(self, width, height, fill=TileType.WALL, data=None):
+        self.width = width
+        self.height = height
+        if data is None:
+            self.data = bytearray((fill,)) * (width * height)
+        else:
+            if len(data) != width * height:
+                raise ValueError(f"Expected {width * height} tile bytes, got {len(data)}")
+            self.data = bytearray(data)
+        view = memoryview(self.data)
+        self.rows = [view[y * width:(y + 1) * width] for y in range(height)]
+        self.array = None
+        if np is not None:
+            self.array = np.frombuffer(self.data, dtype=np.uint8).reshape(height, width)
+        
+    def __getitem__(self, y):
+        return self.rows[y]
+    
+    def __len__(self):
+        return self.height
+    
+    def __iter__(self):
+        return iter(self.rows)
+    
+    def fill_rect(self, x, y, width, height, tile):
+        """Set a rectangle of tiles, clipped to the grid"""
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(self.width, x + width), min(self.height, y + height)
+        if x0 >= x1 or y0 >= y1:
+            return
+        if self.array is not None:
+            self.array[y0:y1, x0:x1] = tile
+        else:
+            run = bytes((tile,)) * (x1 - x0)
+            for row in range(y0, y1):
+                start = row * self.width + x0
+                self.data[start:start + len(run)] = run
+                
+    def count(self, tile):
+        """Number of tiles of a type"""
+        if self.array is not None:
+            return int(np.count_nonzero(self.array == tile))
+        return self.data.count(tile)
+    
+    def to_bytes(self):
+        return bytes(self.data)
+    
+    def crc(self):
+        """Checksum of the tile bytes, to tell whether two grids match"""
+        return zlib.crc32(self.data)
+    
+    def get_region(self, x, y, width, height):
+        """Row-major tile bytes of a rectangle inside the grid"""
+        if self.array is not None:
+            return self.array[y:y + height, x:x + width].tobytes()
+        return b''.join(self.rows[row][x:x + width] for row in range(y, y + height))
+    
+    def set_region(self, x, y, width, height, data):
+        """Write row-major tile bytes into a rectangle inside the grid"""
+        for i in range(height):
+            self.rows[y + i][x:x + width] = data[i * width:(i + 1) * width]
+            
+    def chunk_rect(self, chunk_x, chunk_y, chunk_tiles):
+        """Tile rectangle (x, y, width, height) of a chunk, clipped to the grid"""
+        x = chunk_x * chunk_tiles
+        y = chunk_y * chunk_tiles
+        return x, y, min(chunk_tiles, self.width - x), min(chunk_tiles, self.height - y)
+    
+    def pack_chunk(self, chunk_x, chunk_y, chunk_tiles):
+        """zlib-compressed tile bytes of one chunk"""
+        return zlib.compress(self.get_region(*self.chunk_rect(chunk_x, chunk_y, chunk_tiles)))
+    
+    def unpack_chunk(self, chunk_x, chunk_y, chunk_tiles, packed):
+        """Write a chunk made by pack_chunk, returns its tile rectangle"""
+        rect = self.chunk_rect(chunk_x, chunk_y, chunk_tiles)
+        self.set_region(*rect, zlib.decompress(packed))
+        return rect
+    
+    def chunks_by_distance(self, tile_x, tile_y, chunk_tiles):
+        """Every chunk coordinate, nearest to the given tile first"""
+        chunks_x = -(-self.width // chunk_tiles)
+        chunks_y = -(-self.height // chunk_tiles)
+        origin_x = tile_x // chunk_tiles
+        origin_y = tile_y // chunk_tiles
+        keys = [(cx, cy) for cy in range(chunks_y) for cx in range(chunks_x)]
+        keys.sort(key=lambda key: max(abs(key[0] - origin_x), abs(key[1] - origin_y)))
+        return keys
+    
+    def to_lists(self):
+        """Nested lists of tile ints, row-major"""
+        return [list(row) for row in self.rows]
+
+
+# Tiles that block movement. EMPTY is never generated, it only marks tiles
+# of a streamed dungeon that haven't arrived yet
+SOLID_TILES = (TileType.EMPTY, TileType.WALL)
+
+
+class SolidityMap:
+    """
+    One byte per tile, nonzero where movement is blocked, combining the
+    grid's solid tiles with builder blocks so collision (and anything else
+    asking "can I stand here") is a single index. Walls and blocks are
+    separate bits, so removing a block never clears a wall under it.
+    set_tile() and set_block() are O(1).
+    """
+    WALL = 1
+    BLOCK = 2
+    _WALL_TABLE = bytes(1 if i in SOLID_TILES else 0 for i in range(256))  # tile value -> WALL bit
+    
+    def __init__(self, grid):
+        self.grid = grid
+        self.width = grid.width
+        self.height = grid.height
+        self.data = bytearray(grid.data.translate(self._WALL_TABLE))
+        
+    def is_solid(self, x, y):
+        """Blocked tile, the map edge counts as solid"""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            return self.data[y * self.width + x] != 0
+        return True
+    
+    def has_block(self, x, y):
+        return 0 <= x < self.width and 0 <= y < self.height and bool(self.data[y * self.width + x] & self.BLOCK)
+    
+    def set_tile(self, x, y, tile):
+        """Track a changed grid tile"""
+        i = y * self.width + x
+        self.data[i] = (self.data[i] & self.BLOCK) | self._WALL_TABLE[tile]
+        
+    def set_block(self, x, y, solid):
+        """Track a builder block placed (solid=True) or removed"""
+        if 0 <= x < self.width and 0 <= y < self.height:
+            i = y * self.width + x
+            self.data[i] = (self.data[i] | self.BLOCK) if solid else (self.data[i] & ~self.BLOCK)
+            
+    def update_region(self, x, y, width, height):
+        """Re-read the solid tiles of a grid rectangle (e.g. a streamed chunk)"""
+        for row in range(y, y + height):
+            start = row * self.width + x
+            walls = self.grid.data[start:start + width].translate(self._WALL_TABLE)
+            old = self.data[start:start + width]
+            if any(old):
+                walls = bytes(wall | (prev & self.BLOCK) for wall, prev in zip(walls, old))
+            self.data[start:start + width] = walls
+            
+    def blocks_in(self, x, y, width, height):
+        """Tile coordinates of builder blocks inside a rectangle, row by row"""
+        x0, y0 = max(0, x), max(0, y)
+        x1, y1 = min(self.width, x + width), min(self.height, y + height)
+        for row in range(y0, y1):
+            start = row * self.width
+            span = self.data[start + x0:start + x1]
+            # Most rows have no blocks, skip them at C speed
+            if not span or max(span) < self.BLOCK:
+                continue
+            for offset, value in enumerate(span):
+                if value & self.BLOCK:
+                    yield x0 + offset, row
+
+
 class Room:
     def __init__(self, x, y, width, height, room_type="normal"):
         self.x = x
@@ -36,19 +217,30 @@ class Room:
 
 
 class DungeonGenerator:
-    def __init__(self, width=80, height=60, num_rooms=8):
+    """
+    Seeded dungeon generator. All randomness comes from a private
+    random.Random, so the same descriptor() always generates the same map
+    and peers can regenerate it instead of downloading it.
+    """
+    def __init__(self, width=80, height=60, num_rooms=8, seed=None, version=GENERATOR_VERSION):
+        if version != GENERATOR_VERSION:
+            raise ValueError(f"Unsupported dungeon generator version: {version}")
         self.width = width
         self.height = height
         self.num_rooms = num_rooms
-        self.grid = [[TileType.WALL for _ in range(width)] for _ in range(height)]
+        self.version = version
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.rng = random.Random(self.seed)
+        self.grid = TileGrid(width, height)
         self.rooms = []
         self.spawn_point = None
         self.boss_room = None
         
     def generate(self):
         """Generate a complete dungeon"""
+        self.rng.seed(self.seed)
         self.rooms = []
-        self.grid = [[TileType.WALL for _ in range(self.width)] for _ in range(self.height)]
+        self.grid = TileGrid(self.width, self.height)
         
         # Generate rooms
         for i in range(self.num_rooms):
@@ -80,10 +272,10 @@ class DungeonGenerator:
         """Try to create a room that doesn't overlap"""
         max_attempts = 30
         for _ in range(max_attempts):
-            width = random.randint(5, 12)
-            height = random.randint(5, 12)
-            x = random.randint(1, self.width - width - 1)
-            y = random.randint(1, self.height - height - 1)
+            width = self.rng.randint(5, 12)
+            height = self.rng.randint(5, 12)
+            x = self.rng.randint(1, self.width - width - 1)
+            y = self.rng.randint(1, self.height - height - 1)
             
             new_room = Room(x, y, width, height)
             
@@ -101,10 +293,7 @@ class DungeonGenerator:
     
     def _carve_room(self, room):
         """Carve out a room in the grid"""
-        for y in range(room.y, room.y + room.height):
-            for x in range(room.x, room.x + room.width):
-                if 0 <= x < self.width and 0 <= y < self.height:
-                    self.grid[y][x] = TileType.FLOOR
+        self.grid.fill_rect(room.x, room.y, room.width, room.height, TileType.FLOOR)
     
     def _connect_rooms(self):
         """Connect all rooms with corridors"""
@@ -116,7 +305,7 @@ class DungeonGenerator:
             cx2, cy2 = room_b.center()
             
             # Create L-shaped corridor
-            if random.random() < 0.5:
+            if self.rng.random() < 0.5:
                 self._carve_h_corridor(cx1, cx2, cy1)
                 self._carve_v_corridor(cy1, cy2, cx2)
             else:
@@ -125,28 +314,24 @@ class DungeonGenerator:
     
     def _carve_h_corridor(self, x1, x2, y):
         """Horizontal corridor"""
-        for x in range(min(x1, x2), max(x1, x2) + 1):
-            if 0 <= x < self.width and 0 <= y < self.height:
-                self.grid[y][x] = TileType.FLOOR
+        self.grid.fill_rect(min(x1, x2), y, abs(x2 - x1) + 1, 1, TileType.FLOOR)
     
     def _carve_v_corridor(self, y1, y2, x):
         """Vertical corridor"""
-        for y in range(min(y1, y2), max(y1, y2) + 1):
-            if 0 <= x < self.width and 0 <= y < self.height:
-                self.grid[y][x] = TileType.FLOOR
+        self.grid.fill_rect(x, min(y1, y2), 1, abs(y2 - y1) + 1, TileType.FLOOR)
     
     def _add_features(self):
         """Add traps and chests to rooms"""
         for room in self.rooms[1:-1]:  # Skip spawn and boss rooms
-            if random.random() < 0.4:  # 40% chance for trap
-                tx = random.randint(room.x + 1, room.x + room.width - 2)
-                ty = random.randint(room.y + 1, room.y + room.height - 2)
+            if self.rng.random() < 0.4:  # 40% chance for trap
+                tx = self.rng.randint(room.x + 1, room.x + room.width - 2)
+                ty = self.rng.randint(room.y + 1, room.y + room.height - 2)
                 self.grid[ty][tx] = TileType.TRAP
                 room.room_type = "trap"
             
-            if random.random() < 0.3:  # 30% chance for chest
-                cx = random.randint(room.x + 1, room.x + room.width - 2)
-                cy = random.randint(room.y + 1, room.y + room.height - 2)
+            if self.rng.random() < 0.3:  # 30% chance for chest
+                cx = self.rng.randint(room.x + 1, room.x + room.width - 2)
+                cy = self.rng.randint(room.y + 1, room.y + room.height - 2)
                 if self.grid[cy][cx] == TileType.FLOOR:
                     self.grid[cy][cx] = TileType.CHEST
     
@@ -155,12 +340,38 @@ class DungeonGenerator:
         if 0 <= x < self.width and 0 <= y < self.height:
             self.grid[y][x] = tile_type
     
-    def to_dict(self):
-        """Convert dungeon to dictionary for saving/networking"""
+    def descriptor(self):
+        """The few values that regenerate this dungeon exactly"""
         return {
+            'seed': self.seed,
+            'width': self.width,
+            'height': self.height,
+            'num_rooms': self.num_rooms,
+            'version': self.version
+        }
+    
+    @staticmethod
+    def from_descriptor(descriptor):
+        """Regenerate a dungeon from descriptor(), ValueError if the version is unknown"""
+        gen = DungeonGenerator(
+            descriptor['width'], descriptor['height'], descriptor['num_rooms'],
+            descriptor['seed'], descriptor['version']
+        )
+        gen.generate()
+        return gen
+    
+    def is_pristine(self):
+        """True if the grid is exactly what descriptor() regenerates, i.e. unedited"""
+        return DungeonGenerator.from_descriptor(self.descriptor()).grid.crc() == self.grid.crc()
+    
+    def to_dict(self, include_tiles=True):
+        """
+        Convert dungeon to dictionary for saving/networking.
+        Without tiles it is just the layout header, tiles arrive separately.
+        """
+        data = {
             'width': self.width,
             'height': self.height,
-            'grid': [[tile.value for tile in row] for row in self.grid],
             'rooms': [
                 {
                     'x': room.x,
@@ -171,19 +382,38 @@ class DungeonGenerator:
                 }
                 for room in self.rooms
             ],
-            'spawn_point': self.spawn_point
+            'spawn_point': self.spawn_point,
+            'descriptor': self.descriptor()
         }
+        if include_tiles:
+            # Packed row-major tile bytes
+            data['tiles'] = base64.b64encode(self.grid.to_bytes()).decode('ascii')
+        return data
     
     @staticmethod
     def from_dict(data):
         """Load dungeon from dictionary"""
-        gen = DungeonGenerator(data['width'], data['height'])
-        gen.grid = [[TileType(val) for val in row] for row in data['grid']]
+        descriptor = data.get('descriptor')
+        if descriptor and descriptor['version'] == GENERATOR_VERSION:
+            gen = DungeonGenerator(data['width'], data['height'],
+                                   descriptor['num_rooms'], descriptor['seed'])
+        else:
+            gen = DungeonGenerator(data['width'], data['height'])
+        if 'tiles' in data:
+            gen.grid = TileGrid(data['width'], data['height'], data=base64.b64decode(data['tiles']))
+        elif 'grid' in data:
+            # Older saves store nested lists
+            tiles = bytes(val for row in data['grid'] for val in row)
+            gen.grid = TileGrid(data['width'], data['height'], data=tiles)
+        else:
+            # Header only: tiles not received yet
+            gen.grid = TileGrid(data['width'], data['height'], fill=TileType.EMPTY)
         gen.rooms = [
             Room(r['x'], r['y'], r['width'], r['height'], r['type'])
             for r in data['rooms']
         ]
-        gen.spawn_point = tuple(data['spawn_point'])
+        if data.get('spawn_point') is not None:
+            gen.spawn_point = tuple(data['spawn_point'])
         return gen
     
     def save_to_file(self, filename):
@@ -204,7 +434,7 @@ if __name__ == "__main__":
     dungeon = DungeonGenerator(width=60, height=40, num_rooms=8)
     grid, rooms = dungeon.generate()
     
-    print(f"Generated {len(rooms)} rooms")
+    print(f"Generated {len(rooms)} rooms from seed {dungeon.seed}")
     print(f"Spawn point: {dungeon.spawn_point}")
     
     # Save to file
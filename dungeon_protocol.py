@@ -0,0 +1,301 @@
+import base64
+import json
+import struct
+
+
+# Protocol name negotiated in PLAYER_JOIN / GAME_STATE
+BINARY_PROTOCOL = "bin1"
+# Client understands coalesced per-tick SNAPSHOT messages
+SNAPSHOT_PROTOCOL = "snap1"
+# Client can load a map streamed as DUNGEON_DATA chunks
+DUNGEON_STREAM_PROTOCOL = "dmap1"
+
+# First byte of a binary frame. JSON frames always start with '{' (0x7B),
+# so both encodings can share one length-prefixed stream.
+MESSAGE_CODES = {
+    'player_update': 0x01,
+    'block_place': 0x02,
+    'block_remove': 0x03,
+    'snapshot': 0x04,
+    'dungeon_data': 0x05,
+}
+MESSAGE_NAMES = {code: name for name, code in MESSAGE_CODES.items()}
+
+# Roles in wire order (index is sent as one byte)
+ROLES = ('scout', 'tank', 'mage', 'builder')
+
+# Player update field mask bits
+FIELD_X = 1 << 0
+FIELD_Y = 1 << 1
+FIELD_HEALTH = 1 << 2
+FIELD_VELOCITY = 1 << 3
+FIELD_SHIELD = 1 << 4
+FIELD_SHIELD_ON = 1 << 5
+FIELD_ROLE = 1 << 6
+FIELD_SEQ = 1 << 7
+
+_INT = struct.Struct('<i')
+_FLOAT = struct.Struct('<f')
+_VEC2 = struct.Struct('<ff')
+
+
+def write_varint(buf, value):
+    """Append an unsigned LEB128 varint to a bytearray"""
+    while value > 0x7F:
+        buf.append((value & 0x7F) | 0x80)
+        value >>= 7
+    buf.append(value)
+
+
+def read_varint(data, pos):
+    """Read an unsigned varint, returns (value, new_pos)"""
+    result = 0
+    shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+def write_svarint(buf, value):
+    """Append a zigzag-encoded signed varint"""
+    write_varint(buf, value << 1 if value >= 0 else ((-value) << 1) - 1)
+
+
+def read_svarint(data, pos):
+    """Read a zigzag-encoded signed varint"""
+    value, pos = read_varint(data, pos)
+    return (value >> 1) ^ -(value & 1), pos
+
+
+def player_number(player_id):
+    """Numeric wire ID of a server-assigned 'player_N' id, or None"""
+    if isinstance(player_id, str) and player_id.startswith('player_'):
+        suffix = player_id[7:]
+        if suffix.isdigit():
+            return int(suffix)
+    return None
+
+
+class MessageCodec:
+    """
+    Per-connection message encoder/decoder.
+    JSON is always understood; once binary is negotiated, player updates and
+    block messages go out as struct-packed frames. Player updates are delta
+    encoded against the last state sent on this connection (TCP delivers in
+    order, so the last sent state is the receiver's baseline) and unchanged
+    fields cost nothing. With delta=False every update carries its full state,
+    for transports that may lose or reorder updates (UDP).
+    """
+
+    def __init__(self, binary=False, delta=True):
+        self.binary = binary
+        self.delta = delta
+        self._sent = {}      # {player_num: last state sent}
+        self._received = {}  # {player_num: last state received}
+
+    def encode(self, msg):
+        """Encode a message dict to frame bytes, or None if there is nothing to send"""
+        if self.binary:
+            msg_type = msg.get('type')
+            if msg_type == 'player_update':
+                frame = self._encode_player_update(msg['data'])
+                if frame is not False:
+                    return frame
+            elif msg_type == 'block_place':
+                return self._encode_block_place(msg['data'])
+            elif msg_type == 'block_remove':
+                return self._encode_block_remove(msg['data'])
+            elif msg_type == 'snapshot':
+                frame = self._encode_snapshot(msg['data'])
+                if frame is not False:
+                    return frame
+            elif msg_type == 'dungeon_data':
+                return self._encode_dungeon_data(msg['data'])
+        if msg.get('type') == 'dungeon_data':
+            # JSON can't carry the compressed bytes directly
+            data = dict(msg['data'], tiles=base64.b64encode(msg['data']['tiles']).decode('ascii'))
+            msg = {'type': 'dungeon_data', 'data': data}
+        return json.dumps(msg).encode('utf-8')
+
+    def decode(self, payload):
+        """Decode frame bytes to a message dict"""
+        if payload[:1] == b'{':
+            msg = json.loads(payload)
+            if msg.get('type') == 'dungeon_data':
+                msg['data']['tiles'] = base64.b64decode(msg['data']['tiles'])
+            return msg
+        name = MESSAGE_NAMES.get(payload[0])
+        if name == 'player_update':
+            return {'type': name, 'data': self._decode_player_update(payload)}
+        if name == 'block_place':
+            return {'type': name, 'data': self._decode_block_place(payload)}
+        if name == 'block_remove':
+            return {'type': name, 'data': self._decode_block_remove(payload)}
+        if name == 'snapshot':
+            return {'type': name, 'data': self._decode_snapshot(payload)}
+        if name == 'dungeon_data':
+            return {'type': name, 'data': self._decode_dungeon_data(payload)}
+        raise ValueError(f"Unknown binary message code: {payload[0]}")
+
+    def _encode_player_update(self, data):
+        """Delta-encode a player state. False means 'fall back to JSON'"""
+        fields = self._encode_player_fields(data)
+        if fields is None or fields is False:
+            return fields
+        frame = bytearray((MESSAGE_CODES['player_update'],))
+        frame += fields
+        return bytes(frame)
+
+    def _decode_player_update(self, payload):
+        return self._decode_player_fields(payload, 1)[0]
+
+    def _encode_snapshot(self, data):
+        """code | tick | count | player deltas. Players with no changes are left out, None if none changed"""
+        for player in data['players']:
+            if player.get('role', ROLES[0]) not in ROLES:
+                return False
+        bodies = []
+        for player in data['players']:
+            fields = self._encode_player_fields(player)
+            if fields:
+                bodies.append(fields)
+        if not bodies:
+            return None
+        frame = bytearray((MESSAGE_CODES['snapshot'],))
+        write_varint(frame, data['tick'])
+        write_varint(frame, len(bodies))
+        for body in bodies:
+            frame += body
+        return bytes(frame)
+
+    def _decode_snapshot(self, payload):
+        tick, pos = read_varint(payload, 1)
+        count, pos = read_varint(payload, pos)
+        players = []
+        for _ in range(count):
+            state, pos = self._decode_player_fields(payload, pos)
+            players.append(state)
+        return {'tick': tick, 'players': players}
+
+    def _encode_player_fields(self, data):
+        """num | mask | changed fields, None if unchanged, False if not encodable"""
+        num = player_number(data.get('player_id'))
+        if num is None:
+            num = 0
+        role = data.get('role')
+        if role is not None and role not in ROLES:
+            return False
+
+        base = self._sent.get(num, {}) if self.delta else {}
+        mask = 0
+        body = bytearray()
+        if 'x' in data and data['x'] != base.get('x'):
+            mask |= FIELD_X
+            body += _INT.pack(int(data['x']))
+        if 'y' in data and data['y'] != base.get('y'):
+            mask |= FIELD_Y
+            body += _INT.pack(int(data['y']))
+        if 'health' in data and data['health'] != base.get('health'):
+            mask |= FIELD_HEALTH
+            body += _FLOAT.pack(data['health'])
+        if 'velocity' in data and tuple(data['velocity']) != base.get('velocity'):
+            mask |= FIELD_VELOCITY
+            body += _VEC2.pack(*data['velocity'])
+        if 'shield_active' in data and data['shield_active'] != base.get('shield_active'):
+            mask |= FIELD_SHIELD
+            if data['shield_active']:
+                mask |= FIELD_SHIELD_ON
+        if role is not None and role != base.get('role'):
+            mask |= FIELD_ROLE
+            body.append(ROLES.index(role))
+        if 'seq' in data and data['seq'] != base.get('seq'):
+            mask |= FIELD_SEQ
+            write_varint(body, data['seq'])
+
+        if num in self._sent and not mask:
+            return None
+
+        state = dict(base)
+        state.update(data)
+        if 'velocity' in data:
+            state['velocity'] = tuple(data['velocity'])
+        self._sent[num] = state
+
+        fields = bytearray()
+        write_varint(fields, num)
+        write_varint(fields, mask)
+        fields += body
+        return fields
+
+    def _decode_player_fields(self, payload, pos):
+        """Apply a player delta to its baseline, returns (full state, new_pos)"""
+        num, pos = read_varint(payload, pos)
+        mask, pos = read_varint(payload, pos)
+        state = self._received.setdefault(num, {'player_id': f"player_{num}"})
+
+        if mask & FIELD_X:
+            state['x'] = _INT.unpack_from(payload, pos)[0]
+            pos += 4
+        if mask & FIELD_Y:
+            state['y'] = _INT.unpack_from(payload, pos)[0]
+            pos += 4
+        if mask & FIELD_HEALTH:
+            state['health'] = _FLOAT.unpack_from(payload, pos)[0]
+            pos += 4
+        if mask & FIELD_VELOCITY:
+            state['velocity'] = _VEC2.unpack_from(payload, pos)
+            pos += 8
+        if mask & FIELD_SHIELD:
+            state['shield_active'] = bool(mask & FIELD_SHIELD_ON)
+        if mask & FIELD_ROLE:
+            state['role'] = ROLES[payload[pos]]
+            pos += 1
+        if mask & FIELD_SEQ:
+            state['seq'], pos = read_varint(payload, pos)
+        return dict(state), pos
+
+    def _encode_block_place(self, data):
+        """code | x | y | type"""
+        frame = bytearray((MESSAGE_CODES['block_place'],))
+        write_svarint(frame, data['x'])
+        write_svarint(frame, data['y'])
+        block_type = data.get('type', 'platform').encode('utf-8')
+        write_varint(frame, len(block_type))
+        frame += block_type
+        return bytes(frame)
+
+    def _decode_block_place(self, payload):
+        x, pos = read_svarint(payload, 1)
+        y, pos = read_svarint(payload, pos)
+        length, pos = read_varint(payload, pos)
+        block_type = payload[pos:pos + length].decode('utf-8')
+        return {'x': x, 'y': y, 'type': block_type}
+
+    def _encode_block_remove(self, data):
+        """code | x | y"""
+        frame = bytearray((MESSAGE_CODES['block_remove'],))
+        write_svarint(frame, data[0])
+        write_svarint(frame, data[1])
+        return bytes(frame)
+
+    def _decode_block_remove(self, payload):
+        x, pos = read_svarint(payload, 1)
+        y, pos = read_svarint(payload, pos)
+        return [x, y]
+
+    def _encode_dungeon_data(self, data):
+        """code | chunk x | chunk y | zlib tile bytes (rest of frame)"""
+        frame = bytearray((MESSAGE_CODES['dungeon_data'],))
+        write_svarint(frame, data['x'])
+        write_svarint(frame, data['y'])
+        frame += data['tiles']
+        return bytes(frame)
+
+    def _decode_dungeon_data(self, payload):
+        x, pos = read_svarint(payload, 1)
+        y, pos = read_svarint(payload, pos)
+        return {'x': x, 'y': y, 'tiles': bytes(payload[pos:])}
@@ -0,0 +1,253 @@
+import pygame
+from collections import OrderedDict
+from dungeon_procgen import TileType
+
+
+BACKGROUND_COLOR = (15, 15, 20)
+WALL_COLOR = (60, 60, 80)
+WALL_BORDER_COLOR = (40, 40, 60)
+FLOOR_COLOR = (40, 40, 50)
+
+
+def draw_tile(surface, tile, draw_x, draw_y, tile_size):
+    """Draw a single dungeon tile at a surface position"""
+    rect = pygame.Rect(draw_x, draw_y, tile_size, tile_size)
+
+    if tile == TileType.WALL:
+        pygame.draw.rect(surface, WALL_COLOR, rect)
+        # Add darker border for walls
+        pygame.draw.rect(surface, WALL_BORDER_COLOR, rect, 1)
+    elif tile == TileType.FLOOR:
+        pygame.draw.rect(surface, FLOOR_COLOR, rect)
+    elif tile == TileType.SPAWN:
+        pygame.draw.rect(surface, FLOOR_COLOR, rect)
+        pygame.draw.circle(surface, (100, 255, 100), rect.center, tile_size // 3)
+    elif tile == TileType.BOSS:
+        pygame.draw.rect(surface, FLOOR_COLOR, rect)
+        pygame.draw.circle(surface, (255, 100, 100), rect.center, tile_size // 3)
+    elif tile == TileType.TRAP:
+        pygame.draw.rect(surface, FLOOR_COLOR, rect)
+        # Draw warning pattern
+        pygame.draw.line(surface, (255, 150, 0),
+                         (draw_x, draw_y), (draw_x + tile_size, draw_y + tile_size), 2)
+        pygame.draw.line(surface, (255, 150, 0),
+                         (draw_x + tile_size, draw_y), (draw_x, draw_y + tile_size), 2)
+    elif tile == TileType.CHEST:
+        pygame.draw.rect(surface, FLOOR_COLOR, rect)
+        # Draw chest
+        chest_rect = pygame.Rect(draw_x + 8, draw_y + 12, tile_size - 16, tile_size - 16)
+        pygame.draw.rect(surface, (255, 215, 0), chest_rect)
+        pygame.draw.rect(surface, (200, 160, 0), chest_rect, 2)
+
+
+class TileChunkCache:
+    """
+    Static dungeon tiles pre-rendered into fixed-size chunk surfaces.
+    Chunks are baked lazily the first time they become visible, so drawing
+    the dungeon is a handful of blits instead of one draw call per tile.
+    Only the chunk containing a changed tile is re-baked.
+    """
+
+    def __init__(self, grid, tile_size=32, chunk_tiles=16, max_chunks=64):
+        self.tile_size = tile_size
+        self.chunk_tiles = chunk_tiles
+        self.chunk_px = tile_size * chunk_tiles
+        self.max_chunks = max_chunks
+        self.chunks = OrderedDict()  # {(chunk_x, chunk_y): Surface}, oldest first
+        self.dirty = set()
+        self.set_grid(grid)
+
+    def set_grid(self, grid):
+        """Switch to a new grid and drop every baked chunk"""
+        self.grid = grid
+        self.grid_h = len(grid)
+        self.grid_w = len(grid[0]) if self.grid_h else 0
+        self.chunks.clear()
+        self.dirty.clear()
+
+    def invalidate_tile(self, x, y):
+        """Mark the chunk containing tile (x, y) for re-baking"""
+        key = (x // self.chunk_tiles, y // self.chunk_tiles)
+        if key in self.chunks:
+            self.dirty.add(key)
+
+    def invalidate_region(self, x, y, width, height):
+        """Mark every chunk overlapping a tile rectangle for re-baking"""
+        for chunk_y in range(y // self.chunk_tiles, (y + height - 1) // self.chunk_tiles + 1):
+            for chunk_x in range(x // self.chunk_tiles, (x + width - 1) // self.chunk_tiles + 1):
+                if (chunk_x, chunk_y) in self.chunks:
+                    self.dirty.add((chunk_x, chunk_y))
+
+    def invalidate_all(self):
+        """Re-bake every chunk on next draw"""
+        self.dirty.update(self.chunks.keys())
+
+    def _bake_chunk(self, chunk_x, chunk_y):
+        """Render all tiles of one chunk into its own surface"""
+        start_x = chunk_x * self.chunk_tiles
+        start_y = chunk_y * self.chunk_tiles
+        end_x = min(self.grid_w, start_x + self.chunk_tiles)
+        end_y = min(self.grid_h, start_y + self.chunk_tiles)
+
+        surface = pygame.Surface(((end_x - start_x) * self.tile_size,
+                                  (end_y - start_y) * self.tile_size))
+        if pygame.display.get_surface() is not None:
+            # Match display pixel format so blits skip conversion
+            surface = surface.convert()
+        surface.fill(BACKGROUND_COLOR)
+
+        for y in range(start_y, end_y):
+            row = self.grid[y]
+            draw_y = (y - start_y) * self.tile_size
+            for x in range(start_x, end_x):
+                draw_tile(surface, row[x], (x - start_x) * self.tile_size, draw_y, self.tile_size)
+        return surface
+
+    def bake(self, progress=None):
+        """
+        Bake chunks ahead of drawing, row by row up to max_chunks, e.g. on
+        a loading thread before the cache is handed to a scene. progress is
+        called with the fraction done after each chunk.
+        """
+        if not self.grid_w:
+            return
+        chunks_x = (self.grid_w - 1) // self.chunk_tiles + 1
+        chunks_y = (self.grid_h - 1) // self.chunk_tiles + 1
+        keys = [(cx, cy) for cy in range(chunks_y) for cx in range(chunks_x)][:self.max_chunks]
+        for i, key in enumerate(keys):
+            self._get_chunk(key)
+            if progress:
+                progress((i + 1) / len(keys))
+
+    def _get_chunk(self, key):
+        """Get a baked chunk, baking it if missing or dirty"""
+        surface = self.chunks.get(key)
+        if surface is None or key in self.dirty:
+            surface = self._bake_chunk(*key)
+            self.chunks[key] = surface
+            self.dirty.discard(key)
+            # Evict least recently drawn chunks on very large maps
+            while len(self.chunks) > self.max_chunks:
+                old_key, _ = self.chunks.popitem(last=False)
+                self.dirty.discard(old_key)
+        self.chunks.move_to_end(key)
+        return surface
+
+    def draw(self, screen, camera_x, camera_y):
+        """Blit the chunks overlapping the camera view"""
+        if not self.grid_w:
+            return
+        screen_w, screen_h = screen.get_size()
+        max_chunk_x = (self.grid_w - 1) // self.chunk_tiles
+        max_chunk_y = (self.grid_h - 1) // self.chunk_tiles
+
+        start_cx = max(0, int(camera_x) // self.chunk_px)
+        end_cx = min(max_chunk_x, int(camera_x + screen_w) // self.chunk_px)
+        start_cy = max(0, int(camera_y) // self.chunk_px)
+        end_cy = min(max_chunk_y, int(camera_y + screen_h) // self.chunk_px)
+
+        for cy in range(start_cy, end_cy + 1):
+            for cx in range(start_cx, end_cx + 1):
+                screen.blit(self._get_chunk((cx, cy)),
+                            (cx * self.chunk_px - camera_x, cy * self.chunk_px - camera_y))
+
+
+# Minimap colour per tile value, everything else is fog
+MINIMAP_FOG = 255
+MINIMAP_COLORS = {
+    TileType.EMPTY: BACKGROUND_COLOR,
+    TileType.WALL: (90, 90, 115),
+    TileType.FLOOR: (45, 45, 58),
+    TileType.DOOR: (45, 45, 58),
+    TileType.TRAP: (255, 150, 0),
+    TileType.CHEST: (255, 215, 0),
+    TileType.SPAWN: (100, 255, 100),
+    TileType.BOSS: (255, 100, 100),
+    TileType.BUILDER_BLOCK: (120, 80, 40),
+}
+
+
+class MinimapCache:
+    """
+    Whole-dungeon overview with fog of war, one pixel per tile.
+    The pixels are an 8-bit palette surface sharing memory with a
+    bytearray, so revealing a region or changing a tile is a slice
+    assignment instead of a redraw. The scaled copy is rebuilt only after
+    a change; each frame is one blit plus a dot per player.
+    Builder blocks are read from the scene's SolidityMap.
+    """
+
+    def __init__(self, grid, solidity, max_size=160):
+        self.max_size = max_size
+        self.set_grid(grid, solidity)
+
+    def set_grid(self, grid, solidity):
+        """Switch to a new grid, everything starts unexplored"""
+        self.grid = grid
+        self.solidity = solidity
+        self.width = grid.width
+        self.height = grid.height
+        count = self.width * self.height
+        self.pixels = bytearray([MINIMAP_FOG]) * count
+        self.explored = bytearray(count)
+        self.surface = None
+        self._scaled = None
+        if count:
+            self.surface = pygame.image.frombuffer(self.pixels, (self.width, self.height), 'P')
+            palette = [(10, 10, 14)] * 256
+            for tile, color in MINIMAP_COLORS.items():
+                palette[tile] = color
+            self.surface.set_palette(palette)
+            self.scale = self.max_size / max(self.width, self.height)
+            self.size = (max(1, round(self.width * self.scale)), max(1, round(self.height * self.scale)))
+
+    def _clip(self, x, y, width, height):
+        return max(0, x), max(0, y), min(self.width, x + width), min(self.height, y + height)
+
+    def explore(self, tile_x, tile_y, radius):
+        """Reveal the square of tiles within radius of a tile"""
+        x0, y0, x1, y1 = self._clip(tile_x - radius, tile_y - radius, 2 * radius + 1, 2 * radius + 1)
+        if x0 >= x1 or y0 >= y1:
+            return
+        data = self.grid.data
+        revealed = b'\x01' * (x1 - x0)
+        for row in range(y0, y1):
+            start = row * self.width
+            self.explored[start + x0:start + x1] = revealed
+            self.pixels[start + x0:start + x1] = data[start + x0:start + x1]
+        for block_x, block_y in self.solidity.blocks_in(x0, y0, x1 - x0, y1 - y0):
+            self.pixels[block_y * self.width + block_x] = TileType.BUILDER_BLOCK
+        self._scaled = None
+
+    def refresh_region(self, x, y, width, height):
+        """Re-read explored tiles of a rectangle after tiles or blocks there changed"""
+        x0, y0, x1, y1 = self._clip(x, y, width, height)
+        data = self.grid.data
+        changed = False
+        for row in range(y0, y1):
+            start = row * self.width
+            for i in range(start + x0, start + x1):
+                if self.explored[i]:
+                    tile_x = i - start
+                    self.pixels[i] = TileType.BUILDER_BLOCK if self.solidity.has_block(tile_x, row) else data[i]
+                    changed = True
+        if changed:
+            self._scaled = None
+
+    def draw(self, screen, pos, dots, tile_size=32):
+        """
+        Blit the minimap with its top-left at pos, then a dot for each
+        (world_x, world_y, color) in dots
+        """
+        if self.surface is None:
+            return
+        if self._scaled is None:
+            self._scaled = pygame.transform.scale(self.surface, self.size)
+            if pygame.display.get_surface() is not None:
+                self._scaled = self._scaled.convert()
+        left, top = pos
+        screen.blit(self._scaled, pos)
+        pygame.draw.rect(screen, (150, 150, 150), (left - 1, top - 1, self.size[0] + 2, self.size[1] + 2), 1)
+        scale = self.scale / tile_size
+        for world_x, world_y, color in dots:
+            pygame.draw.circle(screen, color, (left + int(world_x * scale), top + int(world_y * scale)), 2)
@@ -1,5 +1,7 @@
 import pygame
 from enum import Enum
+from dungeon_prediction import SnapshotBuffer, VELOCITY_SCALE
+from fonts import render_text
 
 
 class PlayerRole(Enum):
@@ -52,8 +54,12 @@ class RoleStats:
 
 
 class MultiplayerPlayer:
-    """Enhanced player with role-based abilities"""
-    def __init__(self, screen, role=PlayerRole.SCOUT, player_id="local", is_local=True):
+    """
+    Enhanced player with role-based abilities.
+    Pure model: no surface is needed until draw(), so a headless server can
+    simulate players without a display.
+    """
+    def __init__(self, role=PlayerRole.SCOUT, player_id="local", is_local=True, center=(0, 0)):
         self.player_id = player_id
         self.is_local = is_local
         self.role = role
@@ -68,9 +74,8 @@ class MultiplayerPlayer:
         self.special_ability = stats['special']
         
         # Position and movement
-        w, h = screen.get_size()
         self.rect = pygame.Rect(0, 0, 28, 28)  # Smaller player (was 40x40)
-        self.rect.center = (w // 2, h // 2)
+        self.rect.center = center
         self.velocity = pygame.math.Vector2(0, 0)
         
         # Abilities
@@ -83,6 +88,9 @@ class MultiplayerPlayer:
         self.block_inventory = 10 if role == PlayerRole.BUILDER else 0
         self.selected_block_type = 'platform'
         
+        # Remote players are drawn from interpolated network snapshots
+        self.snapshots = None if is_local else SnapshotBuffer()
+        
     def apply_input(self, move_dir):
         """Apply movement input"""
         if move_dir.length() > 0:
@@ -92,10 +100,11 @@ class MultiplayerPlayer:
         self.velocity.x = move_dir.x * self.base_speed
         self.velocity.y = move_dir.y * self.base_speed
         
-    def update_physics(self, dt=1.0):
-        """Update position"""
-        self.rect.x += self.velocity.x * dt
-        self.rect.y += self.velocity.y * dt
+    def update_physics(self, dt=1 / VELOCITY_SCALE):
+        """Move for dt seconds (velocity is per 60 Hz frame) and count cooldowns down"""
+        frames = dt * VELOCITY_SCALE
+        self.rect.x += self.velocity.x * frames
+        self.rect.y += self.velocity.y * frames
         
         # Update cooldowns
         if self.dash_cooldown > 0:
@@ -105,6 +114,19 @@ class MultiplayerPlayer:
         if self.fireball_cooldown > 0:
             self.fireball_cooldown -= dt
             
+    def push_snapshot(self, timestamp, data):
+        """Store a received network state for interpolation"""
+        self.snapshots.push(timestamp, data['x'], data['y'], data.get('velocity', (0, 0)))
+        self.health = data['health']
+        self.shield_active = data.get('shield_active', self.shield_active)
+        
+    def interpolate(self, render_time):
+        """Move rect to the interpolated network position at render_time"""
+        pos = self.snapshots.sample(render_time)
+        if pos is not None:
+            self.rect.x = round(pos[0])
+            self.rect.y = round(pos[1])
+            
     def use_special_ability(self):
         """Use role-specific special ability"""
         if self.role == PlayerRole.SCOUT and self.dash_cooldown <= 0:
@@ -194,8 +216,7 @@ class MultiplayerPlayer:
         
         # Draw player ID (for debugging)
         if not self.is_local:
-            font = pygame.font.SysFont(None, 20)
-            text = font.render(self.player_id, True, (255, 255, 255))
+            text = render_text(self.player_id, 20, (255, 255, 255))
             screen.blit(text, (draw_x, draw_y - 20))
             
     def _draw_health_bar(self, screen, draw_rect):
@@ -228,10 +249,10 @@ class MultiplayerPlayer:
         }
     
     @staticmethod
-    def from_dict(data, screen):
+    def from_dict(data):
         """Create player from dictionary"""
         role = PlayerRole(data['role'])
-        player = MultiplayerPlayer(screen, role, data['player_id'], is_local=False)
+        player = MultiplayerPlayer(role, data['player_id'], is_local=False)
         player.rect.x = data['x']
         player.rect.y = data['y']
         player.health = data['health']
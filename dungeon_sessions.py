@@ -0,0 +1,261 @@
+import asyncio
+import multiprocessing
+import os
+import socket
+import threading
+import zlib
+from multiprocessing import reduction
+from dungeon_networking import DungeonRoom, MessageType
+from dungeon_protocol import MessageCodec
+
+
+DEFAULT_ROOM = "default"
+
+
+async def read_socket_frame(loop, sock):
+    """
+    Read exactly one length-prefixed frame from a raw non-blocking socket.
+    Unlike a StreamReader this never reads past the frame, so the socket
+    can still be handed to another process with nothing lost.
+    """
+    async def read_exactly(n):
+        data = bytearray()
+        while len(data) < n:
+            packet = await loop.sock_recv(sock, n - len(data))
+            if not packet:
+                return None
+            data.extend(packet)
+        return bytes(data)
+
+    length_bytes = await read_exactly(4)
+    if not length_bytes:
+        return None
+    return await read_exactly(int.from_bytes(length_bytes, 'big'))
+
+
+def room_of(join_frame):
+    """Room ID requested by a PLAYER_JOIN frame, None if it isn't a join"""
+    try:
+        msg = MessageCodec().decode(join_frame)
+    except ValueError:
+        return None
+    if msg.get('type') != MessageType.PLAYER_JOIN.value:
+        return None
+    return str(msg['data'].get('room', DEFAULT_ROOM))
+
+
+class RoomHost:
+    """
+    Owns the rooms of one process: creates a room on first join, routes
+    connections into it and evicts rooms that have gone idle.
+    setup_room(room), if given, is called on every new room before it
+    starts ticking (e.g. to attach a DungeonSimulation).
+    """
+
+    def __init__(self, max_players=4, tick_rate=30, idle_timeout=120, setup_room=None):
+        self.max_players = max_players
+        self.tick_rate = tick_rate
+        self.idle_timeout = idle_timeout
+        self.setup_room = setup_room
+        self.rooms = {}  # {room_id: DungeonRoom}
+        self._evict_task = None
+
+    def start(self):
+        """Start idle eviction on the running event loop"""
+        self._evict_task = asyncio.ensure_future(self._evict_loop())
+
+    def close(self):
+        if self._evict_task:
+            self._evict_task.cancel()
+        for room in self.rooms.values():
+            room.close()
+        self.rooms.clear()
+
+    def get_room(self, room_id):
+        """Get a room, creating and starting it on first use"""
+        room = self.rooms.get(room_id)
+        if room is None:
+            room = DungeonRoom(room_id, self.max_players, self.tick_rate)
+            if self.setup_room:
+                self.setup_room(room)
+            room.start_ticking()
+            self.rooms[room_id] = room
+        return room
+
+    async def adopt(self, sock, join_frame):
+        """Take over an accepted socket whose PLAYER_JOIN has already been read"""
+        room_id = room_of(join_frame)
+        if room_id is None:
+            sock.close()
+            return
+        reader, writer = await asyncio.open_connection(sock=sock)
+        addr = writer.get_extra_info('peername')
+        await self.get_room(room_id).serve_client(addr, reader, writer, join_frame)
+
+    async def _evict_loop(self):
+        """Close rooms nobody has sent anything to for idle_timeout seconds"""
+        while True:
+            await asyncio.sleep(min(10, self.idle_timeout))
+            for room_id, room in list(self.rooms.items()):
+                if room.idle_time() > self.idle_timeout:
+                    print(f"Evicting idle room {room_id}")
+                    room.close()
+                    del self.rooms[room_id]
+
+
+def _worker_main(conn, max_players, tick_rate, idle_timeout, setup_room):
+    """Worker process: receive (join frame, socket) pairs and host their rooms"""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    rooms = RoomHost(max_players, tick_rate, idle_timeout, setup_room)
+
+    def receive_sockets():
+        while True:
+            try:
+                join_frame = conn.recv()
+                fd = reduction.recv_handle(conn)
+            except (EOFError, OSError):
+                loop.call_soon_threadsafe(loop.stop)
+                return
+            sock = socket.socket(fileno=fd)
+            sock.setblocking(False)
+            asyncio.run_coroutine_threadsafe(rooms.adopt(sock, join_frame), loop)
+
+    threading.Thread(target=receive_sockets, daemon=True).start()
+    loop.call_soon(rooms.start)
+    try:
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    rooms.close()
+
+
+class SessionHost:
+    """
+    One listener serving many concurrent dungeon rooms.
+    A client's PLAYER_JOIN carries a 'room' ID (rooms are created on first
+    join) and every room has its own players, blocks and tick. With
+    workers > 0 rooms are sharded across that many worker processes by a
+    stable hash of the room ID: the listener reads the join frame and
+    passes the socket itself to the owning worker, so only accept and the
+    first frame ever touch this process. Socket handoff needs a POSIX host.
+    setup_room is passed to every RoomHost; with workers it must be picklable.
+    """
+
+    def __init__(self, host='0.0.0.0', port=5555, workers=0, max_players=4,
+                 tick_rate=30, idle_timeout=120, setup_room=None):
+        self.host = host
+        self.port = port
+        self.num_workers = workers if workers is not None else os.cpu_count()
+        self.max_players = max_players
+        self.tick_rate = tick_rate
+        self.idle_timeout = idle_timeout
+        self.setup_room = setup_room
+        self.running = False
+        self.listen_socket = None
+        self.rooms = None  # RoomHost when rooms run in this process
+        self.workers = []  # [(Process, Connection)]
+        self._accept_task = None
+
+    async def start_async(self):
+        """Start workers (if any) and the listener on the running loop"""
+        if self.num_workers:
+            # Spawn rather than fork: we are inside a running event loop
+            context = multiprocessing.get_context('spawn')
+            for _ in range(self.num_workers):
+                parent_conn, child_conn = context.Pipe()
+                process = context.Process(
+                    target=_worker_main,
+                    args=(child_conn, self.max_players, self.tick_rate, self.idle_timeout,
+                          self.setup_room)
+                )
+                process.daemon = True
+                process.start()
+                child_conn.close()
+                self.workers.append((process, parent_conn))
+        else:
+            self.rooms = RoomHost(self.max_players, self.tick_rate, self.idle_timeout,
+                                  self.setup_room)
+            self.rooms.start()
+
+        self.listen_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self.listen_socket.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self.listen_socket.bind((self.host, self.port))
+        self.listen_socket.listen(128)
+        self.listen_socket.setblocking(False)
+        self.port = self.listen_socket.getsockname()[1]
+        self.running = True
+        self._accept_task = asyncio.ensure_future(self._accept_loop())
+        print(f"Session host started on {self.host}:{self.port} "
+              f"({self.num_workers or 'no'} worker processes)")
+
+    async def stop_async(self):
+        self.running = False
+        if self._accept_task:
+            self._accept_task.cancel()
+        if self.listen_socket:
+            self.listen_socket.close()
+        if self.rooms:
+            self.rooms.close()
+        for process, conn in self.workers:
+            conn.close()
+            process.terminate()
+            process.join(timeout=5)
+        self.workers = []
+        print("Session host stopped")
+
+    def serve_forever(self):
+        """Run the host on this thread until interrupted"""
+        loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(loop)
+        loop.run_until_complete(self.start_async())
+        try:
+            loop.run_forever()
+        except KeyboardInterrupt:
+            pass
+        loop.run_until_complete(self.stop_async())
+
+    async def _accept_loop(self):
+        loop = asyncio.get_running_loop()
+        while self.running:
+            sock, addr = await loop.sock_accept(self.listen_socket)
+            sock.setblocking(False)
+            asyncio.ensure_future(self._route(loop, sock))
+
+    async def _route(self, loop, sock):
+        """Read the join frame and send the connection to its room"""
+        try:
+            join_frame = await asyncio.wait_for(read_socket_frame(loop, sock), 10)
+        except (asyncio.TimeoutError, OSError):
+            join_frame = None
+        room_id = room_of(join_frame) if join_frame else None
+        if room_id is None:
+            sock.close()
+            return
+
+        if not self.workers:
+            await self.rooms.adopt(sock, join_frame)
+            return
+
+        process, conn = self.workers[zlib.crc32(room_id.encode('utf-8')) % len(self.workers)]
+        try:
+            conn.send(join_frame)
+            reduction.send_handle(conn, sock.fileno(), process.pid)
+        except OSError as e:
+            print(f"Worker handoff failed: {e}")
+        finally:
+            # The worker has its own duplicate of the socket now
+            sock.close()
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Pocket Dungeon multi-room session host")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=5555)
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--tick-rate', type=int, default=30)
+    parser.add_argument('--idle-timeout', type=float, default=120)
+    args = parser.parse_args()
+    SessionHost(args.host, args.port, args.workers, tick_rate=args.tick_rate,
+                idle_timeout=args.idle_timeout).serve_forever()
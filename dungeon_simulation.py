@@ -0,0 +1,136 @@
+import asyncio
+import functools
+import os
+import zlib
+# Model classes import pygame for Rect/Vector2 only, keep its banner out of server logs
+os.environ.setdefault('PYGAME_HIDE_SUPPORT_PROMPT', '1')
+from collision import sweep_tiles
+from dungeon_interest import TILE_SIZE
+from dungeon_networking import MessageType, NetworkServer
+from dungeon_procgen import DungeonGenerator, SolidityMap
+from dungeon_roles import MultiplayerPlayer, BuilderBlock
+
+
+class DungeonSimulation:
+    """
+    Server-authoritative model of one room: players, builder blocks,
+    collision and the game timer, with no display, fonts or surfaces.
+    It runs on the room's fixed tick. Every reported move is swept through
+    the solidity map and a player that would pass through a wall or block
+    is stopped there and sent a PLAYER_CORRECTION.
+    """
+
+    def __init__(self, room, dungeon, tile_size=TILE_SIZE):
+        self.room = room
+        self.dungeon = dungeon
+        self.tile_size = tile_size
+        self.solidity = SolidityMap(dungeon.grid)
+        self.players = {}  # {player_id: MultiplayerPlayer}
+        self.blocks = {}  # {(grid_x, grid_y): BuilderBlock}
+        self.game_time = 0.0
+        self.corrections = 0
+
+        room.set_dungeon(dungeon)
+        room.game_state['time'] = self.game_time
+        for block_data in room.game_state['blocks']:
+            self._add_block(BuilderBlock.from_dict(block_data, tile_size))
+        room.add_message_handler(self.on_message)
+        room.add_tick_handler(self.step)
+
+    def _add_block(self, block):
+        self.blocks[(block.grid_x, block.grid_y)] = block
+        self.solidity.set_block(block.grid_x, block.grid_y, block.solid)
+
+    def on_message(self, player_id, msg):
+        """Mirror block changes into the solidity map"""
+        msg_type = msg.get('type')
+        if msg_type == MessageType.BLOCK_PLACE.value:
+            self._add_block(BuilderBlock.from_dict(msg['data'], self.tile_size))
+        elif msg_type == MessageType.BLOCK_REMOVE.value:
+            grid_x, grid_y = msg['data']
+            if self.blocks.pop((grid_x, grid_y), None) is not None:
+                self.solidity.set_block(grid_x, grid_y, False)
+
+    def step(self, dt):
+        """One tick: advance the timer and validate the moves reported since the last one"""
+        self.game_time += dt
+        self.room.game_state['time'] = self.game_time
+
+        states = self.room.game_state['players']
+        for player_id in [pid for pid in self.players if pid not in states]:
+            del self.players[player_id]
+
+        # correct_player() re-queues the corrected state, iterate over a copy
+        for player_id, state in list(self.room.pending_updates.items()):
+            player = self.players.get(player_id)
+            if player is None:
+                # A player's first position is its spawn point, taken as given
+                self.players[player_id] = MultiplayerPlayer.from_dict(state)
+                continue
+            player.health = state['health']
+            player.shield_active = state.get('shield_active', False)
+            rect = player.rect
+            x, y, _, _ = sweep_tiles(
+                rect.x, rect.y, rect.width, rect.height,
+                state['x'] - rect.x, state['y'] - rect.y, self.tile_size, self.solidity.is_solid
+            )
+            rect.x = round(x)
+            rect.y = round(y)
+            if (rect.x, rect.y) != (state['x'], state['y']):
+                self.corrections += 1
+                self.room.correct_player(player_id, rect.x, rect.y)
+
+
+def simulate_room(room, width=80, height=60, num_rooms=8, seed=None):
+    """
+    Generate a dungeon for a room and simulate it. Rooms of a SessionHost
+    each get their own map, derived from the seed and the room ID.
+    """
+    if seed is not None and room.room_id is not None:
+        seed = (seed + zlib.crc32(str(room.room_id).encode('utf-8'))) & 0x7FFFFFFF
+    dungeon = DungeonGenerator(width, height, num_rooms, seed=seed)
+    dungeon.generate()
+    return DungeonSimulation(room, dungeon)
+
+
+def serve(server):
+    """Run a NetworkServer on this thread until interrupted"""
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    loop.run_until_complete(server.start_async())
+    try:
+        loop.run_forever()
+    except KeyboardInterrupt:
+        pass
+    loop.run_until_complete(server.stop_async())
+
+
+if __name__ == "__main__":
+    import argparse
+    parser = argparse.ArgumentParser(description="Pocket Dungeon headless dedicated server")
+    parser.add_argument('--host', default='0.0.0.0')
+    parser.add_argument('--port', type=int, default=5555)
+    parser.add_argument('--transport', choices=('tcp', 'udp'), default='tcp')
+    parser.add_argument('--max-players', type=int, default=4)
+    parser.add_argument('--tick-rate', type=int, default=30)
+    parser.add_argument('--width', type=int, default=80)
+    parser.add_argument('--height', type=int, default=60)
+    parser.add_argument('--rooms', type=int, default=8, help="dungeon rooms per map")
+    parser.add_argument('--seed', type=int, default=None)
+    parser.add_argument('--sessions', action='store_true',
+                        help="host many rooms (TCP only), see dungeon_sessions")
+    parser.add_argument('--workers', type=int, default=os.cpu_count())
+    parser.add_argument('--idle-timeout', type=float, default=120)
+    args = parser.parse_args()
+
+    setup = functools.partial(simulate_room, width=args.width, height=args.height,
+                              num_rooms=args.rooms, seed=args.seed)
+    if args.sessions:
+        from dungeon_sessions import SessionHost
+        SessionHost(args.host, args.port, args.workers, args.max_players, args.tick_rate,
+                    args.idle_timeout, setup_room=setup).serve_forever()
+    else:
+        server = NetworkServer(args.host, args.port, args.max_players, args.tick_rate,
+                               transport=args.transport)
+        setup(server)
+        serve(server)
@@ -0,0 +1,365 @@
+import asyncio
+import heapq
+import random
+import struct
+import threading
+import time
+from dungeon_protocol import MESSAGE_CODES
+
+
+# Keep datagrams under the usual path MTU to avoid IP fragmentation
+MAX_DATAGRAM = 1200
+
+# Packet kinds (first byte of every datagram)
+PACKET_UNRELIABLE = 0  # Sequenced: stale packets are dropped, lost ones are not resent
+PACKET_RELIABLE = 1    # Ordered: a segment of the reliable byte stream, resent until acked
+PACKET_ACK = 2
+PACKET_PING = 3
+PACKET_CLOSE = 4
+
+# Binary frames that go on the unreliable channel: a newer one always supersedes them
+UNRELIABLE_CODES = (MESSAGE_CODES['player_update'], MESSAGE_CODES['snapshot'])
+
+_HEADER = struct.Struct('>BH')
+_ACK = struct.Struct('>BHI')
+_FRAME_LEN = struct.Struct('>H')
+
+
+def seq_newer(a, b):
+    """True if 16-bit sequence a comes after b, allowing for wraparound"""
+    return a != b and ((a - b) & 0xFFFF) < 0x8000
+
+
+class UdpEndpoint:
+    """
+    One end of a UDP connection with two channels, independent of any socket.
+    send_frames() routes movement frames to the unreliable-sequenced channel
+    and everything else to the reliable-ordered channel, which carries the
+    same 4-byte length-prefixed stream as TCP cut into datagram-sized
+    segments. datagram_received() returns frames as they become available and
+    service() must be called every few tens of milliseconds to send acks,
+    retransmit and keep the connection alive.
+    """
+
+    def __init__(self, send_datagram, timeout=10.0, ping_interval=1.0):
+        self.send_datagram = send_datagram
+        self.timeout = timeout
+        self.ping_interval = ping_interval
+        now = time.monotonic()
+        self.last_received = now
+        self.last_sent = now
+        self.closed = False
+
+        # Unreliable-sequenced channel
+        self.unreliable_seq = 0
+        self.unreliable_latest = None
+
+        # Reliable-ordered channel, sending side
+        self.reliable_seq = 0
+        self.unacked = {}  # {seq: [packet, last_sent, first_sent, resent]}
+        self.srtt = None
+
+        # Reliable-ordered channel, receiving side
+        self.next_expected = 0
+        self.out_of_order = {}  # {seq: payload}
+        self.stream_buffer = bytearray()
+        self.ack_pending = False
+
+    def send_frames(self, frames, ordered=0):
+        """
+        Send frame bytes, each on the channel its message type calls for.
+        The first `ordered` frames all go on the reliable channel, for
+        movement that must arrive before the reliable messages after it.
+        """
+        unreliable = []
+        reliable = bytearray()
+        for i, frame in enumerate(frames):
+            if (i >= ordered and frame and frame[0] in UNRELIABLE_CODES
+                    and len(frame) + 5 <= MAX_DATAGRAM):
+                unreliable.append(frame)
+            else:
+                reliable += len(frame).to_bytes(4, 'big')
+                reliable += frame
+        if unreliable:
+            self._send_unreliable(unreliable)
+        if reliable:
+            self._send_reliable(reliable)
+
+    def _send_unreliable(self, frames):
+        packet = None
+        for frame in frames:
+            if packet is None or len(packet) + 2 + len(frame) > MAX_DATAGRAM:
+                if packet:
+                    self._emit(packet)
+                packet = bytearray(_HEADER.pack(PACKET_UNRELIABLE, self.unreliable_seq))
+                self.unreliable_seq = (self.unreliable_seq + 1) & 0xFFFF
+            packet += _FRAME_LEN.pack(len(frame))
+            packet += frame
+        self._emit(packet)
+
+    def _send_reliable(self, data):
+        now = time.monotonic()
+        step = MAX_DATAGRAM - _HEADER.size
+        for i in range(0, len(data), step):
+            packet = _HEADER.pack(PACKET_RELIABLE, self.reliable_seq) + bytes(data[i:i + step])
+            self.unacked[self.reliable_seq] = [packet, now, now, False]
+            self.reliable_seq = (self.reliable_seq + 1) & 0xFFFF
+            self._emit(packet)
+
+    def _emit(self, packet):
+        self.last_sent = time.monotonic()
+        self.send_datagram(bytes(packet))
+
+    def datagram_received(self, datagram):
+        """Process one datagram, returns the complete frames it made available"""
+        if not datagram:
+            return []
+        self.last_received = time.monotonic()
+        kind = datagram[0]
+
+        if kind == PACKET_UNRELIABLE:
+            seq = _HEADER.unpack_from(datagram)[1]
+            if self.unreliable_latest is not None and not seq_newer(seq, self.unreliable_latest):
+                # Older than something already delivered
+                return []
+            self.unreliable_latest = seq
+            frames = []
+            pos = _HEADER.size
+            while pos + 2 <= len(datagram):
+                length = _FRAME_LEN.unpack_from(datagram, pos)[0]
+                frames.append(bytes(datagram[pos + 2:pos + 2 + length]))
+                pos += 2 + length
+            return frames
+
+        if kind == PACKET_RELIABLE:
+            seq = _HEADER.unpack_from(datagram)[1]
+            payload = datagram[_HEADER.size:]
+            self.ack_pending = True
+            if seq == self.next_expected:
+                self.stream_buffer += payload
+                self.next_expected = (self.next_expected + 1) & 0xFFFF
+                while self.next_expected in self.out_of_order:
+                    self.stream_buffer += self.out_of_order.pop(self.next_expected)
+                    self.next_expected = (self.next_expected + 1) & 0xFFFF
+                return self._take_stream_frames()
+            if seq_newer(seq, self.next_expected):
+                self.out_of_order[seq] = payload
+            return []
+
+        if kind == PACKET_ACK:
+            _, ack, bits = _ACK.unpack_from(datagram)
+            self._on_ack(ack, bits)
+        elif kind == PACKET_CLOSE:
+            self.closed = True
+        return []
+
+    def _take_stream_frames(self):
+        """Cut complete frames off the front of the reliable stream"""
+        buf = self.stream_buffer
+        frames = []
+        pos = 0
+        while len(buf) - pos >= 4:
+            length = int.from_bytes(buf[pos:pos + 4], 'big')
+            if len(buf) - pos - 4 < length:
+                break
+            frames.append(bytes(buf[pos + 4:pos + 4 + length]))
+            pos += 4 + length
+        del buf[:pos]
+        return frames
+
+    def _on_ack(self, ack, bits):
+        """ack is the peer's next expected seq; bit i acks ack + 1 + i"""
+        now = time.monotonic()
+        for seq in list(self.unacked):
+            offset = (seq - ack - 1) & 0xFFFF
+            if seq_newer(ack, seq) or (offset < 32 and bits & (1 << offset)):
+                packet, _, first_sent, resent = self.unacked.pop(seq)
+                if not resent:
+                    rtt = now - first_sent
+                    self.srtt = rtt if self.srtt is None else 0.875 * self.srtt + 0.125 * rtt
+
+    def _ack_packet(self):
+        bits = 0
+        for i in range(32):
+            if (self.next_expected + 1 + i) & 0xFFFF in self.out_of_order:
+                bits |= 1 << i
+        return _ACK.pack(PACKET_ACK, self.next_expected, bits)
+
+    def service(self):
+        """Send acks, retransmit and keep alive. False once the connection is gone"""
+        if self.closed:
+            return False
+        now = time.monotonic()
+        if now - self.last_received > self.timeout:
+            self.closed = True
+            return False
+
+        if self.ack_pending:
+            self.ack_pending = False
+            self._emit(self._ack_packet())
+
+        rto = 0.2 if self.srtt is None else max(0.05, 2 * self.srtt)
+        for entry in self.unacked.values():
+            if now - entry[1] > rto:
+                entry[1] = now
+                entry[3] = True
+                self._emit(entry[0])
+
+        if now - self.last_sent > self.ping_interval:
+            self._emit(bytes((PACKET_PING,)))
+        return True
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            # Not acked, so send a few in case some are lost
+            for _ in range(3):
+                self._emit(bytes((PACKET_CLOSE,)))
+
+    def unacked_bytes(self):
+        return sum(len(entry[0]) for entry in self.unacked.values())
+
+
+class LossyLink:
+    """
+    Wraps a datagram send function with simulated packet loss, latency and
+    jitter (which also reorders packets), for testing on loopback.
+    Delayed packets are sent from a background thread.
+    """
+
+    def __init__(self, send, drop=0.0, latency=0.0, jitter=0.0, seed=None):
+        self.send = send
+        self.drop = drop
+        self.latency = latency
+        self.jitter = jitter
+        self.rng = random.Random(seed)
+        self.dropped = 0
+        self.delivered = 0
+        self._queue = []  # heap of (deliver_at, counter, args)
+        self._counter = 0
+        self._ready = threading.Condition()
+        thread = threading.Thread(target=self._run)
+        thread.daemon = True
+        thread.start()
+
+    def __call__(self, *args):
+        if self.rng.random() < self.drop:
+            self.dropped += 1
+            return
+        delay = max(0.0, self.latency + self.rng.uniform(-self.jitter, self.jitter))
+        with self._ready:
+            self._counter += 1
+            heapq.heappush(self._queue, (time.monotonic() + delay, self._counter, args))
+            self._ready.notify()
+
+    def _run(self):
+        while True:
+            with self._ready:
+                while not self._queue:
+                    self._ready.wait()
+                deliver_at, _, args = self._queue[0]
+                wait = deliver_at - time.monotonic()
+                if wait > 0:
+                    self._ready.wait(wait)
+                    continue
+                heapq.heappop(self._queue)
+            self.delivered += 1
+            try:
+                self.send(*args)
+            except OSError:
+                pass
+
+
+class UdpPeer:
+    """
+    Server-side UDP connection. Received frames are fed to a StreamReader in
+    the usual length-prefixed form and write() accepts the same framed bytes
+    as an asyncio StreamWriter, so DungeonRoom serves it like a TCP client.
+    """
+
+    def __init__(self, protocol, addr):
+        self.protocol = protocol
+        self.addr = addr
+        self.reader = asyncio.StreamReader()
+        self.endpoint = UdpEndpoint(lambda data: protocol.send(data, addr))
+
+    @property
+    def transport(self):
+        return self
+
+    def get_write_buffer_size(self):
+        return self.endpoint.unacked_bytes()
+
+    def get_extra_info(self, name, default=None):
+        return self.addr if name == 'peername' else default
+
+    def datagram_received(self, datagram):
+        for frame in self.endpoint.datagram_received(datagram):
+            self.reader.feed_data(len(frame).to_bytes(4, 'big') + frame)
+        if self.endpoint.closed:
+            self.close()
+
+    def write(self, data):
+        """Split length-prefixed frame bytes and send them on their channels"""
+        frames = []
+        pos = 0
+        while pos < len(data):
+            length = int.from_bytes(data[pos:pos + 4], 'big')
+            frames.append(bytes(data[pos + 4:pos + 4 + length]))
+            pos += 4 + length
+        self.endpoint.send_frames(frames)
+
+    def close(self):
+        if self.protocol.peers.get(self.addr) is self:
+            del self.protocol.peers[self.addr]
+            self.endpoint.close()
+            self.reader.feed_eof()
+
+
+class UdpServerProtocol(asyncio.DatagramProtocol):
+    """Datagram endpoint that demultiplexes clients into UdpPeers by address"""
+
+    def __init__(self, on_connect, lossy=None):
+        self.on_connect = on_connect  # Called as on_connect(addr, reader, writer)
+        self.lossy = lossy
+        self.peers = {}  # {addr: UdpPeer}
+        self.transport = None
+        self.send = None
+        self._service_task = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+        self.send = transport.sendto
+        if self.lossy:
+            loop = asyncio.get_event_loop()
+            self.send = LossyLink(
+                lambda data, addr: loop.call_soon_threadsafe(transport.sendto, data, addr),
+                **self.lossy
+            )
+        self._service_task = asyncio.ensure_future(self._service_loop())
+
+    def datagram_received(self, data, addr):
+        peer = self.peers.get(addr)
+        if peer is None:
+            # Only the reliable channel (carrying PLAYER_JOIN) opens a connection
+            if not data or data[0] != PACKET_RELIABLE:
+                return
+            peer = UdpPeer(self, addr)
+            self.peers[addr] = peer
+            self.on_connect(addr, peer.reader, peer)
+        peer.datagram_received(data)
+
+    async def _service_loop(self):
+        while True:
+            await asyncio.sleep(0.02)
+            for peer in list(self.peers.values()):
+                if not peer.endpoint.service():
+                    peer.close()
+
+    def close(self):
+        if self._service_task:
+            self._service_task.cancel()
+        for peer in list(self.peers.values()):
+            peer.close()
+        if self.transport:
+            self.transport.close()
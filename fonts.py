@@ -0,0 +1,78 @@
+from collections import OrderedDict
+import pygame
+
+
+_fonts = {}  # {(name, size): pygame.font.Font}
+
+
+def get_font(size, name=None):
+    """Shared font for a SysFont name and size, looked up only the first time"""
+    key = (name, size)
+    font = _fonts.get(key)
+    if font is None:
+        if not pygame.font.get_init():
+            pygame.font.init()
+        font = _fonts[key] = pygame.font.SysFont(name, size)
+    return font
+
+
+class TextCache:
+    """
+    LRU cache of rendered text surfaces keyed on (font, text, color,
+    antialias). Callers must not draw onto the surfaces they get back,
+    they are shared.
+    """
+
+    def __init__(self, maxsize=256):
+        self.maxsize = maxsize
+        self.surfaces = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def render(self, text, size, color, name=None, antialias=True):
+        key = (name, size, text, tuple(color), antialias)
+        surface = self.surfaces.get(key)
+        if surface is not None:
+            self.surfaces.move_to_end(key)
+            self.hits += 1
+            return surface
+        self.misses += 1
+        surface = get_font(size, name).render(text, antialias, color)
+        self.surfaces[key] = surface
+        if len(self.surfaces) > self.maxsize:
+            self.surfaces.popitem(last=False)
+        return surface
+
+    def clear(self):
+        self.surfaces.clear()
+
+
+text_cache = TextCache()
+
+
+def render_text(text, size, color, name=None, antialias=True):
+    """Render through the shared TextCache, for static or rarely changing text"""
+    return text_cache.render(text, size, color, name, antialias)
+
+
+class TextLabel:
+    """
+    HUD text that re-renders only when its value changes. Values that
+    change often (timers, counters) are rendered directly instead of going
+    through the TextCache, where they would push out the static strings.
+    """
+
+    def __init__(self, size, color, fmt="{}", name=None):
+        self.font = get_font(size, name)
+        self.color = color
+        self.fmt = fmt
+        self.value = None
+        self.surface = None
+
+    def set(self, value):
+        """Surface for a value, rendered again only if it differs from the last one"""
+        if self.surface is None or value != self.value:
+            self.value = value
+            text = self.fmt.format(*value) if isinstance(value, tuple) else self.fmt.format(value)
+            self.surface = self.font.render(text, True, self.color)
+        return self.surface
@@ -0,0 +1,70 @@
+from collections import deque
+
+
+class FixedTimestep:
+    """
+    Accumulates real frame time and hands it out as fixed simulation steps,
+    so the simulation runs at the same speed whatever the frame rate.
+    alpha is how far real time is between the last two steps, for
+    interpolating what is drawn.
+    """
+
+    def __init__(self, rate=60, max_steps=15):
+        self.step = 1.0 / rate
+        # Most steps run for one frame. The default covers Game.max_dt at
+        # 60 Hz, so capped frames are caught up in full
+        self.max_steps = max_steps
+        self.accumulator = 0.0
+
+    def advance(self, dt):
+        """Add a frame's real time, returns how many steps to simulate"""
+        self.accumulator += dt
+        steps = int(self.accumulator / self.step)
+        if steps > self.max_steps:
+            # Longer hitch than we catch up in one frame: run what we may
+            # and carry the rest, never more than another frame's worth
+            steps = self.max_steps
+        self.accumulator -= steps * self.step
+        self.accumulator = min(self.accumulator, self.max_steps * self.step)
+        return steps
+
+    @property
+    def alpha(self):
+        return min(1.0, self.accumulator / self.step)
+
+
+class AdaptiveFrameRate:
+    """
+    Chooses the target FPS from how long recent frames took to produce,
+    excluding the time spent sleeping to hold the rate. When frames use
+    most of their budget (CPU or thermal throttling) it steps down a level
+    so frames are even instead of jittery, and it steps back up once there
+    has been plenty of headroom for a while. Simulation speed is unaffected,
+    that is FixedTimestep's job.
+    """
+
+    def __init__(self, levels=(60, 45, 30), window=90, high=0.85, low=0.5):
+        self.levels = levels
+        self.level = 0
+        self.window = window  # Frames between decisions
+        self.high = high  # Step down when the 90th percentile busy time is above this share of the budget
+        self.low = low  # Step up when it would be below this share of the faster level's budget
+        self.busy = deque(maxlen=window)
+
+    @property
+    def fps(self):
+        return self.levels[self.level]
+
+    def record(self, busy):
+        """Add one frame's busy time in seconds, returns the target FPS"""
+        self.busy.append(busy)
+        if len(self.busy) < self.window:
+            return self.fps
+        p90 = sorted(self.busy)[int(len(self.busy) * 0.9)]
+        if p90 > self.high / self.fps and self.level < len(self.levels) - 1:
+            self.level += 1
+            self.busy.clear()
+        elif self.level > 0 and p90 < self.low / self.levels[self.level - 1]:
+            self.level -= 1
+            self.busy.clear()
+        return self.fps
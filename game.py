@@ -1,30 +1,100 @@
+import time
 import pygame
+from frame_pacing import AdaptiveFrameRate
+from profiler import FrameProfiler
 from scene_manager import DungeonSceneManager
 
 
 class Game:
-    def __init__(self):
-        pygame.init()
+    def __init__(self, profile=False, adaptive=False):
+        # Only the display (which brings events), pygame.init() would also
+        # open audio and joysticks we never use. fonts.get_font starts the
+        # font module on first use
+        pygame.display.init()
         # Fullscreen auto sized (change to RESIZABLE if you want)
         self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
         pygame.display.set_caption("Pygame OOP Mobile Game")
         self.clock = pygame.time.Clock()
         self.running = True
+        self.fps = 60
+        # Longest frame time handed to the scenes, e.g. after the app was suspended
+        self.max_dt = 0.25
+        # Adaptive mode lowers the target FPS when frames get expensive
+        self.pacer = AdaptiveFrameRate() if adaptive else None
+        # Scenes that are idle (menus) sleep until input, waking at least this often
+        self.idle_wait_ms = 500
+        # F3 toggles the frame profiler overlay, F4 records a trace
+        self.profiler = FrameProfiler()
+        if profile:
+            self.profiler.toggle()
         # Scene manager holds current scene
-        self.scenes = DungeonSceneManager(self.screen)
+        self.scenes = DungeonSceneManager(self.screen, self.profiler)
 
     def run(self):
+        profiler = self.profiler
+        dt = 1 / self.fps
         while self.running:
-            for event in pygame.event.get():
-                if event.type == pygame.QUIT:
-                    self.running = False
-                # Forward event to scene manager
-                self.scenes.handle_event(event)
+            profiler.begin_frame()
+            with profiler.section('events'):
+                if self.scenes.is_idle():
+                    # Nothing animates: sleep until input arrives
+                    with profiler.section('wait'):
+                        event = pygame.event.wait(self.idle_wait_ms)
+                    events = [] if event.type == pygame.NOEVENT else [event]
+                    events += pygame.event.get()
+                else:
+                    events = pygame.event.get()
+                for event in events:
+                    if event.type == pygame.QUIT:
+                        self.running = False
+                    if event.type == pygame.KEYDOWN and event.key in (pygame.K_F3, pygame.K_F4):
+                        self._profiler_key(event.key)
+                        continue
+                    # Forward event to scene manager
+                    self.scenes.handle_event(event)
             # Update current scene
-            self.scenes.update()
+            with profiler.section('update'):
+                self.scenes.update(dt)
             # Draw
-            self.scenes.draw()
-            pygame.display.flip()
-            self.clock.tick(60)
+            with profiler.section('draw'):
+                dirty = self.scenes.draw()
+            if profiler.show_overlay:
+                profiler.draw(self.screen)
+                dirty = None
+            with profiler.section('flip'):
+                if dirty is None:
+                    pygame.display.flip()
+                elif dirty:
+                    # Only the regions the scene reported as changed
+                    pygame.display.update(dirty)
+            with profiler.section('idle'):
+                dt = min(self.clock.tick(self.fps) / 1000, self.max_dt)
+            # Menus spend their frames waiting for input, that isn't load
+            if self.pacer and not self.scenes.is_idle():
+                self.fps = self.pacer.record(self.clock.get_rawtime() / 1000)
 
-        pygame.quit()
\ No newline at end of file
+        if self.profiler.recording:
+            self._save_trace()
+        pygame.quit()
+
+    def _profiler_key(self, key):
+        profiler = self.profiler
+        # Incrementally drawn scenes need a full redraw to show or clear the overlay
+        self.scenes.invalidate()
+        if key == pygame.K_F3:
+            if profiler.recording:
+                self._save_trace()
+            profiler.toggle()
+        elif profiler.recording:
+            self._save_trace()
+        else:
+            if not profiler.enabled:
+                profiler.toggle()
+            profiler.start_recording()
+
+    def _save_trace(self):
+        """Stop recording and write the trace as CSV and Chrome trace JSON"""
+        name = time.strftime("profile_%Y%m%d_%H%M%S")
+        self.profiler.stop_recording(name + ".csv")
+        self.profiler.export(name + ".json")
+        print(f"Saved frame trace to {name}.csv and {name}.json")
@@ -1,4 +1,5 @@
 import pygame
+from fonts import get_font
 
 
 class Button:
@@ -10,7 +11,9 @@ class Button:
         self.height = height
         self.rect = pygame.Rect(0, 0, width, height)
         self.rect.center = pos
-        self.font = pygame.font.SysFont(None, 28)
+        self.font = get_font(28)
+        self._label = None  # (text, rendered surface)
+        self._drawn = None  # Look of the last draw(), see is_dirty()
         self.clicked = False
         self.hovered = False
         
@@ -34,9 +37,18 @@ class Button:
             pass
         # for UI we often reset on up, but we keep click
 
+    def _look(self):
+        return (self.text, self.hovered, self.clicked, self.normal_bg, self.rect.topleft)
+
+    def is_dirty(self):
+        """Whether the button would look different from when it was last drawn"""
+        self.update_hover()
+        return self._look() != self._drawn
+
     def draw(self, screen):
         # Update hover state
         self.update_hover()
+        self._drawn = self._look()
         
         # Choose colors based on state
         if self.clicked and self.hovered:
@@ -57,6 +69,23 @@ class Button:
         pygame.draw.rect(screen, border_color, self.rect, border_width)
         
         # Draw button text
-        text_surf = self.font.render(self.text, True, (255, 255, 255))
+        # Label is rendered again only when the text changes
+        if self._label is None or self._label[0] != self.text:
+            self._label = (self.text, self.font.render(self.text, True, (255, 255, 255)))
+        text_surf = self._label[1]
         text_rect = text_surf.get_rect(center=self.rect.center)
-        screen.blit(text_surf, text_rect)
\ No newline at end of file
+        screen.blit(text_surf, text_rect)
+
+
+def redraw_buttons(screen, background, buttons):
+    """
+    Redraw the buttons whose look changed over a cached background surface
+    the size of the screen. Returns the screen rects that changed.
+    """
+    dirty = []
+    for btn in buttons:
+        if btn.is_dirty():
+            screen.blit(background, btn.rect, btn.rect)
+            btn.draw(screen)
+            dirty.append(btn.rect.copy())
+    return dirty
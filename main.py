@@ -1,4 +1,5 @@
+import sys
 from game import Game
 
 if __name__ == "__main__":
-    Game().run()
+    Game(profile='--profile' in sys.argv, adaptive='--adaptive' in sys.argv).run()
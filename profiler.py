@@ -0,0 +1,192 @@
+import time
+from collections import deque
+
+
+class _NullSection:
+    """Shared do-nothing context returned while the profiler is off"""
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+_NULL_SECTION = _NullSection()
+
+
+class _Section:
+    def __init__(self, profiler, name):
+        self.profiler = profiler
+        self.name = name
+
+    def __enter__(self):
+        profiler = self.profiler
+        stack = profiler._stack
+        self.path = f"{stack[-1]}/{self.name}" if stack else self.name
+        stack.append(self.path)
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        end = time.perf_counter()
+        profiler = self.profiler
+        # The stack is shared, only pop our own entry
+        stack = profiler._stack
+        if stack and stack[-1] == self.path:
+            stack.pop()
+        frame = profiler._frame
+        frame[self.path] = frame.get(self.path, 0.0) + (end - self.start) * 1000
+        if profiler.recording:
+            profiler._events.append((self.path, self.start, end))
+        return False
+
+
+class FrameProfiler:
+    """
+    Per-frame timing of named sections, e.g.
+
+        with profiler.section('update'):
+            with profiler.section('collision'):  # recorded as update/collision
+                ...
+
+    Keeps the last `window` frames of every section for rolling
+    percentiles, draws them as an overlay and can record a trace for
+    export(). While disabled section() returns a shared no-op context, so
+    instrumented code costs one method call per section.
+    """
+
+    def __init__(self, window=300):
+        self.enabled = False
+        self.show_overlay = False
+        self.recording = False
+        self.window = window
+        self.history = {}  # {section path: deque of ms per frame}
+        self.trace = []  # [{section path: ms}] per recorded frame
+        self._events = []  # (path, start, end) while recording, for the JSON trace
+        self._frame = {}
+        self._stack = []
+        self._frame_start = None
+        self._frame_count = 0
+        self._font = None
+        self._overlay = None
+        self._overlay_time = 0.0
+
+    def section(self, name):
+        if not self.enabled:
+            return _NULL_SECTION
+        return _Section(self, name)
+
+    def toggle(self):
+        """
+        Switch profiling and its overlay on or off together. Safe inside a
+        section: sections already entered still close themselves, and the
+        partial frame is dropped by the next begin_frame()
+        """
+        self.enabled = self.show_overlay = not self.enabled
+        if not self.enabled:
+            self._frame_start = None
+
+    def begin_frame(self):
+        """Start a frame, closing the previous one"""
+        if not self.enabled:
+            return
+        now = time.perf_counter()
+        if self._frame_start is not None:
+            self._frame['frame'] = (now - self._frame_start) * 1000
+            self._finish_frame()
+        self._stack.clear()
+        self._frame_start = now
+        self._frame = {}
+
+    def _finish_frame(self):
+        frame = self._frame
+        for path, ms in frame.items():
+            samples = self.history.get(path)
+            if samples is None:
+                samples = self.history[path] = deque(maxlen=self.window)
+            samples.append(ms)
+        if self.recording:
+            self.trace.append(frame)
+        self._frame_count += 1
+
+    def percentiles(self, path, points=(50, 95, 99)):
+        """Rolling percentiles of a section in ms, frames without it count as 0"""
+        samples = sorted(self.history.get(path, ()))
+        frames = len(self.history.get('frame', ())) or len(samples)
+        if not samples:
+            return [0.0 for _ in points]
+        samples = [0.0] * (frames - len(samples)) + samples
+        last = len(samples) - 1
+        return [samples[min(last, int(last * p / 100 + 0.5))] for p in points]
+
+    def start_recording(self):
+        self.trace = []
+        self._events = []
+        self.recording = True
+
+    def stop_recording(self, path=None):
+        """Stop recording, and export the trace if a path is given"""
+        self.recording = False
+        if path:
+            self.export(path)
+
+    def export(self, path):
+        """
+        Write the recorded trace. A .json path gets Chrome trace events
+        (chrome://tracing, Perfetto), anything else a CSV of ms per section
+        per frame.
+        """
+        # Only needed here, keep them off the startup path
+        import csv
+        import json
+        if path.endswith('.json'):
+            origin = self._events[0][1] if self._events else 0.0
+            events = [
+                {'name': name.rsplit('/', 1)[-1], 'cat': name, 'ph': 'X', 'pid': 0, 'tid': 0,
+                 'ts': (start - origin) * 1e6, 'dur': (end - start) * 1e6}
+                for name, start, end in self._events
+            ]
+            with open(path, 'w') as f:
+                json.dump({'traceEvents': events, 'displayTimeUnit': 'ms'}, f)
+            return
+        columns = sorted({name for frame in self.trace for name in frame})
+        with open(path, 'w', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow(['frame'] + [f"{name} ms" for name in columns])
+            for i, frame in enumerate(self.trace):
+                writer.writerow([i] + [f"{frame.get(name, 0.0):.3f}" for name in columns])
+
+    def draw(self, screen, refresh=0.25):
+        """Draw the percentile table in the top right corner, re-rendered every `refresh` seconds"""
+        if not self.show_overlay:
+            return
+        import pygame
+        now = time.perf_counter()
+        if self._overlay is None or now - self._overlay_time > refresh:
+            self._overlay_time = now
+            self._overlay = self._render_overlay(pygame)
+        screen.blit(self._overlay, (screen.get_width() - self._overlay.get_width() - 10, 10))
+
+    def _render_overlay(self, pygame):
+        if self._font is None:
+            from fonts import get_font
+            self._font = get_font(14, 'monospace')
+        title = "REC " if self.recording else ""
+        lines = [f"{title}{'section':<22}{'p50':>7}{'p95':>7}{'p99':>7}"]
+        for path in sorted(self.history, key=lambda p: (p != 'frame', p)):
+            indent = "  " * path.count('/')
+            name = indent + path.rsplit('/', 1)[-1]
+            p50, p95, p99 = self.percentiles(path)
+            lines.append(f"{name:<{22 + len(title)}}{p50:7.2f}{p95:7.2f}{p99:7.2f}")
+        rendered = [self._font.render(line, True, (220, 220, 220)) for line in lines]
+        height = sum(surface.get_height() for surface in rendered) + 10
+        width = max(surface.get_width() for surface in rendered) + 10
+        # Opaque: scenes that redraw only what changed blit it over itself
+        overlay = pygame.Surface((width, height))
+        overlay.fill((0, 0, 0))
+        y = 5
+        for surface in rendered:
+            overlay.blit(surface, (5, y))
+            y += surface.get_height()
+        return overlay
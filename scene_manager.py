@@ -1,6 +1,29 @@
 import pygame
-from scenes.menu_scene import MenuScene
-from scenes.pause_scene import PauseScene
+from profiler import FrameProfiler
+from fonts import render_text
+
+
+# Events after which the whole window has to be redrawn
+REDRAW_EVENTS = tuple(
+    getattr(pygame, name) for name in
+    ('VIDEORESIZE', 'WINDOWSIZECHANGED', 'WINDOWEXPOSED', 'APP_DIDENTERFOREGROUND')
+    if hasattr(pygame, name)
+)
+
+
+def _menu_scene(manager):
+    from scenes.menu_scene import MenuScene
+    return MenuScene(manager, manager.screen)
+
+
+def _role_select_scene(manager):
+    from scenes.dungeon_role_select import RoleSelectionScene
+    return RoleSelectionScene(manager, manager.screen)
+
+
+def _pause_scene(manager):
+    from scenes.pause_scene import PauseScene
+    return PauseScene(manager, manager.screen)
 
 
 class DungeonSceneManager:
@@ -9,58 +32,93 @@ class DungeonSceneManager:
     Manages transitions between menu, role selection, and game scenes
     """
     
-    def __init__(self, screen):
+    def __init__(self, screen, profiler=None):
         self.screen = screen
+        self.profiler = profiler or FrameProfiler()
         
-        # Import scenes
-        from scenes.dungeon_role_select import RoleSelectionScene
-        from scenes.dungeon_multiplayer_scene import MultiplayerGameScene
-        
-        # Initialize scenes
-        self.menu = MenuScene(self, screen)
-        self.role_select = RoleSelectionScene(self, screen)
-        self.pause = PauseScene(self, screen)
-        
-        # Game scene will be created when player selects role
-        self.game = None
+        # Scenes are built by their factory the first time they are shown.
+        # The game scene has no factory, it is set once load_scene() has
+        # prepared it
+        self.factories = {}  # {name: factory(manager) -> scene}
+        self.scenes = {}  # {name: scene}
+        self.register("menu", _menu_scene)
+        self.register("role_select", _role_select_scene)
+        self.register("pause", _pause_scene)
         
         # Start at menu
-        self.active = self.menu
+        self.active = self.get_scene("menu")
         self.previous_scene = None
     
+    def register(self, name, factory):
+        """Add a scene that is built by factory(manager) when first needed"""
+        self.factories[name] = factory
+        self.scenes.pop(name, None)
+    
+    def get_scene(self, name):
+        """The scene registered as name, building it if needed, or None"""
+        scene = self.scenes.get(name)
+        if scene is None and name in self.factories:
+            scene = self.scenes[name] = self.factories[name](self)
+        return scene
+    
+    def set_scene(self, name, scene):
+        """Replace a scene, e.g. with one prepared by load_scene()"""
+        self.scenes[name] = scene
+    
+    def load_scene(self, name, prepare, build, title="Loading"):
+        """
+        Show a LoadingScene while prepare(report) runs on a worker thread,
+        then change to build(result) as name
+        """
+        from scenes.loading_scene import LoadingScene
+        self.previous_scene = self.active
+        self.active = LoadingScene(self, self.screen, name, prepare, build, title)
+    
     def change_scene(self, name):
         """Change to a different scene"""
-        self.previous_scene = self.active
-        
-        if name == "menu":
-            self.active = self.menu
-        elif name == "role_select":
-            self.active = self.role_select
-        elif name == "game":
-            if self.game is None:
-                # If no game scene exists, go to role selection first
-                self.active = self.role_select
-            else:
-                self.active = self.game
-        elif name == "pause":
-            self.active = self.pause
-        else:
+        scene = self.get_scene(name)
+        if scene is None and name == "game":
+            # If no game scene exists, go to role selection first
+            scene = self.get_scene("role_select")
+        if scene is None:
             print(f"Unknown scene: {name}")
+            return
+        self.previous_scene = self.active
+        self.active = scene
+        self.invalidate()
+    
+    def invalidate(self):
+        """Make the active scene redraw everything if it draws incrementally"""
+        invalidate = getattr(self.active, 'invalidate', None)
+        if invalidate:
+            invalidate()
+    
+    def is_idle(self):
+        """True if the active scene only changes in response to input"""
+        return getattr(self.active, 'idle', False)
     
     def handle_event(self, event):
         """Forward events to active scene"""
+        if event.type in REDRAW_EVENTS:
+            # Window contents were lost or resized
+            self.invalidate()
         if self.active:
             self.active.handle_event(event)
     
-    def update(self):
-        """Update active scene"""
+    def update(self, dt):
+        """Update active scene with the real seconds since the last frame"""
         if self.active:
-            self.active.update()
+            self.active.update(dt)
     
     def draw(self):
-        """Draw active scene"""
+        """
+        Draw active scene. Returns the screen rects that changed, an empty
+        list if nothing did, or None if the whole screen must be updated
+        (scenes that don't track changes return None)
+        """
         if self.active:
-            self.active.draw()
+            return self.active.draw()
+        return []
 
 
 # Update the menu scene to include "Play" button that goes to role selection
@@ -77,9 +135,6 @@ class UpdatedMenuScene:
         self.play_btn = Button(screen, "Play Dungeon", (w // 2, h // 2 - 80), 240, 70)
         self.settings_btn = Button(screen, "Settings", (w // 2, h // 2), 240, 70)
         self.quit_btn = Button(screen, "Quit", (w // 2, h // 2 + 80), 240, 70)
-        
-        self.title_font = pygame.font.SysFont(None, 64)
-        self.subtitle_font = pygame.font.SysFont(None, 28)
     
     def handle_event(self, event):
         self.play_btn.handle_event(event)
@@ -105,19 +160,19 @@ class UpdatedMenuScene:
             self.settings_btn.pos = (w // 2, h // 2)
             self.quit_btn.pos = (w // 2, h // 2 + 80)
     
-    def update(self):
+    def update(self, dt=1/60):
         pass
     
     def draw(self):
         self.screen.fill((15, 15, 20))
         
         # Title
-        title = self.title_font.render("POCKET DUNGEON", True, (255, 200, 100))
+        title = render_text("POCKET DUNGEON", 64, (255, 200, 100))
         title_rect = title.get_rect(center=(self.screen.get_width() // 2, 150))
         self.screen.blit(title, title_rect)
         
         # Subtitle
-        subtitle = self.subtitle_font.render("Online Co-op Adventure", True, (200, 200, 200))
+        subtitle = render_text("Online Co-op Adventure", 28, (200, 200, 200))
         subtitle_rect = subtitle.get_rect(center=(self.screen.get_width() // 2, 200))
         self.screen.blit(subtitle, subtitle_rect)
         
@@ -127,7 +182,6 @@ class UpdatedMenuScene:
         self.quit_btn.draw(self.screen)
         
         # Instructions at bottom
-        info_font = pygame.font.SysFont(None, 20)
-        info_text = info_font.render("5-10 min sessions • 4 player co-op • Procedural dungeons", True, (150, 150, 150))
+        info_text = render_text("5-10 min sessions • 4 player co-op • Procedural dungeons", 20, (150, 150, 150))
         info_rect = info_text.get_rect(center=(self.screen.get_width() // 2, self.screen.get_height() - 30))
         self.screen.blit(info_text, info_rect)
\ No newline at end of file
@@ -1,11 +1,10 @@
-import sys
-import os
+import time
 import pygame
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from input.joystick import Joystick
 from input.aim_joystick import AimJoystick
 from input.button import Button
+from fonts import TextLabel, render_text
 
 
 class MultiplayerGameScene:
@@ -18,18 +17,24 @@ class MultiplayerGameScene:
     - Simple enemy AI
     """
     
-    def __init__(self, manager, screen, network_client=None, dungeon_gen=None, player_role=None):
+    def __init__(self, manager, screen, network_client=None, dungeon_gen=None, player_role=None,
+                 tile_cache=None):
         self.manager = manager
         self.screen = screen
         self.network_client = network_client
         
         # Import here to avoid circular imports
-        from dungeon_procgen import DungeonGenerator, TileType
+        from dungeon_procgen import DungeonGenerator, TileType, SolidityMap
         from dungeon_roles import MultiplayerPlayer, PlayerRole, BuilderBlock
         from dungeon_networking import MessageType, create_player_update, create_block_place, create_block_remove
+        from dungeon_render import TileChunkCache, MinimapCache
+        from dungeon_prediction import PredictionBuffer, VELOCITY_SCALE
+        from frame_pacing import FixedTimestep
+        from collision import sweep_tiles
         
         self.DungeonGenerator = DungeonGenerator
         self.TileType = TileType
+        self.SolidityMap = SolidityMap
         self.MultiplayerPlayer = MultiplayerPlayer
         self.PlayerRole = PlayerRole
         self.BuilderBlock = BuilderBlock
@@ -37,9 +42,17 @@ class MultiplayerGameScene:
         self.create_player_update = create_player_update
         self.create_block_place = create_block_place
         self.create_block_remove = create_block_remove
+        self.sweep_tiles = sweep_tiles
+        self.VELOCITY_SCALE = VELOCITY_SCALE
+        self.profiler = manager.profiler
         
         # Generate or load dungeon
-        if dungeon_gen is None:
+        if dungeon_gen is None and network_client:
+            # Joining: the host's dungeon arrives with GAME_STATE
+            self.dungeon = self.DungeonGenerator(width=0, height=0)
+            self.grid = self.dungeon.grid
+            self.rooms = []
+        elif dungeon_gen is None:
             self.dungeon = self.DungeonGenerator(width=80, height=60, num_rooms=8)
             self.grid, self.rooms = self.dungeon.generate()
         else:
@@ -47,20 +60,26 @@ class MultiplayerGameScene:
             self.grid = dungeon_gen.grid
             self.rooms = dungeon_gen.rooms
         
-        # Tile rendering
+        # Tile rendering, the loading scene may have baked it already
         self.tile_size = 32
+        if tile_cache is None:
+            tile_cache = TileChunkCache(self.grid, self.tile_size)
+        self.tile_cache = tile_cache
+        
+        # Walls and builder blocks merged, for collision and block drawing
+        self.solidity = SolidityMap(self.grid)
+        
+        # Minimap, revealed around the local player as it explores
+        self.minimap = MinimapCache(self.grid, self.solidity)
+        self.sight_radius = 8  # Tiles
+        self._explored_tile = None
         
         # Local player
         role = player_role or self.PlayerRole.SCOUT
-        self.local_player = self.MultiplayerPlayer(screen, role, "local_player", is_local=True)
+        w, h = screen.get_size()
+        self.local_player = self.MultiplayerPlayer(role, "local_player", is_local=True, center=(w // 2, h // 2))
         
-        # Spawn player at spawn point
-        if self.dungeon.spawn_point:
-            spawn_x, spawn_y = self.dungeon.spawn_point
-            self.local_player.rect.center = (
-                spawn_x * self.tile_size + self.tile_size // 2,
-                spawn_y * self.tile_size + self.tile_size // 2
-            )
+        self._move_to_spawn()
         
         # Other players (from network)
         self.other_players = {}  # {player_id: MultiplayerPlayer}
@@ -68,6 +87,17 @@ class MultiplayerGameScene:
         # Builder blocks (synced across network)
         self.builder_blocks = {}  # {(grid_x, grid_y): BuilderBlock}
         
+        # Network sync: remote players render this far in the past so there
+        # is always a pair of snapshots to interpolate between
+        self.network_time_budget = 0.004  # Seconds per frame for handling messages
+        self.send_interval = 1 / 20
+        self.send_timer = 0
+        self.interpolation_delay = 0.1
+        self.input_seq = 0
+        self.prediction = PredictionBuffer()
+        self._pending_correction = None
+        self._dungeon_chunk_tiles = None  # Set by GAME_STATE when the host streams its dungeon
+        
         # Camera
         self.camera_x = 0
         self.camera_y = 0
@@ -90,9 +120,24 @@ class MultiplayerGameScene:
         # Add back to menu button
         self.menu_btn = Button(screen, "Menu", (70, 30), 100, 40)
         
+        # HUD text, re-rendered only when the shown value changes
+        self.role_label = TextLabel(28, (255, 255, 100), "Role: {}")
+        self.health_label = TextLabel(28, (255, 255, 255), "HP: {}/{}")
+        self.inventory_label = TextLabel(20, (255, 200, 100), "Blocks: {}")
+        self.timer_label = TextLabel(28, (255, 255, 255), "{:02d}:{:02d}")
+        self.hud_panel = pygame.Surface((250, 120), pygame.SRCALPHA)
+        self.hud_panel.fill((0, 0, 0, 180))
+        self.timer_bg = None
+        
         # Keyboard state
         self.keys_pressed = {'w': False, 'a': False, 's': False, 'd': False}
         
+        # Local simulation runs at a fixed rate whatever the frame rate,
+        # the player is drawn interpolated between the last two steps
+        self.timestep = FixedTimestep(60)
+        self._prev_pos = None  # Local player position before the last step
+        self._render_offset = (0, 0)  # Drawn position minus simulated position
+        
         # Game state
         self.game_time = 0
         self.session_duration = 600  # 10 minutes per session
@@ -119,47 +164,131 @@ class MultiplayerGameScene:
             self.MessageType.GAME_STATE.value,
             self._handle_game_state
         )
+        self.network_client.register_handler(
+            self.MessageType.PLAYER_CORRECTION.value,
+            self._handle_player_correction
+        )
+        self.network_client.register_handler(
+            self.MessageType.DUNGEON_DATA.value,
+            self._handle_dungeon_data
+        )
+    
+    def _move_to_spawn(self):
+        """Put the local player on the dungeon's spawn point"""
+        self._prev_pos = None  # Don't interpolate across the jump
+        if self.dungeon.spawn_point:
+            spawn_x, spawn_y = self.dungeon.spawn_point
+            self.local_player.rect.center = (
+                spawn_x * self.tile_size + self.tile_size // 2,
+                spawn_y * self.tile_size + self.tile_size // 2
+            )
+            
+    def _set_dungeon(self, dungeon):
+        """Switch to another dungeon and respawn in it"""
+        self.dungeon = dungeon
+        self.grid = dungeon.grid
+        self.rooms = dungeon.rooms
+        self.tile_cache.set_grid(self.grid)
+        self.solidity = self.SolidityMap(self.grid)
+        for (grid_x, grid_y), block in self.builder_blocks.items():
+            self.solidity.set_block(grid_x, grid_y, block.solid)
+        self.minimap.set_grid(self.grid, self.solidity)
+        self._explored_tile = None
+        self._move_to_spawn()
     
     def _handle_player_update(self, data):
         """Handle other player position updates"""
         player_id = data.get('player_id')
         if player_id != self.local_player.player_id:
             if player_id not in self.other_players:
-                self.other_players[player_id] = self.MultiplayerPlayer.from_dict(data, self.screen)
-            else:
-                # Update existing player
-                player = self.other_players[player_id]
-                player.rect.x = data['x']
-                player.rect.y = data['y']
-                player.health = data['health']
+                self.other_players[player_id] = self.MultiplayerPlayer.from_dict(data)
+            # Buffer the state, position is interpolated in update()
+            self.other_players[player_id].push_snapshot(self.network_client.state_time(), data)
+    
+    def _handle_player_correction(self, data):
+        """Server overrode our position, reconciled on the next update"""
+        self._pending_correction = data
     
     def _handle_block_place(self, data):
         """Handle builder block placement from network"""
-        block = self.BuilderBlock.from_dict(data, self.tile_size)
-        self.builder_blocks[(block.grid_x, block.grid_y)] = block
+        self._add_block(self.BuilderBlock.from_dict(data, self.tile_size))
     
     def _handle_block_remove(self, data):
         """Handle builder block removal from network"""
-        pos = (data[0], data[1])
-        if pos in self.builder_blocks:
-            del self.builder_blocks[pos]
+        self._remove_block(data[0], data[1])
+    
+    def _add_block(self, block):
+        """Store a builder block and mark its tile in the solidity map"""
+        self.builder_blocks[(block.grid_x, block.grid_y)] = block
+        self.solidity.set_block(block.grid_x, block.grid_y, block.solid)
+        self.minimap.refresh_region(block.grid_x, block.grid_y, 1, 1)
+    
+    def _remove_block(self, grid_x, grid_y):
+        """Drop a builder block and clear it from the solidity map"""
+        if self.builder_blocks.pop((grid_x, grid_y), None) is not None:
+            self.solidity.set_block(grid_x, grid_y, False)
+            self.minimap.refresh_region(grid_x, grid_y, 1, 1)
     
     def _handle_game_state(self, data):
         """Handle initial game state from server"""
         game_state = data['game_state']
         self.local_player.player_id = data['player_id']
+        # Dedicated servers keep the session clock
+        self.game_time = game_state.get('time', self.game_time)
+        
+        # Host's dungeon: regenerate it, or start with its layout while the
+        # tiles stream in as DUNGEON_DATA
+        header = game_state.get('dungeon')
+        if header and header['crc'] != self.grid.crc():
+            self._set_dungeon(self._load_dungeon(header))
+        elif not header and not self.dungeon.width:
+            # Server has no dungeon to share, play on our own
+            dungeon = self.DungeonGenerator(width=80, height=60, num_rooms=8)
+            dungeon.generate()
+            self._set_dungeon(dungeon)
         
         # Load other players
         for player_id, player_data in game_state['players'].items():
             if player_id != self.local_player.player_id:
-                self.other_players[player_id] = self.MultiplayerPlayer.from_dict(
-                    player_data, self.screen
-                )
+                self.other_players[player_id] = self.MultiplayerPlayer.from_dict(player_data)
         
         # Load builder blocks
         for block_data in game_state['blocks']:
-            block = self.BuilderBlock.from_dict(block_data, self.tile_size)
-            self.builder_blocks[(block.grid_x, block.grid_y)] = block
+            self._add_block(self.BuilderBlock.from_dict(block_data, self.tile_size))
+    
+    def _load_dungeon(self, header):
+        """Dungeon for a GAME_STATE header, regenerated from its descriptor if possible"""
+        self._dungeon_chunk_tiles = header['chunk_tiles']
+        descriptor = header.get('descriptor')
+        if descriptor:
+            try:
+                dungeon = self.DungeonGenerator.from_descriptor(descriptor)
+            except ValueError:
+                # Unknown generator version, the server streams it to us
+                dungeon = None
+            if dungeon is not None:
+                if dungeon.grid.crc() == header['crc']:
+                    return dungeon
+                print("Regenerated dungeon doesn't match the host's, downloading it")
+                self.network_client.send_message({
+                    'type': self.MessageType.DUNGEON_REQUEST.value,
+                    'data': {}
+                })
+        return self.DungeonGenerator.from_dict(header)
+    
+    def _handle_dungeon_data(self, data):
+        """Write a streamed dungeon chunk into the grid"""
+        rect = self.grid.unpack_chunk(data['x'], data['y'], self._dungeon_chunk_tiles, data['tiles'])
+        self.tile_cache.invalidate_region(*rect)
+        self.solidity.update_region(*rect)
+        self.minimap.refresh_region(*rect)
+    
+    def set_tile(self, x, y, tile):
+        """Change a dungeon tile (trap triggered, chest opened) and re-bake its chunk"""
+        self.grid[y][x] = tile
+        self.tile_cache.invalidate_tile(x, y)
+        self.solidity.set_tile(x, y, tile)
+        self.minimap.refresh_region(x, y, 1, 1)
     
     def handle_event(self, event):
         """Handle input events"""
@@ -249,7 +378,7 @@ class MultiplayerGameScene:
         if (grid_x, grid_y) in self.builder_blocks:
             result = self.local_player.remove_block(grid_x, grid_y)
             if result:
-                del self.builder_blocks[(grid_x, grid_y)]
+                self._remove_block(grid_x, grid_y)
                 # Send to network
                 if self.network_client:
                     self.network_client.send_message(
@@ -259,8 +388,7 @@ class MultiplayerGameScene:
             # Place new block
             result = self.local_player.place_block(grid_x, grid_y)
             if result:
-                block = self.BuilderBlock(grid_x, grid_y, 'platform', self.tile_size)
-                self.builder_blocks[(grid_x, grid_y)] = block
+                self._add_block(self.BuilderBlock(grid_x, grid_y, 'platform', self.tile_size))
                 # Send to network
                 if self.network_client:
                     self.network_client.send_message(
@@ -285,8 +413,15 @@ class MultiplayerGameScene:
         self.menu_btn.pos = (70, 30)
         self.menu_btn.rect.center = self.menu_btn.pos
     
-    def update(self):
-        """Update game logic"""
+    def update(self, dt=1/60):
+        """Update game logic for dt real seconds"""
+        profiler = self.profiler
+        
+        # Apply network messages received since last frame
+        if self.network_client:
+            with profiler.section('network_receive'):
+                self.network_client.process_messages(self.network_time_budget)
+        
         # Update joysticks
         self.move_joy.update_drag_state()
         self.aim_joy.update_drag_state()
@@ -296,23 +431,36 @@ class MultiplayerGameScene:
         kb_dir = self._get_keyboard_direction()
         move_dir = kb_dir if kb_dir.length() > 0 else joy_dir
         
-        # Update local player
-        self.local_player.apply_input(move_dir)
-        self.local_player.update_physics()
+        # Simulate as many fixed steps as real time calls for
+        for _ in range(self.timestep.advance(dt)):
+            self._step(move_dir, self.timestep.step)
         
-        # Collision with dungeon walls
-        self._handle_dungeon_collision()
+        # Where to draw the local player between the last two steps
+        rect = self.local_player.rect
+        if self._prev_pos is None:
+            self._render_offset = (0, 0)
+        else:
+            alpha = self.timestep.alpha
+            self._render_offset = (
+                round((self._prev_pos[0] - rect.x) * (1 - alpha)),
+                round((self._prev_pos[1] - rect.y) * (1 - alpha))
+            )
         
-        # Collision with builder blocks
-        self._handle_builder_block_collision()
+        # Remote players follow their snapshot buffers
+        render_time = time.monotonic() - self.interpolation_delay
+        for player in self.other_players.values():
+            player.interpolate(render_time)
         
         # Update camera to follow player
-        self._update_camera()
+        with profiler.section('camera'):
+            self._update_camera()
         
-        # Send player update to network
-        if self.network_client and self.network_client.connected:
-            player_data = self.local_player.to_dict()
-            self.network_client.send_message(self.create_player_update(player_data))
+        # Reveal the minimap around the player whenever it enters a new tile
+        player_tile = (self.local_player.rect.centerx // self.tile_size,
+                       self.local_player.rect.centery // self.tile_size)
+        if player_tile != self._explored_tile:
+            self._explored_tile = player_tile
+            self.minimap.explore(player_tile[0], player_tile[1], self.sight_radius)
         
         # Handle action button
         if self.action_btn.clicked:
@@ -322,8 +470,7 @@ class MultiplayerGameScene:
                 grid_y = self.local_player.rect.centery // self.tile_size + 1
                 result = self.local_player.place_block(grid_x, grid_y)
                 if result:
-                    block = self.BuilderBlock(grid_x, grid_y, 'platform', self.tile_size)
-                    self.builder_blocks[(grid_x, grid_y)] = block
+                    self._add_block(self.BuilderBlock(grid_x, grid_y, 'platform', self.tile_size))
                     if self.network_client:
                         self.network_client.send_message(
                             self.create_block_place(grid_x, grid_y)
@@ -339,167 +486,151 @@ class MultiplayerGameScene:
             if (grid_x, grid_y) in self.builder_blocks:
                 result = self.local_player.remove_block(grid_x, grid_y)
                 if result:
-                    del self.builder_blocks[(grid_x, grid_y)]
+                    self._remove_block(grid_x, grid_y)
                     if self.network_client:
                         self.network_client.send_message(
                             self.create_block_remove(grid_x, grid_y)
                         )
             self.remove_btn.clicked = False
+    
+    def _step(self, move_dir, step):
+        """One fixed simulation step of the local player, session timer and network send"""
+        profiler = self.profiler
+        
+        # Update local player
+        prev_x, prev_y = self.local_player.rect.topleft
+        self._prev_pos = (prev_x, prev_y)
+        self.local_player.apply_input(move_dir)
+        self.local_player.update_physics(step)
+        
+        with profiler.section('collision'):
+            # Collision with dungeon walls and builder blocks
+            self._sweep_local_player(prev_x, prev_y)
+            
+            # Reconcile local prediction with any server correction
+            if self._pending_correction:
+                self._apply_correction(self._pending_correction)
+                self._pending_correction = None
         
         # Update game time
-        self.game_time += 1/60  # Assuming 60 FPS
-    
-    def _handle_dungeon_collision(self):
-        """Handle collision with dungeon walls"""
-        grid_x = self.local_player.rect.centerx // self.tile_size
-        grid_y = self.local_player.rect.centery // self.tile_size
-        
-        # Check surrounding tiles in a 3x3 grid
-        for dx in range(-2, 3):
-            for dy in range(-2, 3):
-                check_x = grid_x + dx
-                check_y = grid_y + dy
-                
-                if 0 <= check_y < len(self.grid) and 0 <= check_x < len(self.grid[0]):
-                    if self.grid[check_y][check_x] == self.TileType.WALL:
-                        tile_rect = pygame.Rect(
-                            check_x * self.tile_size,
-                            check_y * self.tile_size,
-                            self.tile_size,
-                            self.tile_size
-                        )
-                        if self.local_player.rect.colliderect(tile_rect):
-                            self._resolve_collision(tile_rect)
+        self.game_time += step
+        
+        # Send player update to network at a reduced rate
+        self.send_timer += step
+        if self.network_client and self.network_client.connected and self.send_timer >= self.send_interval:
+            with profiler.section('network_send'):
+                self.send_timer = 0
+                self.input_seq += 1
+                player_data = self.local_player.to_dict()
+                player_data['seq'] = self.input_seq
+                # Report the movement that survived collision, so remote
+                # extrapolation doesn't push us into walls we are standing against
+                frames = step * self.VELOCITY_SCALE
+                player_data['velocity'] = (
+                    (self.local_player.rect.x - prev_x) / frames,
+                    (self.local_player.rect.y - prev_y) / frames
+                )
+                self.prediction.record(self.input_seq, self.local_player.rect.x, self.local_player.rect.y)
+                self.network_client.send_message(self.create_player_update(player_data))
     
-    def _handle_builder_block_collision(self):
-        """Handle collision with builder-placed blocks"""
-        for block in self.builder_blocks.values():
-            block_rect = block.get_rect()
-            if self.local_player.rect.colliderect(block_rect):
-                self._resolve_collision(block_rect)
+    def _apply_correction(self, correction):
+        """Shift the local player by the server's error at the corrected input"""
+        rect = self.local_player.rect
+        rect.x, rect.y = self.prediction.reconcile(
+            correction['seq'], correction['x'], correction['y'], rect.x, rect.y
+        )
+        # The server's position is trusted, only the replayed moves since are checked
+        self._sweep_local_player(correction['x'], correction['y'])
     
-    def _resolve_collision(self, obstacle_rect):
-        """Simple AABB collision resolution"""
-        player_rect = self.local_player.rect
-        
-        # Calculate overlap on each axis
-        overlap_x = min(player_rect.right - obstacle_rect.left,
-                       obstacle_rect.right - player_rect.left)
-        overlap_y = min(player_rect.bottom - obstacle_rect.top,
-                       obstacle_rect.bottom - player_rect.top)
-        
-        # Push out on smallest overlap axis
-        if overlap_x < overlap_y:
-            if player_rect.centerx < obstacle_rect.centerx:
-                player_rect.right = obstacle_rect.left
-            else:
-                player_rect.left = obstacle_rect.right
-        else:
-            if player_rect.centery < obstacle_rect.centery:
-                player_rect.bottom = obstacle_rect.top
-            else:
-                player_rect.top = obstacle_rect.bottom
+    def _sweep_local_player(self, from_x, from_y):
+        """
+        Move the local player from (from_x, from_y) to where its rect is now,
+        stopping at the first solid tile on each axis so fast moves can't tunnel
+        """
+        rect = self.local_player.rect
+        x, y, _, _ = self.sweep_tiles(
+            from_x, from_y, rect.width, rect.height,
+            rect.x - from_x, rect.y - from_y, self.tile_size, self.solidity.is_solid
+        )
+        rect.x = x
+        rect.y = y
     
     def _update_camera(self):
         """Update camera to follow player"""
         screen_w, screen_h = self.screen.get_size()
         
-        # Center camera on player
-        self.camera_x = self.local_player.rect.centerx - screen_w // 2
-        self.camera_y = self.local_player.rect.centery - screen_h // 2
+        # Center camera on player, where it is drawn
+        self.camera_x = self.local_player.rect.centerx + self._render_offset[0] - screen_w // 2
+        self.camera_y = self.local_player.rect.centery + self._render_offset[1] - screen_h // 2
         
         # Clamp to dungeon bounds
-        max_x = len(self.grid[0]) * self.tile_size - screen_w
-        max_y = len(self.grid) * self.tile_size - screen_h
+        max_x = self.dungeon.width * self.tile_size - screen_w
+        max_y = self.dungeon.height * self.tile_size - screen_h
         self.camera_x = max(0, min(self.camera_x, max_x))
         self.camera_y = max(0, min(self.camera_y, max_y))
     
     def draw(self):
         """Draw everything"""
+        profiler = self.profiler
         self.screen.fill((15, 15, 20))
         
-        # Draw dungeon
-        self._draw_dungeon()
-        
-        # Draw builder blocks
-        for block in self.builder_blocks.values():
-            block.draw(self.screen, (self.camera_x, self.camera_y), self.tile_size)
+        with profiler.section('dungeon'):
+            # Draw dungeon
+            self._draw_dungeon()
+            
+            # Draw builder blocks on screen, found through the solidity map so the
+            # cost doesn't grow with the number of blocks placed
+            screen_w, screen_h = self.screen.get_size()
+            first_x = self.camera_x // self.tile_size
+            first_y = self.camera_y // self.tile_size
+            visible = self.solidity.blocks_in(
+                first_x, first_y, screen_w // self.tile_size + 2, screen_h // self.tile_size + 2
+            )
+            for grid_x, grid_y in visible:
+                self.builder_blocks[(grid_x, grid_y)].draw(self.screen, (self.camera_x, self.camera_y), self.tile_size)
         
         # Draw players
-        self.local_player.draw(self.screen, (self.camera_x, self.camera_y))
-        for player in self.other_players.values():
-            player.draw(self.screen, (self.camera_x, self.camera_y))
-        
-        # Draw UI
-        self._draw_ui()
-        self._draw_minimap()  # Add minimap
-        
-        # Draw joysticks last
-        self.move_joy.draw(self.screen)
-        self.aim_joy.draw(self.screen)
-        self.action_btn.draw(self.screen)
-        if hasattr(self, 'remove_btn'):
-            self.remove_btn.draw(self.screen)
+        with profiler.section('players'):
+            offset_x, offset_y = self._render_offset
+            self.local_player.draw(self.screen, (self.camera_x - offset_x, self.camera_y - offset_y))
+            for player in self.other_players.values():
+                player.draw(self.screen, (self.camera_x, self.camera_y))
+        
+        with profiler.section('ui'):
+            # Draw UI
+            self._draw_ui()
+            self._draw_minimap()  # Add minimap
+            
+            # Draw joysticks last
+            self.move_joy.draw(self.screen)
+            self.aim_joy.draw(self.screen)
+            self.action_btn.draw(self.screen)
+            if hasattr(self, 'remove_btn'):
+                self.remove_btn.draw(self.screen)
     
     def _draw_dungeon(self):
-        """Draw visible dungeon tiles"""
-        screen_w, screen_h = self.screen.get_size()
-        
-        # Calculate visible tile range
-        start_x = max(0, self.camera_x // self.tile_size)
-        end_x = min(len(self.grid[0]), (self.camera_x + screen_w) // self.tile_size + 1)
-        start_y = max(0, self.camera_y // self.tile_size)
-        end_y = min(len(self.grid), (self.camera_y + screen_h) // self.tile_size + 1)
-        
-        for y in range(start_y, end_y):
-            for x in range(start_x, end_x):
-                tile = self.grid[y][x]
-                draw_x = (x * self.tile_size) - self.camera_x
-                draw_y = (y * self.tile_size) - self.camera_y
-                rect = pygame.Rect(draw_x, draw_y, self.tile_size, self.tile_size)
-                
-                if tile == self.TileType.WALL:
-                    pygame.draw.rect(self.screen, (60, 60, 80), rect)
-                    # Add darker border for walls
-                    pygame.draw.rect(self.screen, (40, 40, 60), rect, 1)
-                elif tile == self.TileType.FLOOR:
-                    pygame.draw.rect(self.screen, (40, 40, 50), rect)
-                elif tile == self.TileType.SPAWN:
-                    pygame.draw.rect(self.screen, (40, 40, 50), rect)
-                    pygame.draw.circle(self.screen, (100, 255, 100), rect.center, self.tile_size // 3)
-                elif tile == self.TileType.BOSS:
-                    pygame.draw.rect(self.screen, (40, 40, 50), rect)
-                    pygame.draw.circle(self.screen, (255, 100, 100), rect.center, self.tile_size // 3)
-                elif tile == self.TileType.TRAP:
-                    pygame.draw.rect(self.screen, (40, 40, 50), rect)
-                    # Draw warning pattern
-                    pygame.draw.line(self.screen, (255, 150, 0), 
-                                   (draw_x, draw_y), (draw_x + self.tile_size, draw_y + self.tile_size), 2)
-                    pygame.draw.line(self.screen, (255, 150, 0), 
-                                   (draw_x + self.tile_size, draw_y), (draw_x, draw_y + self.tile_size), 2)
-                elif tile == self.TileType.CHEST:
-                    pygame.draw.rect(self.screen, (40, 40, 50), rect)
-                    # Draw chest
-                    chest_rect = pygame.Rect(draw_x + 8, draw_y + 12, self.tile_size - 16, self.tile_size - 16)
-                    pygame.draw.rect(self.screen, (255, 215, 0), chest_rect)
-                    pygame.draw.rect(self.screen, (200, 160, 0), chest_rect, 2)
+        """Draw visible dungeon tiles from the pre-rendered chunk cache"""
+        self.tile_cache.draw(self.screen, self.camera_x, self.camera_y)
+    
+    def _draw_minimap(self):
+        """Cached minimap in the top-right corner, below the timer, with player dots"""
+        dots = [(player.rect.centerx, player.rect.centery, player.color)
+                for player in self.other_players.values()]
+        dots.append((self.local_player.rect.centerx, self.local_player.rect.centery, (255, 255, 255)))
+        left = self.screen.get_width() - self.minimap.size[0] - 15 if self.minimap.surface else 0
+        self.minimap.draw(self.screen, (left, 60), dots, self.tile_size)
     
     def _draw_ui(self):
         """Draw UI elements"""
-        font = pygame.font.SysFont(None, 28)
-        small_font = pygame.font.SysFont(None, 20)
-        
         # Top-left panel background
-        panel = pygame.Surface((250, 120), pygame.SRCALPHA)
-        panel.fill((0, 0, 0, 180))
-        self.screen.blit(panel, (5, 5))
+        self.screen.blit(self.hud_panel, (5, 5))
         
         # Role display
-        role_text = font.render(f"Role: {self.local_player.role.value.upper()}", True, (255, 255, 100))
+        role_text = self.role_label.set(self.local_player.role.value.upper())
         self.screen.blit(role_text, (15, 15))
         
         # Health bar
-        health_text = font.render(f"HP: {self.local_player.health}/{self.local_player.max_health}", True, (255, 255, 255))
+        health_text = self.health_label.set((self.local_player.health, self.local_player.max_health))
         self.screen.blit(health_text, (15, 45))
         
         # Health bar visual
@@ -513,25 +644,25 @@ class MultiplayerGameScene:
         
         # Builder inventory
         if self.local_player.role == self.PlayerRole.BUILDER:
-            inv_text = small_font.render(f"Blocks: {self.local_player.block_inventory}", True, (255, 200, 100))
+            inv_text = self.inventory_label.set(self.local_player.block_inventory)
             self.screen.blit(inv_text, (15, 95))
         
         # Timer (top-right)
         time_left = max(0, self.session_duration - int(self.game_time))
-        mins = time_left // 60
-        secs = time_left % 60
-        timer_text = font.render(f"{mins:02d}:{secs:02d}", True, (255, 255, 255))
+        timer_text = self.timer_label.set((time_left // 60, time_left % 60))
         timer_rect = timer_text.get_rect()
         timer_rect.topright = (self.screen.get_width() - 15, 15)
         
-        # Timer background
-        timer_bg = pygame.Surface((timer_rect.width + 20, timer_rect.height + 10), pygame.SRCALPHA)
-        timer_bg.fill((0, 0, 0, 180))
-        self.screen.blit(timer_bg, (timer_rect.x - 10, timer_rect.y - 5))
+        # Timer background, rebuilt only if the text size changes
+        bg_size = (timer_rect.width + 20, timer_rect.height + 10)
+        if self.timer_bg is None or self.timer_bg.get_size() != bg_size:
+            self.timer_bg = pygame.Surface(bg_size, pygame.SRCALPHA)
+            self.timer_bg.fill((0, 0, 0, 180))
+        self.screen.blit(self.timer_bg, (timer_rect.x - 10, timer_rect.y - 5))
         self.screen.blit(timer_text, timer_rect)
         
         # Controls hint (bottom-center)
-        hint_text = small_font.render("WASD: Move | SPACE: Special | ESC: Menu", True, (180, 180, 180))
+        hint_text = render_text("WASD: Move | SPACE: Special | ESC: Menu", 20, (180, 180, 180))
         hint_rect = hint_text.get_rect(center=(self.screen.get_width() // 2, self.screen.get_height() - 15))
         self.screen.blit(hint_text, hint_rect)
         
@@ -1,8 +1,7 @@
+import functools
 import pygame
-import sys
-import os
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from input.button import Button
+from input.button import Button, redraw_buttons
+from fonts import render_text
 
 
 class RoleSelectionScene:
@@ -51,11 +50,13 @@ class RoleSelectionScene:
         
         self.network_mode = None  # 'host', 'join', or 'solo'
         
-        # Font
-        self.title_font = pygame.font.SysFont(None, 56)
-        self.desc_font = pygame.font.SysFont(None, 24)
+        # Nothing animates, Game.run waits for input between frames
+        self.idle = True
+        self.background = None  # Everything but the buttons, see draw()
     
     def handle_event(self, event):
+        selection = (self.selected_role, self.network_mode)
+        
         # Handle role buttons
         for role, btn in self.role_buttons.items():
             btn.handle_event(event)
@@ -93,6 +94,10 @@ class RoleSelectionScene:
         # Window resize
         if event.type == pygame.VIDEORESIZE or event.type == pygame.WINDOWSIZECHANGED:
             self._update_layout()
+        
+        # Instructions and visible buttons depend on the selection
+        if (self.selected_role, self.network_mode) != selection:
+            self.invalidate()
     
     def _update_layout(self):
         """Update UI positions on window resize"""
@@ -110,110 +115,144 @@ class RoleSelectionScene:
         self.solo_btn.pos = (3 * w // 4, h // 2 + 200)
     
     def _start_game(self):
-        """Start the game with selected role and network mode"""
+        """Start the game with selected role and network mode, loading it on a worker"""
+        prepare = functools.partial(
+            self._prepare_game, self.selected_role, self.network_mode, self.screen.get_size()
+        )
+        self.manager.load_scene("game", prepare, self._build_game, "Entering the dungeon")
+    
+    def _prepare_game(self, role, network_mode, view, report):
+        """Runs on the loading thread: generate the dungeon, connect and bake its tiles"""
         from dungeon_procgen import DungeonGenerator
         from dungeon_networking import NetworkServer, NetworkClient
+        from dungeon_render import TileChunkCache
         
-        # Generate dungeon
-        dungeon = DungeonGenerator(width=80, height=60, num_rooms=8)
-        dungeon.generate()
+        # Joining players get the host's dungeon streamed to them
+        dungeon = None
+        if network_mode != 'join':
+            report(0.0, "Generating dungeon")
+            dungeon = DungeonGenerator(width=80, height=60, num_rooms=8)
+            dungeon.generate()
         
         # Setup networking
         network_client = None
         
-        if self.network_mode == 'host':
+        if network_mode == 'host':
             # Start server
+            report(0.4, "Starting server")
             server = NetworkServer(host='0.0.0.0', port=5555, max_players=4)
+            server.set_dungeon(dungeon)
             server.start()
             
-            # Connect as client
+            # Connect as client, we already have the dungeon
             network_client = NetworkClient('localhost', 5555)
-            if network_client.connect(self.selected_role.value):
+            if network_client.connect(role.value, view=view, dungeon_crc=dungeon.grid.crc()):
                 print("Hosting game and connected as player")
             else:
                 print("Failed to connect to own server")
                 network_client = None
         
-        elif self.network_mode == 'join':
+        elif network_mode == 'join':
             # Get IP from user (simplified - you'd want a proper input dialog)
             # For now, connect to localhost
+            report(0.0, "Connecting")
             network_client = NetworkClient('localhost', 5555)
-            if not network_client.connect(self.selected_role.value):
+            if not network_client.connect(role.value, view=view):
                 print("Failed to connect to server")
                 network_client = None
-        
-        # Change to game scene with dungeon and network client
+                # Play solo instead
+                dungeon = DungeonGenerator(width=80, height=60, num_rooms=8)
+                dungeon.generate()
+        
+        # Pre-render the tiles so the first frames don't stall baking them
+        tile_cache = None
+        if dungeon is not None:
+            report(0.6, "Building tiles")
+            tile_cache = TileChunkCache(dungeon.grid)
+            tile_cache.bake(lambda done: report(0.6 + 0.4 * done))
+        
+        report(1.0, "Ready")
+        return {
+            'network_client': network_client,
+            'dungeon_gen': dungeon,
+            'player_role': role,
+            'tile_cache': tile_cache
+        }
+    
+    def _build_game(self, prepared):
+        """Create the game scene on the main thread from _prepare_game's result"""
         from scenes.dungeon_multiplayer_scene import MultiplayerGameScene
-        
-        game_scene = MultiplayerGameScene(
-            self.manager,
-            self.screen,
-            network_client=network_client,
-            dungeon_gen=dungeon,
-            player_role=self.selected_role
-        )
-        
-        # Replace the game scene in the manager
-        self.manager.game = game_scene
-        self.manager.change_scene("game")
+        return MultiplayerGameScene(self.manager, self.screen, **prepared)
     
-    def update(self):
+    def update(self, dt=1/60):
         pass
     
+    def invalidate(self):
+        """Redraw everything on the next draw"""
+        self.background = None
+    
+    def _visible_buttons(self):
+        """Buttons shown for the current selection, highlighted to match it"""
+        buttons = []
+        for role, btn in self.role_buttons.items():
+            # Highlight selected role
+            if role == self.selected_role:
+                btn.normal_bg = (150, 150, 150)
+            else:
+                btn.normal_bg = (100, 100, 100)
+            buttons.append(btn)
+        
+        # Network mode buttons
+        if self.selected_role:
+            # Highlight selected mode
+            for btn, mode in [(self.host_btn, 'host'), (self.join_btn, 'join'), (self.solo_btn, 'solo')]:
+                if self.network_mode == mode:
+                    btn.normal_bg = (150, 150, 150)
+                else:
+                    btn.normal_bg = (100, 100, 100)
+                buttons.append(btn)
+        
+        # Start and back buttons
+        if self.selected_role and self.network_mode:
+            buttons.append(self.start_btn)
+        buttons.append(self.back_btn)
+        return buttons
+    
     def draw(self):
+        """Full redraw after invalidate(), otherwise only buttons that changed"""
+        buttons = self._visible_buttons()
+        if self.background is not None:
+            return redraw_buttons(self.screen, self.background, buttons)
+        
         self.screen.fill((20, 20, 25))
         
         # Title
-        title = self.title_font.render("POCKET DUNGEON ONLINE", True, (255, 200, 100))
+        title = render_text("POCKET DUNGEON ONLINE", 56, (255, 200, 100))
         title_rect = title.get_rect(center=(self.screen.get_width() // 2, 50))
         self.screen.blit(title, title_rect)
         
         # Instructions
         if not self.selected_role:
-            instruction = self.desc_font.render("Select your role:", True, (200, 200, 200))
+            instruction = render_text("Select your role:", 24, (200, 200, 200))
         elif not self.network_mode:
-            instruction = self.desc_font.render("Choose game mode:", True, (200, 200, 200))
+            instruction = render_text("Choose game mode:", 24, (200, 200, 200))
         else:
-            instruction = self.desc_font.render("Ready to start!", True, (100, 255, 100))
+            instruction = render_text("Ready to start!", 24, (100, 255, 100))
         
         inst_rect = instruction.get_rect(center=(self.screen.get_width() // 2, 120))
         self.screen.blit(instruction, inst_rect)
         
-        # Draw role buttons with descriptions
+        # Role stats below each role button
         for role, btn in self.role_buttons.items():
-            # Highlight selected role
-            if role == self.selected_role:
-                btn.normal_bg = (150, 150, 150)
-            else:
-                btn.normal_bg = (100, 100, 100)
-            
-            btn.draw(self.screen)
-            
-            # Draw role stats below button
             stats = self.RoleStats.get_stats(role)
-            desc_text = self.desc_font.render(
-                stats['description'],
-                True,
-                (180, 180, 180)
-            )
+            desc_text = render_text(stats['description'], 24, (180, 180, 180))
             desc_rect = desc_text.get_rect(center=(btn.rect.centerx, btn.rect.bottom + 20))
             self.screen.blit(desc_text, desc_rect)
         
-        # Draw network mode buttons
-        if self.selected_role:
-            # Highlight selected mode
-            for btn, mode in [(self.host_btn, 'host'), (self.join_btn, 'join'), (self.solo_btn, 'solo')]:
-                if self.network_mode == mode:
-                    btn.normal_bg = (150, 150, 150)
-                else:
-                    btn.normal_bg = (100, 100, 100)
-                btn.draw(self.screen)
-        
-        # Draw start and back buttons
-        if self.selected_role and self.network_mode:
-            self.start_btn.draw(self.screen)
-        
-        self.back_btn.draw(self.screen)
+        self.background = self.screen.copy()
+        for btn in buttons:
+            btn.draw(self.screen)
+        return None
 
 
 class ConnectionScene:
@@ -229,8 +268,6 @@ class ConnectionScene:
         w, h = screen.get_size()
         self.connect_btn = Button(screen, "Connect", (w // 2, h // 2 + 100), 200, 60)
         self.back_btn = Button(screen, "Back", (w // 2, h // 2 + 180), 200, 60)
-        
-        self.font = pygame.font.SysFont(None, 32)
     
     def handle_event(self, event):
         if event.type == pygame.KEYDOWN:
@@ -265,7 +302,7 @@ class ConnectionScene:
         # This would be handled in the role selection scene
         print(f"Connecting to {self.ip_input}:{self.port}")
     
-    def update(self):
+    def update(self, dt=1/60):
         pass
     
     def draw(self):
@@ -274,28 +311,28 @@ class ConnectionScene:
         w, h = self.screen.get_size()
         
         # Title
-        title = self.font.render("Connect to Server", True, (255, 255, 255))
+        title = render_text("Connect to Server", 32, (255, 255, 255))
         title_rect = title.get_rect(center=(w // 2, h // 2 - 100))
         self.screen.blit(title, title_rect)
         
         # IP input
-        ip_label = self.font.render("IP Address:", True, (200, 200, 200))
+        ip_label = render_text("IP Address:", 32, (200, 200, 200))
         self.screen.blit(ip_label, (w // 2 - 150, h // 2 - 40))
         
         ip_color = (255, 255, 255) if self.active_input == "ip" else (150, 150, 150)
         ip_rect = pygame.Rect(w // 2 - 150, h // 2 - 10, 300, 40)
         pygame.draw.rect(self.screen, ip_color, ip_rect, 2)
-        ip_text = self.font.render(self.ip_input or "localhost", True, (255, 255, 255))
+        ip_text = render_text(self.ip_input or "localhost", 32, (255, 255, 255))
         self.screen.blit(ip_text, (w // 2 - 140, h // 2))
         
         # Port input
-        port_label = self.font.render("Port:", True, (200, 200, 200))
+        port_label = render_text("Port:", 32, (200, 200, 200))
         self.screen.blit(port_label, (w // 2 - 150, h // 2 + 40))
         
         port_color = (255, 255, 255) if self.active_input == "port" else (150, 150, 150)
         port_rect = pygame.Rect(w // 2 - 150, h // 2 + 70, 300, 40)
         pygame.draw.rect(self.screen, port_color, port_rect, 2)
-        port_text = self.font.render(self.port, True, (255, 255, 255))
+        port_text = render_text(self.port, 32, (255, 255, 255))
         self.screen.blit(port_text, (w // 2 - 140, h // 2 + 80))
         
         # Buttons
@@ -1,7 +1,4 @@
-import sys
-import os
 import pygame
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from input.joystick import Joystick
 from input.aim_joystick import AimJoystick
 from input.button import Button
@@ -96,7 +93,7 @@ class GameScene:
         
         return direction
 
-    def update(self):
+    def update(self, dt=1/60):
         # update joystick dragging positions using current mouse/touch pos
         self.move_joy.update_drag_state()
         self.aim_joy.update_drag_state()
@@ -0,0 +1,98 @@
+import threading
+import pygame
+from input.button import Button
+from fonts import render_text
+
+
+class LoadingScene:
+    """
+    Progress screen while a worker thread prepares the next scene.
+    prepare(report) runs on the worker and may call report(fraction, text);
+    build(result) then runs on the main thread and returns the scene,
+    which the manager swaps in as `name`.
+    """
+    
+    def __init__(self, manager, screen, name, prepare, build, title="Loading"):
+        self.manager = manager
+        self.screen = screen
+        self.name = name
+        self.build = build
+        self.title = title
+        
+        # Written by the worker, read by the main thread
+        self.progress = (0.0, "")
+        self.result = None
+        self.error = None
+        self.done = False
+        
+        w, h = screen.get_size()
+        self.back_btn = Button(screen, "Back", (w // 2, h // 2 + 100), 200, 60)
+        
+        self.thread = threading.Thread(target=self._run, args=(prepare,))
+        self.thread.daemon = True
+        self.thread.start()
+    
+    def _run(self, prepare):
+        try:
+            self.result = prepare(self._report)
+        except Exception as e:
+            print(f"Loading failed: {e}")
+            self.error = e
+        self.done = True
+    
+    def _report(self, fraction, text=None):
+        self.progress = (fraction, self.progress[1] if text is None else text)
+    
+    def handle_event(self, event):
+        if self.error is None:
+            return
+        self.back_btn.handle_event(event)
+        if self.back_btn.clicked:
+            self.back_btn.clicked = False
+            self.manager.change_scene("role_select")
+        
+        # Window resize
+        if event.type == pygame.VIDEORESIZE or event.type == pygame.WINDOWSIZECHANGED:
+            w, h = self.screen.get_size()
+            self.back_btn.pos = (w // 2, h // 2 + 100)
+    
+    def update(self, dt=1/60):
+        if not self.done or self.error is not None:
+            return
+        # Surfaces and handlers are set up on the main thread
+        try:
+            scene = self.build(self.result)
+        except Exception as e:
+            print(f"Loading failed: {e}")
+            self.error = e
+            return
+        self.manager.set_scene(self.name, scene)
+        self.manager.change_scene(self.name)
+    
+    def draw(self):
+        self.screen.fill((20, 20, 25))
+        w, h = self.screen.get_size()
+        
+        title = render_text(self.title, 48, (255, 200, 100))
+        self.screen.blit(title, title.get_rect(center=(w // 2, h // 2 - 80)))
+        
+        if self.error is not None:
+            message = render_text(f"Failed: {self.error}", 24, (255, 100, 100))
+            self.screen.blit(message, message.get_rect(center=(w // 2, h // 2)))
+            self.back_btn.draw(self.screen)
+            return None
+        
+        # Progress bar
+        fraction, text = self.progress
+        bar = pygame.Rect(0, 0, min(400, w - 40), 24)
+        bar.center = (w // 2, h // 2)
+        pygame.draw.rect(self.screen, (60, 60, 70), bar)
+        filled = bar.copy()
+        filled.width = int(bar.width * max(0.0, min(1.0, fraction)))
+        pygame.draw.rect(self.screen, (100, 200, 100), filled)
+        pygame.draw.rect(self.screen, (200, 200, 200), bar, 2)
+        
+        if text:
+            label = render_text(text, 24, (200, 200, 200))
+            self.screen.blit(label, label.get_rect(center=(w // 2, h // 2 + 40)))
+        return None
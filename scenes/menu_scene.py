@@ -1,8 +1,5 @@
-import sys
-import os
 import pygame
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
-from input.button import Button
+from input.button import Button, redraw_buttons
 
 
 class MenuScene:
@@ -13,6 +10,9 @@ class MenuScene:
         self.start_btn = Button(screen, "Start", (w // 2, h // 2 - 40), 200, 60)
         self.quit_btn = Button(screen, "Quit", (w // 2, h // 2 + 40), 200, 60)
         self.print_btn = Button(screen, "Print", (w // 2, h // 2 + 100), 200, 60)
+        # Nothing animates, Game.run waits for input between frames
+        self.idle = True
+        self.background = None
 
 
     def handle_event(self, event):
@@ -42,12 +42,20 @@ class MenuScene:
             self.quit_btn.pos = (w // 2, h // 2 + 40)
 
 
-    def update(self):
+    def update(self, dt=1/60):
         pass
 
 
+    def invalidate(self):
+        self.background = None
+
+
     def draw(self):
+        buttons = (self.start_btn, self.quit_btn, self.print_btn)
+        if self.background is not None:
+            return redraw_buttons(self.screen, self.background, buttons)
         self.screen.fill((18, 18, 20))
-        self.start_btn.draw(self.screen)
-        self.quit_btn.draw(self.screen)
-        self.print_btn.draw(self.screen)
\ No newline at end of file
+        self.background = self.screen.copy()
+        for btn in buttons:
+            btn.draw(self.screen)
+        return None
@@ -1,5 +1,5 @@
 import pygame
-from input.button import Button
+from input.button import Button, redraw_buttons
 
 
 class PauseScene:
@@ -9,6 +9,11 @@ class PauseScene:
         w, h = screen.get_size()
         self.resume_btn = Button(screen, "Resume", (w // 2, h // 2 - 40), 200, 60)
         self.menu_btn = Button(screen, "Menu", (w // 2, h // 2 + 40), 200, 60)
+        # Nothing animates, Game.run waits for input between frames
+        self.idle = True
+        self.overlay = None
+        self.paused_frame = None  # Undimmed game frame from when the pause began
+        self.background = None  # Paused game frame under the overlay
 
     def handle_event(self, event):
         self.resume_btn.handle_event(event)
@@ -16,27 +21,53 @@ class PauseScene:
 
         if self.resume_btn.clicked:
             self.resume_btn.clicked = False
-            self.manager.change_scene("game")
+            self._leave("game")
 
         if self.menu_btn.clicked:
             self.menu_btn.clicked = False
-            self.manager.change_scene("menu")
+            self._leave("menu")
 
         if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
-            self.manager.change_scene("game")
+            self._leave("game")
 
         if event.type == pygame.VIDEORESIZE or event.type == pygame.WINDOWSIZECHANGED:
             w, h = self.screen.get_size()
             self.resume_btn.pos = (w // 2, h // 2 - 40)
             self.menu_btn.pos = (w // 2, h // 2 + 40)
 
-    def update(self):
+    def _leave(self, name):
+        # The next pause captures a fresh game frame
+        self.paused_frame = None
+        self.manager.change_scene(name)
+
+    def update(self, dt=1/60):
         pass
 
+    def invalidate(self):
+        """Rebuild the background from the paused game frame at the next draw"""
+        self.background = None
+
     def draw(self):
-        # translucent overlay
-        overlay = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 160))
-        self.screen.blit(overlay, (0, 0))
-        self.resume_btn.draw(self.screen)
-        self.menu_btn.draw(self.screen)
\ No newline at end of file
+        buttons = (self.resume_btn, self.menu_btn)
+        if self.background is not None:
+            return redraw_buttons(self.screen, self.background, buttons)
+
+        # The screen still holds the last game frame on the first draw of
+        # a pause, later redraws start again from that copy so it is only
+        # ever dimmed once
+        if self.paused_frame is None:
+            self.paused_frame = self.screen.copy()
+        else:
+            if self.paused_frame.get_size() != self.screen.get_size():
+                self.screen.fill((0, 0, 0))
+            self.screen.blit(self.paused_frame, (0, 0))
+
+        # translucent overlay over the game frame
+        if self.overlay is None or self.overlay.get_size() != self.screen.get_size():
+            self.overlay = pygame.Surface(self.screen.get_size(), pygame.SRCALPHA)
+            self.overlay.fill((0, 0, 0, 160))
+        self.screen.blit(self.overlay, (0, 0))
+        self.background = self.screen.copy()
+        for btn in buttons:
+            btn.draw(self.screen)
+        return None